@@ -3,13 +3,48 @@ FastAPI Backend for Courtside
 Serves JSON data files via REST API endpoints
 """
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-import json
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+import asyncio
+import hmac
+import os
 from pathlib import Path
+from typing import List, Optional
+from pydantic import BaseModel
+from dataset import DATA_VERSION_HEADER, DataVersionMiddleware, Dataset, DatasetManager
+from export import EXPORT_FORMATS, InvalidExportQuery, check_fields, check_format, export_chunks
+from game_history import InvalidGameQuery, parse_date
+from player_index import InvalidPlayerQuery
+from player_similarity import InvalidSimilarityQuery
+from rivalry_cube import InvalidDecade, parse_decade
+from snapshot import records_at
 
 app = FastAPI(title="Courtside API")
 
+# Load data files on startup
+data_dir = Path(__file__).parent / "data"
+
+# Read the summaries from the memory-mapped binary snapshot when it matches the JSON files (COURTSIDE_SNAPSHOT=0 forces JSON)
+use_snapshot = os.getenv("COURTSIDE_SNAPSHOT", "1") != "0"
+
+# Seconds between checks of data/ for new files to hot-reload (0 turns the watcher off)
+reload_interval = float(os.getenv("COURTSIDE_RELOAD_INTERVAL", "10"))
+
+# Token for POST /api/admin/reload (the endpoint is disabled when unset)
+admin_token = os.getenv("COURTSIDE_ADMIN_TOKEN")
+
+# Most comparisons one POST /api/compare/batch request may ask for (a full 30x30 matrix is 900)
+MAX_BATCH_COMPARISONS = 1000
+
+# The active Dataset; reloads build a new one off the request path and swap it in with one assignment
+datasets = DatasetManager(data_dir, use_snapshot=use_snapshot)
+reload_watcher = None
+
+# Each request keeps the Dataset that was active when it arrived
+app.add_middleware(DataVersionMiddleware, manager=datasets)
+
 # Enable CORS
 app.add_middleware(
     CORSMiddleware,
@@ -17,77 +52,233 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", DATA_VERSION_HEADER],
 )
 
-# Load data files on startup
-data_dir = Path(__file__).parent / "data"
+def current_dataset(request: Request) -> Dataset:
+    """The Dataset this request was pinned to by DataVersionMiddleware"""
+    return request.state.dataset
+
+def parse_fields(fields):
+    """Comma-separated field list -> list, or None when not given"""
+    return [field.strip() for field in fields.split(",") if field.strip()] if fields else None
 
-teams_data = []
-players_data = []
-rivalries_data = []
-states_data = []
+def parse_decade_query(decade, dataset):
+    """Validate a decade query parameter against the dataset, returning its start year or None"""
+    if decade is None:
+        return None
+    try:
+        decade_start = parse_decade(decade)
+    except InvalidDecade as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if dataset.rivalry_cube is None:
+        raise HTTPException(status_code=503, detail="Decade breakdown not available. Run process_data.py first.")
+    return decade_start
 
 def load_data():
-    """Load all JSON files into memory"""
-    global teams_data, players_data, rivalries_data, states_data
-    
+    """Load all data files and make them the active Dataset"""
     try:
-        with open(data_dir / "team_summary.json", "r") as f:
-            teams_data = json.load(f)
-        
-        with open(data_dir / "player_summary.json", "r") as f:
-            players_data = json.load(f)
-        
-        with open(data_dir / "rivalry_summary.json", "r") as f:
-            rivalries_data = json.load(f)
-        
-        with open(data_dir / "state_summary.json", "r") as f:
-            states_data = json.load(f)
-        
-        print(f"Loaded {len(teams_data)} teams, {len(players_data)} players, {len(rivalries_data)} rivalries, {len(states_data)} states")
+        datasets.reload()
     except FileNotFoundError as e:
         print(f"Warning: Data files not found. Run process_data.py first. Error: {e}")
 
 @app.on_event("startup")
 async def startup_event():
+    global reload_watcher
     load_data()
+    if reload_interval > 0:
+        reload_watcher = asyncio.create_task(datasets.watch(reload_interval))
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if reload_watcher is not None:
+        reload_watcher.cancel()
 
 @app.get("/")
 async def root():
-    return {"message": "Courtside API", "endpoints": ["/api/teams", "/api/players", "/api/compare", "/api/map-data", "/api/states"]}
+    return {"message": "Courtside API", "endpoints": ["/api/teams", "/api/players", "/api/players/search", "/api/compare", "/api/games", "/api/map-data", "/api/states"]}
+
+@app.post("/api/admin/reload")
+async def reload_data(x_admin_token: str = Header(None)):
+    """Reload the data files now instead of waiting for the watcher"""
+    if not admin_token:
+        raise HTTPException(status_code=403, detail="Reload endpoint disabled. Set COURTSIDE_ADMIN_TOKEN to enable it.")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token.encode(), admin_token.encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+    
+    previous_version = datasets.current.version
+    try:
+        # Built in a worker thread; requests keep being served from the current Dataset meanwhile
+        reloaded = await run_in_threadpool(datasets.reload)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Reload failed, still serving version {previous_version}: {e}")
+    
+    return {"reloaded": reloaded, "previous_version": previous_version, "version": datasets.current.version}
 
 @app.get("/api/teams")
-async def get_teams():
+async def get_teams(request: Request, dataset: Dataset = Depends(current_dataset)):
     """Get all teams with stats"""
-    return teams_data
+    return dataset.teams_body.respond(request)
 
 @app.get("/api/teams/{team_id}")
-async def get_team(team_id: str):
+async def get_team(team_id: str, dataset: Dataset = Depends(current_dataset)):
     """Get single team details by ID or abbreviation"""
-    team = next((t for t in teams_data if str(t.get("team_id")) == team_id or t.get("abbreviation") == team_id.upper()), None)
+    team = dataset.find_team(team_id)
     
     if not team:
         raise HTTPException(status_code=404, detail=f"Team {team_id} not found")
     
-    return team
+    # Shared records are rendered directly, skipping the deep copy FastAPI's jsonable_encoder would make
+    return JSONResponse(team)
+
+@app.get("/api/teams/{team_id}/seasons")
+async def get_team_seasons(team_id: str, dataset: Dataset = Depends(current_dataset)):
+    """Get a team's win/loss record and points for each season"""
+    team = dataset.find_team(team_id)
+    
+    if not team:
+        raise HTTPException(status_code=404, detail=f"Team {team_id} not found")
+    if dataset.rivalry_cube is None:
+        raise HTTPException(status_code=503, detail="Season records not available. Run process_data.py first.")
+    
+    return {"team": team.get("abbreviation"), "seasons": dataset.rivalry_cube.team_seasons(team.get("abbreviation")) or []}
+
+@app.get("/api/teams/{team_id}/elo")
+async def get_team_elo(team_id: str, dataset: Dataset = Depends(current_dataset)):
+    """Get a team's current Elo rating and its start, end and peak rating in each season"""
+    team = dataset.find_team(team_id)
+    
+    if not team:
+        raise HTTPException(status_code=404, detail=f"Team {team_id} not found")
+    if dataset.elo_ratings is None:
+        raise HTTPException(status_code=503, detail="Elo ratings not available. Run process_data.py first.")
+    
+    ratings = dataset.elo_by_team.get(team.get("abbreviation"))
+    if ratings is None:
+        return {"team": team.get("abbreviation"), "rating": None, "seasons": []}
+    return JSONResponse(ratings)
+
+@app.get("/api/elo")
+async def get_elo_ratings(request: Request, dataset: Dataset = Depends(current_dataset)):
+    """Get every franchise's Elo rating series, for coloring the map or charting teams side by side"""
+    if dataset.elo_body is None:
+        raise HTTPException(status_code=503, detail="Elo ratings not available. Run process_data.py first.")
+    return dataset.elo_body.respond(request)
+
+@app.get("/api/teams/{team_id}/rivalries")
+async def get_team_rivalries(
+    team_id: str,
+    decade: str = Query(None, description="Only games in this decade (e.g., '1980s')"),
+    dataset: Dataset = Depends(current_dataset),
+):
+    """Get a team's wins and losses against every opponent it has played"""
+    team = dataset.find_team(team_id)
+    
+    if not team:
+        raise HTTPException(status_code=404, detail=f"Team {team_id} not found")
+    decade_start = parse_decade_query(decade, dataset)
+    
+    opponents = dataset.rivalry_matrix.team_row(team.get("abbreviation"), decade_start)
+    return JSONResponse({"team": team.get("abbreviation"), "decade": decade, "opponents": opponents or []})
+
+@app.get("/api/rivalries/matrix")
+async def get_rivalry_matrix(
+    request: Request,
+    decade: str = Query(None, description="Only games in this decade (e.g., '1980s')"),
+    dataset: Dataset = Depends(current_dataset),
+):
+    """Get the league-wide head-to-head wins matrix: wins[i][j] is how often teams[i] beat teams[j]"""
+    decade_start = parse_decade_query(decade, dataset)
+    
+    # All-time and every decade with games are pre-serialized
+    body = dataset.matrix_bodies.get(decade_start)
+    if body is None:
+        return JSONResponse(dataset.rivalry_matrix.matrix(decade_start))
+    return body.respond(request)
 
 @app.get("/api/players")
-async def get_players(limit: int = Query(None, description="Limit number of results")):
-    """Get all players"""
-    if limit:
-        return players_data[:limit]
-    return players_data
+async def get_players(
+    request: Request,
+    limit: int = Query(None, ge=0, description="Limit number of results (0 for no limit)"),
+    sort: str = Query(None, description="Sort by a numeric field, e.g. career_ppg or total_games"),
+    order: str = Query("desc", description="Sort direction: 'asc' or 'desc'"),
+    offset: int = Query(0, ge=0, description="Skip this many matching players"),
+    cursor: str = Query(None, description="Resume from the X-Next-Cursor header of a previous page"),
+    fields: str = Query(None, description="Comma-separated fields to return, e.g. 'player_id,name,career_ppg'"),
+    min_games: int = Query(None, description="Only players with at least this many total games"),
+    team: str = Query(None, description="Only players who played for this team abbreviation"),
+    dataset: Dataset = Depends(current_dataset),
+):
+    """Get players, optionally sorted, filtered, paginated and projected"""
+    # The full list is served pre-serialized
+    if not request.query_params:
+        return dataset.players_body.respond(request)
+    
+    field_list = parse_fields(fields)
+    try:
+        if field_list:
+            dataset.player_index.check_fields(field_list)
+        # limit=0 has always meant every player
+        page, next_cursor = dataset.player_index.page(
+            sort=sort, order=order, offset=offset, cursor=cursor, limit=limit or None, team=team, min_games=min_games
+        )
+    except InvalidPlayerQuery as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if field_list:
+        rows = [{field: player[field] for field in field_list} for player in records_at(dataset.players, page)]
+    else:
+        rows = records_at(dataset.players, page)
+    
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else {}
+    return JSONResponse(rows, headers=headers)
+
+@app.get("/api/players/search")
+async def search_players(
+    q: str = Query(..., description="Player name or name prefix, e.g. 'lebr' or 'magic j'"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of matches"),
+    fuzzy: bool = Query(True, description="Fall back to typo-tolerant matching when few names match the prefix"),
+    dataset: Dataset = Depends(current_dataset),
+):
+    """Typeahead search over player names, ranked by career relevance"""
+    return JSONResponse(dataset.player_search.search(q, limit=limit, fuzzy=fuzzy))
+
+@app.get("/api/players/{player_id}/similar")
+async def get_similar_players(
+    player_id: int,
+    k: int = Query(10, ge=1, le=100, description="Number of similar players"),
+    stats: str = Query(None, description="Comma-separated career_* stats to compare on (default: all)"),
+    team: str = Query(None, description="Only players who played for this team abbreviation"),
+    min_games: int = Query(None, description="Only players with at least this many total games"),
+    dataset: Dataset = Depends(current_dataset),
+):
+    """Get the players with the closest standardized career stats"""
+    stat_list = [stat.strip() for stat in stats.split(",") if stat.strip()] if stats else None
+    try:
+        neighbours = dataset.player_similarity.similar(player_id, k=k, stats=stat_list, team=team, min_games=min_games)
+    except InvalidSimilarityQuery as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if neighbours is None:
+        raise HTTPException(status_code=404, detail=f"Player {player_id} not found")
+    
+    return JSONResponse({
+        "player": dataset.players[dataset.player_similarity.row_by_id[player_id]],
+        "stats": stat_list or dataset.player_similarity.stats,
+        "similar": [{**player, "distance": round(distance, 4)} for player, distance in neighbours],
+    })
 
 @app.get("/api/compare")
 async def compare_teams(
     team1: str = Query(..., description="First team ID or abbreviation"),
     team2: str = Query(..., description="Second team ID or abbreviation"),
-    decade: str = Query(None, description="Filter by decade (e.g., '1980s')")
+    decade: str = Query(None, description="Filter by decade (e.g., '1980s')"),
+    dataset: Dataset = Depends(current_dataset),
 ):
     """Compare two teams head-to-head"""
     # Find teams
-    team1_data = next((t for t in teams_data if str(t.get("team_id")) == team1 or t.get("abbreviation") == team1.upper()), None)
-    team2_data = next((t for t in teams_data if str(t.get("team_id")) == team2 or t.get("abbreviation") == team2.upper()), None)
+    team1_data = dataset.find_team(team1)
+    team2_data = dataset.find_team(team2)
     
     if not team1_data:
         raise HTTPException(status_code=404, detail=f"Team {team1} not found")
@@ -98,12 +289,17 @@ async def compare_teams(
     team1_abbrev = team1_data.get("abbreviation")
     team2_abbrev = team2_data.get("abbreviation")
     
-    rivalry = next(
-        (r for r in rivalries_data 
-         if (r.get("team1") == team1_abbrev and r.get("team2") == team2_abbrev) or
-            (r.get("team1") == team2_abbrev and r.get("team2") == team1_abbrev)),
-        None
-    )
+    # Decade-filtered head-to-head comes straight from the precomputed cube
+    if decade is not None:
+        decade_start = parse_decade_query(decade, dataset)
+        return JSONResponse({
+            "team1": team1_data,
+            "team2": team2_data,
+            "rivalry": dataset.rivalry_cube.head_to_head(team1_abbrev, team2_abbrev, decade_start),
+            "decade": decade,
+        })
+    
+    rivalry = dataset.rivalry(team1_abbrev, team2_abbrev)
     
     if not rivalry:
         # Create empty rivalry if none exists
@@ -115,46 +311,185 @@ async def compare_teams(
             "team2_wins": 0,
         }
     
-    # Ensure team1_wins corresponds to team1_abbrev
+    # Ensure team1_wins corresponds to team1_abbrev (on a copy, the indexed record is shared)
     if rivalry.get("team1") != team1_abbrev:
+        rivalry = dict(rivalry)
         rivalry["team1_wins"], rivalry["team2_wins"] = rivalry["team2_wins"], rivalry["team1_wins"]
         rivalry["team1"], rivalry["team2"] = rivalry["team2"], rivalry["team1"]
     
-    return {
+    return JSONResponse({
         "team1": team1_data,
         "team2": team2_data,
         "rivalry": rivalry,
         "decade": decade,
-    }
+    })
+
+class Comparison(BaseModel):
+    team1: str
+    team2: str
+    decade: Optional[str] = None
+
+class CompareBatchRequest(BaseModel):
+    comparisons: List[Comparison]
+
+@app.post("/api/compare/batch")
+async def compare_teams_batch(batch: CompareBatchRequest, dataset: Dataset = Depends(current_dataset)):
+    """Compare many team pairs at once; results come back in request order"""
+    if len(batch.comparisons) > MAX_BATCH_COMPARISONS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_COMPARISONS} comparisons per request")
+    
+    # Resolve every team and decade first; problems are reported per comparison
+    results = []
+    all_time = []
+    by_decade = []
+    for position, comparison in enumerate(batch.comparisons):
+        team1_data = dataset.find_team(comparison.team1)
+        team2_data = dataset.find_team(comparison.team2)
+        result = {"team1": comparison.team1, "team2": comparison.team2, "decade": comparison.decade}
+        results.append(result)
+        
+        if not team1_data or not team2_data:
+            result["error"] = f"Team {comparison.team2 if team1_data else comparison.team1} not found"
+            continue
+        result["team1"] = team1_data.get("abbreviation")
+        result["team2"] = team2_data.get("abbreviation")
+        if comparison.decade is None:
+            all_time.append(position)
+            continue
+        try:
+            decade_start = parse_decade(comparison.decade)
+        except InvalidDecade as e:
+            result["error"] = str(e)
+            continue
+        if dataset.rivalry_cube is None:
+            result["error"] = "Decade breakdown not available. Run process_data.py first."
+            continue
+        by_decade.append((position, decade_start))
+    
+    # One vectorized lookup for the all-time records and one for the decade records
+    rivalries = dataset.rivalry_index.head_to_head_many(
+        [results[position]["team1"] for position in all_time], [results[position]["team2"] for position in all_time]
+    )
+    for position, rivalry in zip(all_time, rivalries):
+        results[position]["rivalry"] = rivalry
+    if by_decade:
+        rivalries = dataset.rivalry_cube.head_to_head_many(
+            [results[position]["team1"] for position, _ in by_decade],
+            [results[position]["team2"] for position, _ in by_decade],
+            [decade_start for _, decade_start in by_decade],
+        )
+        for (position, _), rivalry in zip(by_decade, rivalries):
+            results[position]["rivalry"] = rivalry
+    
+    return JSONResponse({"results": results})
+
+@app.get("/api/games")
+async def get_games(
+    team1: str = Query(..., description="First team ID or abbreviation"),
+    team2: str = Query(..., description="Second team ID or abbreviation"),
+    date_from: str = Query(None, alias="from", description="First date to include (YYYY-MM-DD)"),
+    date_to: str = Query(None, alias="to", description="Last date to include (YYYY-MM-DD)"),
+    dataset: Dataset = Depends(current_dataset),
+):
+    """Get every game between two teams with the running series record and margin distribution"""
+    if dataset.game_history is None:
+        raise HTTPException(status_code=503, detail="Game history not available. Run process_data.py first.")
+    
+    team1_data = dataset.find_team(team1)
+    team2_data = dataset.find_team(team2)
+    
+    if not team1_data:
+        raise HTTPException(status_code=404, detail=f"Team {team1} not found")
+    if not team2_data:
+        raise HTTPException(status_code=404, detail=f"Team {team2} not found")
+    
+    try:
+        day_from = parse_date(date_from) if date_from else None
+        day_to = parse_date(date_to) if date_to else None
+    except InvalidGameQuery as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    history = dataset.game_history.head_to_head(team1_data.get("abbreviation"), team2_data.get("abbreviation"), day_from, day_to)
+    return {**history, "from": date_from, "to": date_to}
+
+def export_response(records, rows, fields, export_format, name):
+    """Stream rows of records as an export file download"""
+    return StreamingResponse(
+        export_chunks(records, rows, fields, export_format),
+        media_type=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{export_format}"'},
+    )
+
+@app.get("/api/export/players.{export_format}")
+async def export_players(
+    export_format: str,
+    sort: str = Query(None, description="Sort by a numeric field, e.g. career_ppg or total_games"),
+    order: str = Query("desc", description="Sort direction: 'asc' or 'desc'"),
+    offset: int = Query(0, ge=0, description="Skip this many matching players"),
+    limit: int = Query(None, ge=0, description="Limit number of results (0 for no limit)"),
+    fields: str = Query(None, description="Comma-separated fields to export, e.g. 'player_id,name,career_ppg'"),
+    min_games: int = Query(None, description="Only players with at least this many total games"),
+    team: str = Query(None, description="Only players who played for this team abbreviation"),
+    dataset: Dataset = Depends(current_dataset),
+):
+    """Stream every matching player as NDJSON (one object per line) or CSV"""
+    try:
+        check_format(export_format)
+    except InvalidExportQuery as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    
+    field_list = parse_fields(fields) or dataset.player_index.fields
+    try:
+        check_fields(field_list, dataset.player_index.fields)
+        rows = dataset.player_index.matching_rows(sort=sort, order=order, team=team, min_games=min_games)
+    except (InvalidExportQuery, InvalidPlayerQuery) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    rows = rows[offset:offset + limit] if limit else rows[offset:]
+    return export_response(dataset.players, rows, field_list, export_format, "players")
+
+@app.get("/api/export/rivalries.{export_format}")
+async def export_rivalries(
+    export_format: str,
+    team: str = Query(None, description="Only rivalries involving this team abbreviation"),
+    min_meetings: int = Query(None, description="Only rivalries with at least this many meetings"),
+    fields: str = Query(None, description="Comma-separated fields to export, e.g. 'team1,team2,total_meetings'"),
+    dataset: Dataset = Depends(current_dataset),
+):
+    """Stream every matching rivalry as NDJSON (one object per line) or CSV"""
+    try:
+        check_format(export_format)
+    except InvalidExportQuery as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    
+    field_list = parse_fields(fields) or dataset.rivalry_index.fields
+    try:
+        check_fields(field_list, dataset.rivalry_index.fields)
+    except InvalidExportQuery as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    rows = dataset.rivalry_index.matching_rows(team=team, min_meetings=min_meetings)
+    return export_response(dataset.rivalries, rows, field_list, export_format, "rivalries")
 
 @app.get("/api/map-data")
-async def get_map_data():
+async def get_map_data(request: Request, dataset: Dataset = Depends(current_dataset)):
     """Get all teams with coordinates and stats for map visualization"""
-    return teams_data
+    return dataset.teams_body.respond(request)
 
 @app.get("/api/states")
-async def get_states():
+async def get_states(request: Request, dataset: Dataset = Depends(current_dataset)):
     """Get all states with aggregated stats"""
-    # Add teams to each state
-    result = []
-    for state in states_data:
-        state_copy = state.copy()
-        state_teams = [t for t in teams_data if t.get("state").lower() == state.get("state_name").lower()]
-        state_copy["teams"] = state_teams
-        result.append(state_copy)
-    return result
+    # Teams are joined to each state once in Dataset.build_indexes()
+    return dataset.states_body.respond(request)
 
 @app.get("/api/states/{state}")
-async def get_state(state: str):
+async def get_state(state: str, dataset: Dataset = Depends(current_dataset)):
     """Get state-level aggregated stats"""
-    state_data = next((s for s in states_data if s.get("state_name").lower() == state.lower()), None)
+    # Includes the teams in this state
+    state_data = dataset.states_by_name.get(state.lower())
     
     if not state_data:
         raise HTTPException(status_code=404, detail=f"State {state} not found")
     
-    # Also include teams in this state
-    state_teams = [t for t in teams_data if t.get("state").lower() == state.lower()]
-    state_data["teams"] = state_teams
-    
-    return state_data
+    return JSONResponse(state_data)
 
@@ -0,0 +1,333 @@
+"""
+Dataset Manager
+Loads the data files into one immutable Dataset (records, lookup indexes and pre-serialized responses)
+and swaps in a freshly built one when backend/data changes, so requests never see a mix of old and new data
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+
+from starlette.concurrency import run_in_threadpool
+
+from game_history import GameHistory
+from player_index import PlayerIndex
+from player_search import PlayerSearch
+from player_similarity import PlayerSimilarity
+from precompressed import PrecompressedJSON
+from rivalry_cube import RivalryCube
+from rivalry_index import RivalryIndex, pair_key
+from rivalry_matrix import RivalryMatrix
+from snapshot import Snapshot, SnapshotError
+
+SUMMARY_FILENAMES = ["team_summary.json", "player_summary.json", "rivalry_summary.json", "state_summary.json"]
+SNAPSHOT_FILENAME = "snapshot.bin"
+GAME_CUBE_FILENAME = "game_cube.npz"
+GAME_STORE_DIRNAME = "games"
+ELO_FILENAME = "elo_ratings.json"
+
+# Hashes and sizes of the data files, written by process_data.py after them
+MANIFEST_FILENAME = "manifest.json"
+
+# Response header carrying the version of the data a response was served from
+DATA_VERSION_HEADER = "X-Data-Version"
+
+class FrozenRecord(dict):
+    """A read-only dict for records shared by every request; copy it with dict(record) to modify"""
+    
+    __slots__ = ()
+    
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(f"{type(self).__name__} is shared between requests and cannot be modified")
+    
+    __setitem__ = __delitem__ = __ior__ = clear = pop = popitem = setdefault = update = _read_only
+
+def freeze(value):
+    """Deep-freeze JSON data: dicts become FrozenRecords and lists become tuples"""
+    if isinstance(value, dict):
+        return FrozenRecord((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+def source_files(data_dir):
+    """The data files a Dataset is loaded from, in a fixed order"""
+    data_dir = Path(data_dir)
+    paths = [data_dir / name for name in SUMMARY_FILENAMES + [SNAPSHOT_FILENAME, GAME_CUBE_FILENAME, ELO_FILENAME]]
+    paths += sorted((data_dir / GAME_STORE_DIRNAME).glob("*.npy"))
+    return [path for path in paths if path.exists()]
+
+def fingerprint(data_dir):
+    """Name, size and modification time of every data file; cheap enough to poll"""
+    data_dir = Path(data_dir)
+    entries = []
+    for path in source_files(data_dir):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:  # replaced between listing and stat
+            continue
+        entries.append((str(path.relative_to(data_dir)), stat.st_size, stat.st_mtime_ns))
+    return tuple(entries)
+
+def manifest_hashes(data_dir, paths):
+    """SHA-256 per data file from manifest.json, or None if it's missing or doesn't describe the files on disk
+    
+    Any file added, removed, resized or modified after the manifest was written makes it out of date.
+    """
+    manifest_path = data_dir / MANIFEST_FILENAME
+    try:
+        manifest_mtime = manifest_path.stat().st_mtime_ns
+        with open(manifest_path, "r") as f:
+            files = json.load(f)["files"]
+        names = [path.relative_to(data_dir).as_posix() for path in paths]
+        if set(names) != set(files):
+            return None
+        for name, path in zip(names, paths):
+            stat = path.stat()
+            if stat.st_size != files[name]["bytes"] or stat.st_mtime_ns > manifest_mtime:
+                return None
+        return {name: files[name]["sha256"] for name in names}
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def file_hashes(data_dir, paths):
+    """SHA-256 per data file, read from disk"""
+    return {path.relative_to(data_dir).as_posix(): hashlib.sha256(path.read_bytes()).hexdigest() for path in paths}
+
+def hashes_version(hashes):
+    """Short hash of the files' hashes listed like `sha256sum` output sorted by name, as in manifest.json"""
+    listing = "".join(f"{hashes[name]}  {name}\n" for name in sorted(hashes))
+    return hashlib.sha256(listing.encode("utf-8")).hexdigest()[:12]
+
+def content_version(data_dir):
+    """Short hash of the data files' contents, so every worker reports the same version for the same data
+    
+    A current manifest spares reading the files; otherwise each one is hashed.
+    """
+    data_dir = Path(data_dir)
+    paths = source_files(data_dir)
+    hashes = manifest_hashes(data_dir, paths)
+    if hashes is None:
+        hashes = file_hashes(data_dir, paths)
+    return hashes_version(hashes)
+
+def open_snapshot(data_dir):
+    """Open the snapshot if it exists and was built from the current JSON files"""
+    snapshot_path = Path(data_dir) / SNAPSHOT_FILENAME
+    if not snapshot_path.exists():
+        return None
+    try:
+        snapshot = Snapshot(snapshot_path)
+    except SnapshotError as e:
+        print(f"Warning: {e}, loading JSON instead")
+        return None
+    if not snapshot.matches(data_dir):
+        print(f"Warning: {snapshot_path.name} is out of date with the JSON files, loading JSON instead")
+        return None
+    return snapshot
+
+class Dataset:
+    """Everything the API serves from one load of the data files; nothing is modified after construction
+    
+    Records are FrozenRecords in tuples, so handlers can return them as they are without copying. Snapshot
+    tables are read-only already and materialize fresh dicts per request.
+    """
+    
+    def __init__(self, version, teams, players, rivalries, states, snapshot=None, rivalry_cube=None, game_history=None, elo_ratings=None):
+        self.version = version
+        self.teams = freeze(teams)
+        self.players = freeze(players)
+        self.rivalries = freeze(rivalries)
+        self.states = freeze(states)
+        self.snapshot = snapshot
+        
+        # Per-decade head-to-head and per-season records from game_cube.npz (None until the pipeline writes it)
+        self.rivalry_cube = rivalry_cube
+        
+        # Memory-mapped game-level columns from data/games/ (None until the pipeline writes them)
+        self.game_history = game_history
+        
+        # Per-season Elo series from elo_ratings.json (None until the pipeline writes it)
+        self.elo_ratings = freeze(elo_ratings) if elo_ratings is not None else None
+        
+        self.build_indexes()
+        self.build_response_cache()
+    
+    @classmethod
+    def empty(cls):
+        """The dataset served before any data files have loaded"""
+        return cls(None, [], [], [], [])
+    
+    def build_indexes(self):
+        """Build team, rivalry, state and player lookup indexes so per-request lookups are O(1)"""
+        # First occurrence wins, matching the list scans these replace
+        self.teams_by_id = {}
+        self.teams_by_abbreviation = {}
+        for team in self.teams:
+            self.teams_by_id.setdefault(str(team.get("team_id")), team)
+            self.teams_by_abbreviation.setdefault(team.get("abbreviation"), team)
+        
+        # The state <-> team join is done once here; get_states and get_state serve these records as they are
+        teams_by_state = {}
+        for team in self.teams:
+            teams_by_state.setdefault((team.get("state") or "").lower(), []).append(team)
+        
+        self.states_with_teams = tuple(
+            FrozenRecord({**state, "teams": tuple(teams_by_state.get(state.get("state_name").lower(), []))})
+            for state in self.states
+        )
+        self.states_by_name = {}
+        for state_record in self.states_with_teams:
+            self.states_by_name.setdefault(state_record.get("state_name").lower(), state_record)
+        
+        self.rivalry_index = RivalryIndex(self.rivalries)
+        if self.rivalry_cube is not None:
+            self.rivalry_matrix = RivalryMatrix.from_cube(self.rivalry_cube)
+        else:
+            self.rivalry_matrix = RivalryMatrix.from_rivalries(self.rivalry_index)
+        self.player_index = PlayerIndex(self.players)
+        self.player_search = PlayerSearch(self.players)
+        self.player_similarity = PlayerSimilarity(self.players)
+        self.elo_by_team = {record.get("team"): record for record in self.elo_ratings or ()}
+    
+    def build_response_cache(self):
+        """Serialize and compress the static collection responses once"""
+        bodies = self.snapshot.bodies if self.snapshot is not None else {}
+        self.teams_body = PrecompressedJSON(self.teams, bodies.get("team_summary"))
+        self.players_body = PrecompressedJSON(self.players, bodies.get("player_summary"))
+        self.states_body = PrecompressedJSON(self.states_with_teams)
+        self.elo_body = PrecompressedJSON(self.elo_ratings) if self.elo_ratings is not None else None
+        
+        # The all-time matrix and every decade slice, keyed by decade start (None for all-time)
+        self.matrix_bodies = {
+            decade: PrecompressedJSON(self.rivalry_matrix.matrix(decade))
+            for decade in [None] + self.rivalry_matrix.decades
+        }
+    
+    def find_team(self, team_id):
+        """Look up a team by ID or abbreviation"""
+        return self.teams_by_id.get(team_id) or self.teams_by_abbreviation.get(team_id.upper())
+    
+    def rivalry(self, team1, team2):
+        """The rivalry summary record for a pair of abbreviations, or None"""
+        row = self.rivalry_index.by_pair.get(pair_key(team1, team2))
+        return self.rivalries[row] if row is not None else None
+
+def load_dataset(data_dir, version=None, use_snapshot=True):
+    """Load the data files in data_dir into a new Dataset"""
+    data_dir = Path(data_dir)
+    snapshot = open_snapshot(data_dir) if use_snapshot else None
+    if snapshot is not None:
+        # Players and rivalries stay columnar in the shared mapping; the small tables become dicts
+        teams = list(snapshot.tables["team_summary"])
+        players = snapshot.tables["player_summary"]
+        rivalries = snapshot.tables["rivalry_summary"]
+        states = list(snapshot.tables["state_summary"])
+    else:
+        teams, players, rivalries, states = [], [], [], []
+        for filename, records in zip(SUMMARY_FILENAMES, [teams, players, rivalries, states]):
+            with open(data_dir / filename, "r") as f:
+                records.extend(json.load(f))
+    
+    cube_path = data_dir / GAME_CUBE_FILENAME
+    rivalry_cube = RivalryCube.load(cube_path) if cube_path.exists() else None
+    games_dir = data_dir / GAME_STORE_DIRNAME
+    game_history = GameHistory(games_dir) if (games_dir / "teams.npy").exists() else None
+    elo_path = data_dir / ELO_FILENAME
+    elo_ratings = None
+    if elo_path.exists():
+        with open(elo_path, "r") as f:
+            elo_ratings = json.load(f)
+    
+    dataset = Dataset(version, teams, players, rivalries, states, snapshot, rivalry_cube, game_history, elo_ratings)
+    
+    print(f"Loaded {len(teams)} teams, {len(players)} players, {len(rivalries)} rivalries, {len(states)} states from {'snapshot' if snapshot is not None else 'JSON'} (version {version})")
+    if rivalry_cube is None:
+        print(f"Warning: {cube_path.name} not found, decade filters and season records are unavailable. Run process_data.py to generate it.")
+    if game_history is None:
+        print(f"Warning: {games_dir.name}/ game store not found, /api/games is unavailable. Run process_data.py to generate it.")
+    if elo_ratings is None:
+        print(f"Warning: {elo_path.name} not found, Elo ratings are unavailable. Run process_data.py to generate it.")
+    return dataset
+
+class DatasetManager:
+    """Holds the active Dataset and replaces it with a single reference assignment
+    
+    A request reads `current` once and keeps that Dataset for its whole lifetime, so a reload never
+    changes the data under a request in flight; the old Dataset is freed when its last request finishes.
+    """
+    
+    def __init__(self, data_dir, use_snapshot=True):
+        self.data_dir = Path(data_dir)
+        self.use_snapshot = use_snapshot
+        self.current = Dataset.empty()
+        self.loaded_fingerprint = None
+        # One reload at a time; reloads run in worker threads
+        self.lock = threading.Lock()
+    
+    def reload(self):
+        """Build a Dataset from the data files and swap it in if their content changed; returns True if swapped
+        
+        Errors (missing or half-written files) propagate and leave the current Dataset in place.
+        """
+        with self.lock:
+            seen = fingerprint(self.data_dir)
+            version = content_version(self.data_dir)
+            if version == self.current.version:
+                self.loaded_fingerprint = seen
+                return False
+            
+            start = time.perf_counter()
+            dataset = load_dataset(self.data_dir, version, self.use_snapshot)
+            self.current = dataset
+            self.loaded_fingerprint = seen
+            print(f"  Data version {version} active after {time.perf_counter() - start:.2f}s")
+            return True
+    
+    async def watch(self, interval):
+        """Poll the data directory every interval seconds and reload once a change has settled"""
+        pending = None
+        while True:
+            await asyncio.sleep(interval)
+            seen = await run_in_threadpool(fingerprint, self.data_dir)
+            if seen == self.loaded_fingerprint:
+                pending = None
+                continue
+            
+            # Wait for one quiet interval so a pipeline run that is still writing files isn't loaded halfway
+            if seen != pending:
+                pending = seen
+                continue
+            pending = None
+            try:
+                await run_in_threadpool(self.reload)
+            except Exception as e:
+                # Keep serving the current data; the next change to the files triggers another attempt
+                self.loaded_fingerprint = seen
+                print(f"Warning: Reloading data failed, still serving version {self.current.version}. Error: {e}")
+
+class DataVersionMiddleware:
+    """Pins each HTTP request to the Dataset active when it arrived and reports that Dataset's version"""
+    
+    def __init__(self, app, manager):
+        self.app = app
+        self.manager = manager
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        dataset = self.manager.current
+        scope.setdefault("state", {})["dataset"] = dataset
+        version_header = (DATA_VERSION_HEADER.lower().encode(), (dataset.version or "none").encode())
+        
+        async def send_with_version(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), version_header]}
+            await send(message)
+        
+        await self.app(scope, receive, send_with_version)
@@ -0,0 +1,77 @@
+"""
+Streaming Exports
+Encodes selected rows as NDJSON or CSV in bounded-size chunks, materializing a small batch of records at a
+time so a full export never holds more than one chunk in memory
+"""
+
+import asyncio
+import csv
+
+from precompressed import serialize_json
+from snapshot import records_at
+
+# Media type of each export format
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+# Records materialized at a time, and the body size at which a chunk is sent
+EXPORT_BATCH_ROWS = 256
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+# Separator for list values (e.g. a player's teams) inside one CSV cell
+CSV_LIST_SEPARATOR = ";"
+
+class InvalidExportQuery(ValueError):
+    """Raised for an unknown export format or field"""
+
+def check_format(export_format):
+    """Validate an export format name"""
+    if export_format not in EXPORT_FORMATS:
+        raise InvalidExportQuery(f"Unknown export format: {export_format} (expected {' or '.join(EXPORT_FORMATS)})")
+
+def check_fields(fields, available):
+    """Validate a projection field list against the fields records have"""
+    unknown = [field for field in fields if field not in available]
+    if unknown:
+        raise InvalidExportQuery(f"Unknown fields: {', '.join(unknown)}")
+
+def csv_cell(value):
+    """A JSON value as CSV text: lists joined, booleans and null as in JSON"""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (list, tuple)):
+        return CSV_LIST_SEPARATOR.join(str(item) for item in value)
+    return value
+
+class ChunkBuffer:
+    """Byte buffer that csv.writer can write text into"""
+    
+    def __init__(self):
+        self.data = bytearray()
+    
+    def write(self, text):
+        self.data += text.encode("utf-8")
+
+async def export_chunks(records, rows, fields, export_format):
+    """Yield the records at rows (in that order) projected to fields, as NDJSON lines or CSV with a header row"""
+    buffer = ChunkBuffer()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if export_format == "csv":
+        writer.writerow(fields)
+    
+    for start in range(0, len(rows), EXPORT_BATCH_ROWS):
+        for record in records_at(records, rows[start:start + EXPORT_BATCH_ROWS]):
+            if export_format == "csv":
+                writer.writerow([csv_cell(record.get(field)) for field in fields])
+            else:
+                buffer.data += serialize_json({field: record[field] for field in fields if field in record})
+                buffer.data += b"\n"
+            if len(buffer.data) >= EXPORT_CHUNK_BYTES:
+                yield bytes(buffer.data)
+                buffer.data.clear()
+        # Let other requests run between batches
+        await asyncio.sleep(0)
+    
+    if buffer.data:
+        yield bytes(buffer.data)
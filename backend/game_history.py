@@ -0,0 +1,114 @@
+"""
+Game History
+Memory-mapped view of the columnar game store written by process_data.py, answering head-to-head
+queries with an offset lookup and a binary search on dates
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+# Margin buckets (team1 points minus team2 points) for the distribution; the outer buckets are open
+MARGIN_BUCKET_EDGES = [-20, -15, -10, -5, 0, 5, 10, 15, 20]
+
+COLUMNS = ["pair_offsets", "team1", "team2", "date", "team1_pts", "team2_pts", "team1_home"]
+
+class InvalidGameQuery(ValueError):
+    """Raised for a malformed date"""
+
+def parse_date(value):
+    """'YYYY-MM-DD' -> days since 1970-01-01"""
+    try:
+        return int(np.datetime64(value, "D").astype(np.int64))
+    except ValueError:
+        raise InvalidGameQuery(f"Invalid date: {value} (expected YYYY-MM-DD)")
+
+def margin_distribution(margins):
+    """Count margins into MARGIN_BUCKET_EDGES buckets"""
+    edges = np.array(MARGIN_BUCKET_EDGES)
+    counts = np.bincount(np.searchsorted(edges, margins, side="left"), minlength=len(edges) + 1)
+    lows = [None] + [edge + 1 for edge in MARGIN_BUCKET_EDGES]
+    highs = MARGIN_BUCKET_EDGES + [None]
+    return [
+        {"min": low, "max": high, "count": int(count)}
+        for low, high, count in zip(lows, highs, counts)
+    ]
+
+class GameHistory:
+    """Head-to-head game queries over memory-mapped columns; only the matching slice becomes Python objects"""
+    
+    def __init__(self, directory):
+        directory = Path(directory)
+        self.teams = [str(team) for team in np.load(directory / "teams.npy", allow_pickle=False)]
+        self.team_index = {team: i for i, team in enumerate(self.teams)}
+        self.columns = {name: np.load(directory / f"{name}.npy", mmap_mode="r", allow_pickle=False) for name in COLUMNS}
+    
+    def __len__(self):
+        return len(self.columns["date"])
+    
+    def head_to_head(self, team1, team2, date_from=None, date_to=None):
+        """Games between team1 and team2 (dates inclusive, days since epoch), with running series record
+        and margin distribution from team1's side"""
+        i = self.team_index.get(team1)
+        j = self.team_index.get(team2)
+        
+        # The store keeps each pair once, in sorted order; a team missing from the store has no games
+        flipped = i is not None and j is not None and i > j
+        if i is None or j is None:
+            start = end = 0
+        else:
+            first, second = (j, i) if flipped else (i, j)
+            pair = first * len(self.teams) + second
+            start, end = int(self.columns["pair_offsets"][pair]), int(self.columns["pair_offsets"][pair + 1])
+        
+        # Dates are sorted within the pair, so the range is two binary searches
+        dates = self.columns["date"][start:end]
+        low = int(np.searchsorted(dates, date_from, side="left")) if date_from is not None else 0
+        high = int(np.searchsorted(dates, date_to, side="right")) if date_to is not None else len(dates)
+        start, end = start + low, start + max(low, high)
+        
+        dates = self.columns["date"][start:end]
+        first_pts = self.columns["team1_pts"][start:end].astype(np.int64)
+        second_pts = self.columns["team2_pts"][start:end].astype(np.int64)
+        first_home = self.columns["team1_home"][start:end]
+        
+        # A game goes to the sorted-first team only on strictly more points, as in the rivalry summary
+        first_won = first_pts > second_pts
+        if flipped:
+            team1_pts, team2_pts, team1_home, team1_won = second_pts, first_pts, ~first_home, ~first_won
+        else:
+            team1_pts, team2_pts, team1_home, team1_won = first_pts, second_pts, first_home, first_won
+        team1_wins = np.cumsum(team1_won)
+        team2_wins = np.arange(1, len(team1_won) + 1) - team1_wins
+        margins = team1_pts - team2_pts
+        
+        games = [
+            {
+                "date": date,
+                "home_team": team1 if home else team2,
+                "away_team": team2 if home else team1,
+                "team1_pts": pts1,
+                "team2_pts": pts2,
+                "winner": team1 if won else team2,
+                "team1_wins": wins1,
+                "team2_wins": wins2,
+            }
+            for date, home, pts1, pts2, won, wins1, wins2 in zip(
+                dates.astype("datetime64[D]").astype(str).tolist(), team1_home.tolist(), team1_pts.tolist(), team2_pts.tolist(),
+                team1_won.tolist(), team1_wins.tolist(), team2_wins.tolist(),
+            )
+        ]
+        return {
+            "team1": team1,
+            "team2": team2,
+            "record": {
+                "total_meetings": len(games),
+                "team1_wins": int(team1_wins[-1]) if games else 0,
+                "team2_wins": int(team2_wins[-1]) if games else 0,
+            },
+            "margins": {
+                "average": round(float(margins.mean()), 2) if games else None,
+                "distribution": margin_distribution(margins),
+            },
+            "games": games,
+        }
@@ -0,0 +1,133 @@
+"""
+Player Index
+Presorted index arrays over the player list for sorted, filtered and paginated /api/players queries
+"""
+
+import base64
+
+import numpy as np
+
+from snapshot import column_values
+
+class InvalidPlayerQuery(ValueError):
+    """Raised for an unknown sort field, projection field or malformed cursor"""
+
+def encode_cursor(sort, order, position):
+    """Opaque cursor pointing at a position in one sort order"""
+    return base64.urlsafe_b64encode(f"{sort}:{order}:{position}".encode()).decode().rstrip("=")
+
+def decode_cursor(cursor):
+    """Decode a cursor into (sort, order, position)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort, order, position = base64.urlsafe_b64decode(padded.encode()).decode().rsplit(":", 2)
+        position = int(position)
+    except (ValueError, UnicodeDecodeError):
+        raise InvalidPlayerQuery(f"Invalid cursor: {cursor}")
+    if position < 0:
+        raise InvalidPlayerQuery(f"Invalid cursor: {cursor}")
+    return sort, order, position
+
+class PlayerIndex:
+    """Sort orders, team membership and field names for a list of player records
+    
+    Every numeric field (career_* stats, total_games, award counts) gets an ascending and a descending
+    index array at build time, so a page costs the rows it returns plus any rows skipped by filters.
+    """
+    
+    def __init__(self, players):
+        self.players = players
+        self.fields = list(players[0].keys()) if players else []
+        
+        # Read each candidate field once as a column instead of indexing records in the sort keys
+        first = players[0] if players else {}
+        columns = {
+            field: column_values(players, field) for field in self.fields
+            if field != "player_id" and isinstance(first.get(field), (int, float)) and not isinstance(first.get(field), bool)
+        }
+        self.sortable_fields = [
+            field for field, values in columns.items()
+            if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values)
+        ]
+        
+        # File order plus both directions of every sortable field as int32 row arrays; stable sorts keep
+        # file order for ties
+        self.orders = {(None, "asc"): np.arange(len(players), dtype=np.int32)}
+        for field in self.sortable_fields:
+            values = np.array(columns[field], dtype=np.float64)
+            self.orders[(field, "asc")] = np.argsort(values, kind="stable").astype(np.int32)
+            self.orders[(field, "desc")] = np.argsort(-values, kind="stable").astype(np.int32)
+        self.total_games = np.array([games or 0 for games in column_values(players, "total_games")], dtype=np.int64)
+        
+        by_team = {}
+        for i, teams in enumerate(column_values(players, "teams")):
+            for team in teams or []:
+                by_team.setdefault(team, []).append(i)
+        self.by_team = {team: np.array(rows, dtype=np.int32) for team, rows in by_team.items()}
+    
+    def check_fields(self, fields):
+        """Validate a projection field list"""
+        unknown = [field for field in fields if field not in self.fields]
+        if unknown:
+            raise InvalidPlayerQuery(f"Unknown fields: {', '.join(unknown)}")
+    
+    def sort_order(self, sort=None, order="desc"):
+        """Validate a sort field and direction, returning the normalized (sort, order)"""
+        if sort is not None and sort not in self.sortable_fields:
+            raise InvalidPlayerQuery(f"Cannot sort by {sort}; sortable fields: {', '.join(self.sortable_fields)}")
+        if order not in ("asc", "desc"):
+            raise InvalidPlayerQuery(f"Invalid order: {order}")
+        if sort is None:
+            order = "asc"
+        return sort, order
+    
+    def filter_mask(self, team=None, min_games=None):
+        """Boolean mask over rows for the team and min_games filters, or None when unfiltered"""
+        if not team and min_games is None:
+            return None
+        matches = np.ones(len(self.total_games), dtype=bool)
+        if team:
+            matches[:] = False
+            matches[self.by_team.get(team.upper(), np.empty(0, dtype=np.int32))] = True
+        if min_games is not None:
+            matches &= self.total_games >= min_games
+        return matches
+    
+    def matching_rows(self, sort=None, order="desc", team=None, min_games=None):
+        """Row indexes (an int32 array) of every player matching the filters, in sort order"""
+        sort, order = self.sort_order(sort, order)
+        indexes = self.orders[(sort, order)]
+        matches = self.filter_mask(team, min_games)
+        return indexes if matches is None else indexes[matches[indexes]]
+    
+    def page(self, sort=None, order="desc", offset=0, cursor=None, limit=None, team=None, min_games=None):
+        """Return (player indexes for this page, cursor for the next page or None)"""
+        sort, order = self.sort_order(sort, order)
+        
+        start = 0
+        if cursor is not None:
+            cursor_sort, cursor_order, start = decode_cursor(cursor)
+            if (cursor_sort or None, cursor_order) != (sort, order):
+                raise InvalidPlayerQuery("Cursor belongs to a different sort order")
+        
+        indexes = self.orders[(sort, order)]
+        matches = self.filter_mask(team, min_games)
+        
+        # Unfiltered pages are a plain slice of the presorted array
+        if matches is None:
+            start += offset
+            end = len(indexes) if limit is None else min(start + limit, len(indexes))
+            next_cursor = encode_cursor(sort or "", order, end) if end < len(indexes) else None
+            return indexes[start:end].tolist(), next_cursor
+        
+        # Filtered pages: keep the matches after the cursor in sort order
+        hits = np.flatnonzero(matches[indexes[start:]])[offset:]
+        
+        # The next page starts right after the last row this one returned
+        if limit is not None and len(hits) > limit:
+            hits = hits[:limit]
+            position = start + int(hits[-1]) + 1 if limit else start
+        else:
+            position = len(indexes)
+        next_cursor = encode_cursor(sort or "", order, position) if position < len(indexes) else None
+        return indexes[start + hits].tolist(), next_cursor
@@ -0,0 +1,140 @@
+"""
+Player Search
+In-memory prefix and trigram index over normalized player names for the /api/players/search typeahead
+"""
+
+import re
+import unicodedata
+
+import numpy as np
+
+from snapshot import column_values, records_at
+
+# Cap on how many characters of each name token get a prefix posting list
+MAX_PREFIX_LENGTH = 12
+
+# Minimum share of the query's trigrams a name must contain to count as a fuzzy match
+FUZZY_THRESHOLD = 0.6
+
+def normalize_name(name):
+    """Lowercase, strip accents and punctuation, collapse whitespace"""
+    name = unicodedata.normalize("NFKD", str(name or ""))
+    name = "".join(ch for ch in name if not unicodedata.combining(ch)).lower()
+    name = re.sub(r"[.'’`]", "", name)
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", name).split())
+
+def trigrams(text):
+    """Character trigrams of a normalized name, with a leading space so word starts are grams too"""
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class PlayerSearch:
+    """Typeahead index over player names
+    
+    Players are renumbered by career relevance, so every posting list is already in ranking order and a
+    prefix lookup is a dict hit plus a slice. Queries with too few prefix matches fall back to trigram
+    overlap, counted for all players at once with numpy.
+    """
+    
+    def __init__(self, players):
+        self.players = players
+        
+        # Career relevance: all-star appearances first, then games played
+        all_stars = column_values(players, "all_star_appearances")
+        games = column_values(players, "total_games")
+        self.rows = sorted(range(len(players)), key=lambda i: (-(all_stars[i] or 0), -(games[i] or 0)))
+        all_names = column_values(players, "name")
+        names = [normalize_name(all_names[row]) for row in self.rows]
+        
+        # Prefix of the full name, and prefix of any single name token -> ranks in relevance order
+        name_prefixes = {}
+        token_prefixes = {}
+        for rank, name in enumerate(names):
+            for length in range(1, min(len(name), MAX_PREFIX_LENGTH) + 1):
+                name_prefixes.setdefault(name[:length], []).append(rank)
+            seen = set()
+            for token in name.split():
+                for length in range(1, min(len(token), MAX_PREFIX_LENGTH) + 1):
+                    prefix = token[:length]
+                    if prefix not in seen:
+                        seen.add(prefix)
+                        token_prefixes.setdefault(prefix, []).append(rank)
+        self.names = names
+        self.name_prefixes = name_prefixes
+        self.token_prefixes = token_prefixes
+        self.token_sets = {}
+        
+        grams = {}
+        for rank, name in enumerate(names):
+            for gram in trigrams(name):
+                grams.setdefault(gram, []).append(rank)
+        self.grams = {gram: np.array(ranks, dtype=np.int32) for gram, ranks in grams.items()}
+    
+    def token_matches(self, token):
+        """Set of ranks with a name token starting with token"""
+        key = token[:MAX_PREFIX_LENGTH]
+        matches = self.token_sets.get(key)
+        if matches is None:
+            matches = self.token_sets[key] = frozenset(self.token_prefixes.get(key, ()))
+        if len(token) <= MAX_PREFIX_LENGTH:
+            return matches
+        return frozenset(rank for rank in matches if any(part.startswith(token) for part in self.names[rank].split()))
+    
+    def prefix_search(self, query, limit):
+        """Ranks whose full name starts with the query, then those where every query token prefixes a name token"""
+        results = []
+        seen = set()
+        
+        if len(query) <= MAX_PREFIX_LENGTH:
+            candidates = self.name_prefixes.get(query, ())
+        else:
+            candidates = (rank for rank in self.name_prefixes.get(query[:MAX_PREFIX_LENGTH], ()) if self.names[rank].startswith(query))
+        for rank in candidates:
+            results.append(rank)
+            seen.add(rank)
+            if len(results) >= limit:
+                return results
+        
+        # Walk the rarest token's postings in relevance order, checking membership for the rest
+        tokens = sorted(set(query.split()), key=lambda token: len(self.token_prefixes.get(token[:MAX_PREFIX_LENGTH], ())))
+        if not tokens:
+            return results
+        first = self.token_prefixes.get(tokens[0][:MAX_PREFIX_LENGTH], ())
+        others = [self.token_matches(token) for token in tokens[1:]]
+        if len(tokens[0]) > MAX_PREFIX_LENGTH:
+            others.append(self.token_matches(tokens[0]))
+        for rank in first:
+            if rank in seen or not all(rank in matches for matches in others):
+                continue
+            results.append(rank)
+            seen.add(rank)
+            if len(results) >= limit:
+                break
+        return results
+    
+    def fuzzy_search(self, query, limit, exclude):
+        """Ranks ordered by the share of the query's trigrams found in the name, best first, then by relevance"""
+        # No trailing pad: the last query token may be an unfinished word
+        query_grams = {f" {query}"[i:i + 3] for i in range(len(query) - 1)}
+        postings = [self.grams[gram] for gram in query_grams if gram in self.grams]
+        if not postings:
+            return []
+        similarity = np.bincount(np.concatenate(postings), minlength=len(self.names)) / len(query_grams)
+        if exclude:
+            similarity[list(exclude)] = 0.0
+        
+        # Ties on similarity fall back to rank, i.e. relevance order
+        candidates = np.flatnonzero(similarity >= FUZZY_THRESHOLD)
+        order = np.lexsort((candidates, -similarity[candidates]))
+        return candidates[order[:limit]].tolist()
+    
+    def search(self, query, limit=10, fuzzy=True):
+        """Return up to limit player records matching query, best first"""
+        query = normalize_name(query)
+        if not query or limit <= 0:
+            return []
+        
+        ranks = self.prefix_search(query, limit)
+        if fuzzy and len(ranks) < limit and len(query) >= 3:
+            ranks += self.fuzzy_search(query, limit - len(ranks), set(ranks))
+        return records_at(self.players, [self.rows[rank] for rank in ranks])
@@ -0,0 +1,82 @@
+"""
+Player Similarity
+Standardized career stat matrix for nearest-neighbour /api/players/{id}/similar queries
+"""
+
+import numpy as np
+
+from snapshot import column_values, records_at
+
+class InvalidSimilarityQuery(ValueError):
+    """Raised for an unknown stat name"""
+
+class PlayerSimilarity:
+    """Z-scored career_* stats for every player, packed into one float matrix
+    
+    Column means and standard deviations come from players with at least one game, so the many
+    zero-game records don't drag the scale towards zero. A query is a single broadcast subtraction over
+    the selected columns plus an argpartition, whatever the number of players.
+    """
+    
+    def __init__(self, players):
+        self.players = players
+        self.stats = [field for field in (players[0].keys() if players else []) if field.startswith("career_")]
+        self.stat_columns = {stat: i for i, stat in enumerate(self.stats)}
+        
+        self.row_by_id = {}
+        for i, player_id in enumerate(column_values(players, "player_id")):
+            self.row_by_id.setdefault(player_id, i)
+        
+        matrix = np.array(
+            [[value or 0.0 for value in column_values(players, stat)] for stat in self.stats],
+            dtype=np.float64,
+        ).reshape(len(self.stats), len(players)).T
+        self.total_games = np.array([games or 0 for games in column_values(players, "total_games")], dtype=np.int64)
+        
+        played = matrix[self.total_games > 0] if (self.total_games > 0).any() else matrix
+        mean = played.mean(axis=0) if len(played) else np.zeros(len(self.stats))
+        std = played.std(axis=0) if len(played) else np.ones(len(self.stats))
+        std[std == 0] = 1.0
+        self.matrix = (matrix - mean) / std
+        
+        self.rows_by_team = {}
+        for i, teams in enumerate(column_values(players, "teams")):
+            for team in teams or []:
+                self.rows_by_team.setdefault(team, []).append(i)
+        self.rows_by_team = {team: np.array(rows, dtype=np.int64) for team, rows in self.rows_by_team.items()}
+    
+    def columns(self, stats=None):
+        """Column indexes for a stat subset (all career stats by default)"""
+        if not stats:
+            return np.arange(len(self.stats))
+        unknown = [stat for stat in stats if stat not in self.stat_columns]
+        if unknown:
+            raise InvalidSimilarityQuery(f"Unknown stats: {', '.join(unknown)}; available: {', '.join(self.stats)}")
+        return np.array([self.stat_columns[stat] for stat in stats])
+    
+    def similar(self, player_id, k=10, stats=None, team=None, min_games=None):
+        """Return [(player, distance)] for the k nearest players, closest first, or None for an unknown id"""
+        row = self.row_by_id.get(player_id)
+        if row is None:
+            return None
+        columns = self.columns(stats)
+        
+        selected = self.matrix[:, columns]
+        distances = np.sqrt(((selected - selected[row]) ** 2).sum(axis=1))
+        
+        # Filtered-out players (and the player themself) get an infinite distance
+        candidates = np.ones(len(self.players), dtype=bool)
+        if team:
+            candidates[:] = False
+            candidates[self.rows_by_team.get(team.upper(), np.empty(0, dtype=np.int64))] = True
+        if min_games is not None:
+            candidates &= self.total_games >= min_games
+        candidates[row] = False
+        distances[~candidates] = np.inf
+        
+        k = min(k, int(candidates.sum()))
+        if k <= 0:
+            return []
+        nearest = np.argpartition(distances, k - 1)[:k]
+        nearest = nearest[np.lexsort((nearest, distances[nearest]))]
+        return list(zip(records_at(self.players, nearest.tolist()), distances[nearest].tolist()))
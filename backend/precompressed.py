@@ -0,0 +1,114 @@
+"""
+Pre-serialized JSON Responses
+Serializes a payload once, keeps gzip/brotli encoded variants in memory and serves them with
+strong ETags and If-None-Match support
+"""
+
+import gzip
+import hashlib
+import json
+from collections.abc import Sequence
+
+from fastapi import Request
+from fastapi.responses import Response
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip and identity are always available
+    brotli = None
+
+# Preference order when the client accepts several encodings equally
+ENCODING_PREFERENCE = ["br", "gzip", "identity"]
+
+def serialize_json(content):
+    """Encode content exactly like FastAPI's JSONResponse"""
+    # Lazy record sequences (snapshot tables) are encoded row by row, so only one row is a dict at a time
+    if isinstance(content, Sequence) and not isinstance(content, (list, tuple, str, bytes)):
+        return b"[" + b",".join(serialize_json(row) for row in content) + b"]"
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+def parse_accept_encoding(header):
+    """Parse an Accept-Encoding header into {coding: q-value}"""
+    accepted = {}
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+class PrecompressedJSON:
+    """A JSON payload serialized once, with identity, gzip and (if available) brotli bodies"""
+    
+    def __init__(self, content=None, bodies=None):
+        # Ready-made bodies (e.g. memoryviews into the data snapshot) skip serializing and compressing
+        self.bodies = dict(bodies) if bodies else {"identity": serialize_json(content)}
+        body = self.bodies["identity"]
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        
+        if "gzip" not in self.bodies:
+            self.bodies["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+        if brotli is not None and "br" not in self.bodies:
+            self.bodies["br"] = brotli.compress(body, quality=9)
+        
+        # Strong ETags must differ per content-coding
+        self.etags = {
+            coding: f'"{digest}"' if coding == "identity" else f'"{digest}-{coding}"'
+            for coding in self.bodies
+        }
+    
+    def choose_encoding(self, accept_encoding):
+        """Pick the best available encoding for an Accept-Encoding header"""
+        accepted = parse_accept_encoding(accept_encoding)
+        wildcard = accepted.get("*")
+        
+        def quality(coding):
+            if coding in accepted:
+                return accepted[coding]
+            if wildcard is not None:
+                return wildcard
+            # identity is acceptable unless explicitly refused
+            return 1.0 if coding == "identity" else 0.0
+        
+        candidates = [coding for coding in ENCODING_PREFERENCE if coding in self.bodies and quality(coding) > 0]
+        if not candidates:
+            return "identity"
+        return max(candidates, key=quality)
+    
+    def not_modified(self, if_none_match):
+        """Whether an If-None-Match header matches any representation of this payload"""
+        if not if_none_match:
+            return False
+        tags = {tag.strip() for tag in if_none_match.split(",")}
+        if "*" in tags:
+            return True
+        # If-None-Match uses weak comparison
+        tags = {tag[2:] if tag.startswith("W/") else tag for tag in tags}
+        return not tags.isdisjoint(self.etags.values())
+    
+    def respond(self, request: Request):
+        """Build the response for a request, honoring Accept-Encoding and If-None-Match"""
+        coding = self.choose_encoding(request.headers.get("accept-encoding"))
+        headers = {"ETag": self.etags[coding], "Vary": "Accept-Encoding"}
+        
+        if self.not_modified(request.headers.get("if-none-match")):
+            return Response(status_code=304, headers=headers)
+        
+        if coding != "identity":
+            headers["Content-Encoding"] = coding
+        return Response(content=bytes(self.bodies[coding]), media_type="application/json", headers=headers)
@@ -0,0 +1,93 @@
+"""
+Rivalry Cube
+Read side of the game_cube.npz written by process_data.py: per-decade head-to-head and per-season team
+records looked up by array index
+"""
+
+import re
+
+import numpy as np
+
+class InvalidDecade(ValueError):
+    """Raised for a decade that isn't of the form '1980s' or '1980'"""
+
+def parse_decade(decade):
+    """'1980s' or '1980' -> 1980"""
+    match = re.fullmatch(r"\s*(\d{3}0)s?\s*", decade or "")
+    if not match:
+        raise InvalidDecade(f"Invalid decade: {decade} (expected e.g. '1980s')")
+    return int(match.group(1))
+
+class RivalryCube:
+    """Team-pair x decade wins/points and team x season records"""
+    
+    def __init__(self, arrays):
+        self.teams = [str(team) for team in arrays["teams"]]
+        self.decades = [int(decade) for decade in arrays["decades"]]
+        self.seasons = [int(season) for season in arrays["seasons"]]
+        self.pair_wins = arrays["pair_wins"]
+        self.pair_points = arrays["pair_points"]
+        self.season_wins = arrays["season_wins"]
+        self.season_losses = arrays["season_losses"]
+        self.season_points_for = arrays["season_points_for"]
+        self.season_points_against = arrays["season_points_against"]
+        
+        self.team_index = {team: i for i, team in enumerate(self.teams)}
+        self.decade_index = {decade: i for i, decade in enumerate(self.decades)}
+    
+    @classmethod
+    def load(cls, path):
+        """Load a cube file fully into memory (it is a few hundred KB)"""
+        with np.load(path, allow_pickle=False) as archive:
+            return cls({name: archive[name] for name in archive.files})
+    
+    def head_to_head(self, team1, team2, decade):
+        """Meetings, wins and points for team1 vs team2 in one decade (all zero if they never met)"""
+        return self.head_to_head_many([team1], [team2], [decade])[0]
+    
+    def head_to_head_many(self, team1s, team2s, decades):
+        """head_to_head for many (team1, team2, decade) triples with one gather per array"""
+        i = np.array([self.team_index.get(team, -1) for team in team1s], dtype=np.int64)
+        j = np.array([self.team_index.get(team, -1) for team in team2s], dtype=np.int64)
+        d = np.array([self.decade_index.get(decade, -1) for decade in decades], dtype=np.int64)
+        known = np.flatnonzero((i >= 0) & (j >= 0) & (d >= 0))
+        i, j, d = i[known], j[known], d[known]
+        # A same-team pair only counts one side
+        other_side = i != j
+        
+        team1_wins, team2_wins, team1_points, team2_points = np.zeros((4, len(team1s)), dtype=np.int64)
+        team1_wins[known] = self.pair_wins[i, j, d]
+        team2_wins[known] = self.pair_wins[j, i, d] * other_side
+        team1_points[known] = self.pair_points[i, j, d]
+        team2_points[known] = self.pair_points[j, i, d] * other_side
+        return [
+            {
+                "team1": team1,
+                "team2": team2,
+                "total_meetings": wins1 + wins2,
+                "team1_wins": wins1,
+                "team2_wins": wins2,
+                "team1_points": points1,
+                "team2_points": points2,
+            }
+            for team1, team2, wins1, wins2, points1, points2 in zip(
+                team1s, team2s, team1_wins.tolist(), team2_wins.tolist(), team1_points.tolist(), team2_points.tolist()
+            )
+        ]
+    
+    def team_seasons(self, team):
+        """Per-season wins, losses and points for one team, oldest first (None if the team never played)"""
+        i = self.team_index.get(team)
+        if i is None:
+            return None
+        played = np.flatnonzero(self.season_wins[i] + self.season_losses[i])
+        return [
+            {
+                "season": self.seasons[s],
+                "wins": int(self.season_wins[i, s]),
+                "losses": int(self.season_losses[i, s]),
+                "points_for": int(self.season_points_for[i, s]),
+                "points_against": int(self.season_points_against[i, s]),
+            }
+            for s in played
+        ]
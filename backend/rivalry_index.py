@@ -0,0 +1,66 @@
+"""
+Rivalry Index
+Columns of the all-time rivalry summary with a team-pair lookup, for filtering rivalries and resolving
+many head-to-head records in one vectorized pass
+"""
+
+import numpy as np
+
+from snapshot import column_values
+
+def pair_key(team1, team2):
+    """Order-independent key for a pair of team abbreviations"""
+    return (team1, team2) if team1 <= team2 else (team2, team1)
+
+class RivalryIndex:
+    """Team, meeting and win columns of the rivalry records plus pair -> row"""
+    
+    def __init__(self, rivalries):
+        self.fields = list(rivalries[0].keys()) if len(rivalries) else []
+        self.team1 = np.array(column_values(rivalries, "team1"), dtype=str)
+        self.team2 = np.array(column_values(rivalries, "team2"), dtype=str)
+        self.total_meetings = np.array(column_values(rivalries, "total_meetings"), dtype=np.int64)
+        self.team1_wins = np.array(column_values(rivalries, "team1_wins"), dtype=np.int64)
+        self.team2_wins = np.array(column_values(rivalries, "team2_wins"), dtype=np.int64)
+        
+        # First occurrence wins, matching the list scans this replaces
+        self.by_pair = {}
+        for i, (team1, team2) in enumerate(zip(self.team1.tolist(), self.team2.tolist())):
+            self.by_pair.setdefault(pair_key(team1, team2), i)
+    
+    def matching_rows(self, team=None, min_meetings=None):
+        """Row indexes of the rivalries involving team (either side) with at least min_meetings games"""
+        matches = np.ones(len(self.total_meetings), dtype=bool)
+        if team:
+            matches &= (self.team1 == team.upper()) | (self.team2 == team.upper())
+        if min_meetings is not None:
+            matches &= self.total_meetings >= min_meetings
+        return np.flatnonzero(matches)
+    
+    def head_to_head_many(self, team1s, team2s):
+        """All-time records for many (team1, team2) pairs, each from team1's side and all zero if they never met"""
+        rows = np.array([self.by_pair.get(pair_key(team1, team2), -1) for team1, team2 in zip(team1s, team2s)], dtype=np.int64)
+        found = np.flatnonzero(rows >= 0)
+        stored = rows[found]
+        
+        # Stored records keep their own team order; flip the ones asked for the other way round
+        flipped = self.team1[stored] != np.array(team1s, dtype=str)[found]
+        total_meetings = np.zeros(len(rows), dtype=np.int64)
+        team1_wins = np.zeros(len(rows), dtype=np.int64)
+        team2_wins = np.zeros(len(rows), dtype=np.int64)
+        total_meetings[found] = self.total_meetings[stored]
+        team1_wins[found] = np.where(flipped, self.team2_wins[stored], self.team1_wins[stored])
+        team2_wins[found] = np.where(flipped, self.team1_wins[stored], self.team2_wins[stored])
+        
+        return [
+            {
+                "team1": team1,
+                "team2": team2,
+                "total_meetings": meetings,
+                "team1_wins": wins1,
+                "team2_wins": wins2,
+            }
+            for team1, team2, meetings, wins1, wins2 in zip(
+                team1s, team2s, total_meetings.tolist(), team1_wins.tolist(), team2_wins.tolist()
+            )
+        ]
@@ -0,0 +1,73 @@
+"""
+Rivalry Matrix
+Dense team x team wins, all-time and per decade, so the league-wide head-to-head table is one array and a
+team's results against everyone are one row and one column of it
+"""
+
+import numpy as np
+
+class RivalryMatrix:
+    """wins[i, j] is how often teams[i] beat teams[j]; decade_wins[i, j, d] the same within decades[d]"""
+    
+    def __init__(self, teams, wins, decades=(), decade_wins=None):
+        self.teams = list(teams)
+        self.team_index = {team: i for i, team in enumerate(self.teams)}
+        self.all_time_wins = np.asarray(wins, dtype=np.int64)
+        self.decades = list(decades)
+        self.decade_index = {decade: d for d, decade in enumerate(self.decades)}
+        self.decade_wins = decade_wins
+    
+    @classmethod
+    def from_cube(cls, cube):
+        """All-time and per-decade wins from the game counts cube (its decades sum to the rivalry summary)"""
+        return cls(cube.teams, cube.pair_wins.sum(axis=2), cube.decades, cube.pair_wins)
+    
+    @classmethod
+    def from_rivalries(cls, rivalry_index):
+        """All-time wins only, from the rivalry summary, for when the cube hasn't been generated"""
+        teams = sorted(set(rivalry_index.team1.tolist()) | set(rivalry_index.team2.tolist()))
+        codes = {team: i for i, team in enumerate(teams)}
+        rows = np.array(list(rivalry_index.by_pair.values()), dtype=np.int64)
+        first = np.array([codes[team] for team in rivalry_index.team1[rows].tolist()], dtype=np.int64)
+        second = np.array([codes[team] for team in rivalry_index.team2[rows].tolist()], dtype=np.int64)
+        
+        wins = np.zeros((len(teams), len(teams)), dtype=np.int64)
+        np.add.at(wins, (first, second), rivalry_index.team1_wins[rows])
+        np.add.at(wins, (second, first), rivalry_index.team2_wins[rows])
+        return cls(teams, wins)
+    
+    def wins(self, decade=None):
+        """The wins matrix for one decade (all zero for a decade without games), or all-time for None"""
+        if decade is None:
+            return self.all_time_wins
+        d = self.decade_index.get(decade)
+        if d is None:
+            return np.zeros_like(self.all_time_wins)
+        return self.decade_wins[:, :, d]
+    
+    def matrix(self, decade=None):
+        """The whole matrix as a response payload"""
+        return {
+            "teams": self.teams,
+            "decade": f"{decade}s" if decade is not None else None,
+            "wins": self.wins(decade).tolist(),
+        }
+    
+    def team_row(self, team, decade=None):
+        """Record against every opponent the team met, or None if the team isn't in the matrix"""
+        i = self.team_index.get(team)
+        if i is None:
+            return None
+        wins = self.wins(decade)
+        won, lost = wins[i], wins[:, i]
+        met = np.flatnonzero(won + lost)
+        met = met[met != i]
+        return [
+            {
+                "opponent": self.teams[j],
+                "total_meetings": team_wins + team_losses,
+                "wins": team_wins,
+                "losses": team_losses,
+            }
+            for j, team_wins, team_losses in zip(met.tolist(), won[met].tolist(), lost[met].tolist())
+        ]
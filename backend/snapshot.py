@@ -0,0 +1,164 @@
+"""
+Data Snapshot Reader
+Memory-maps the snapshot.bin written by process_data.py. Columns are numpy views over the shared
+mapping, rows only become dicts when a response needs them, and stored response bodies are served
+straight from the mapping.
+"""
+
+import hashlib
+import json
+import mmap
+import struct
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+
+SNAPSHOT_MAGIC = b"CSNAPSHT"
+SNAPSHOT_FORMAT_VERSION = 1
+
+# Rows materialized per batch when iterating a table
+ITER_BATCH_SIZE = 1024
+
+class SnapshotError(ValueError):
+    """Raised for a file that isn't a snapshot of a supported version"""
+
+def column_values(records, field):
+    """All values of one field, read straight from the columns for a snapshot table"""
+    if isinstance(records, SnapshotTable):
+        return records.column(field)
+    return [record.get(field) for record in records]
+
+def records_at(records, indexes):
+    """Records at the given row indexes, gathered column-wise for a snapshot table"""
+    if isinstance(records, SnapshotTable):
+        return records.take(indexes)
+    return [records[i] for i in indexes]
+
+class SnapshotTable(Sequence):
+    """Read-only sequence of records backed by snapshot columns"""
+    
+    def __init__(self, snapshot, header):
+        self.snapshot = snapshot
+        self.rows = header["rows"]
+        self.columns = {column["name"]: column for column in header["columns"]}
+        self.fields = list(self.columns)
+    
+    def __len__(self):
+        return self.rows
+    
+    def column(self, field, rows=slice(None)):
+        """Python values of one field for rows (a slice or an array of row indexes)"""
+        column = self.columns[field]
+        kind = column["kind"]
+        view = self.snapshot.view
+        
+        if kind in ("str_list", "int_list"):
+            offsets = view(column["offsets"])
+            starts = offsets[:-1][rows].tolist()
+            ends = offsets[1:][rows].tolist()
+            items = view(column["values"])
+            if kind == "str_list":
+                decoded = {}
+                values = [self.snapshot.strings(items[a:b], decoded) for a, b in zip(starts, ends)]
+            else:
+                values = [items[a:b].tolist() for a, b in zip(starts, ends)]
+        else:
+            values = view(column["values"])[rows]
+            if kind == "str":
+                values = self.snapshot.strings(values)
+            elif kind == "number":
+                is_int = view(column["is_int"])[rows].tolist()
+                values = [int(value) if integer else value for value, integer in zip(values.tolist(), is_int)]
+            else:
+                values = values.tolist()
+        
+        if "nulls" in column:
+            nulls = view(column["nulls"])[rows].tolist()
+            values = [None if null else value for value, null in zip(values, nulls)]
+        return values
+    
+    def array(self, field):
+        """Zero-copy numpy view of a numeric field"""
+        return self.snapshot.view(self.columns[field]["values"])
+    
+    def rows_at(self, rows):
+        """Materialize rows (a slice or an array of row indexes) as dicts"""
+        columns = [self.column(field, rows) for field in self.fields]
+        records = [dict(zip(self.fields, values)) for values in zip(*columns)]
+        
+        # Fields some records leave out
+        for field, column in self.columns.items():
+            if "missing" in column:
+                missing = self.snapshot.view(column["missing"])[rows]
+                for position in np.flatnonzero(missing).tolist():
+                    del records[position][field]
+        return records
+    
+    def take(self, indexes):
+        """Materialize the rows at indexes, in that order"""
+        return self.rows_at(np.asarray(indexes, dtype=np.int64))
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.rows_at(index)
+        if index < 0:
+            index += self.rows
+        if not 0 <= index < self.rows:
+            raise IndexError("snapshot table index out of range")
+        return self.rows_at(slice(index, index + 1))[0]
+    
+    def __iter__(self):
+        for start in range(0, self.rows, ITER_BATCH_SIZE):
+            yield from self.rows_at(slice(start, min(start + ITER_BATCH_SIZE, self.rows)))
+
+class Snapshot:
+    """A memory-mapped snapshot file; its pages are shared by every process that maps it"""
+    
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        if self.buffer[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            raise SnapshotError(f"{self.path} is not a data snapshot")
+        (header_length,) = struct.unpack_from("<Q", self.buffer, len(SNAPSHOT_MAGIC))
+        header_start = len(SNAPSHOT_MAGIC) + 8
+        header = json.loads(self.buffer[header_start:header_start + header_length])
+        if header.get("version") != SNAPSHOT_FORMAT_VERSION:
+            raise SnapshotError(f"{self.path} has snapshot version {header.get('version')}, expected {SNAPSHOT_FORMAT_VERSION}")
+        
+        self.data_start = header_start + header_length
+        self.sources = header["sources"]
+        self.string_offsets = self.view(header["strings"]["offsets"])
+        self.string_data = self.view(header["strings"]["data"])
+        self.tables = {name: SnapshotTable(self, table) for name, table in header["tables"].items()}
+        self.bodies = {
+            name: {coding: memoryview(self.buffer)[self.data_start + ref["offset"]:self.data_start + ref["offset"] + ref["length"]] for coding, ref in codings.items()}
+            for name, codings in header.get("bodies", {}).items()
+        }
+    
+    def view(self, ref):
+        """numpy view of one array in the mapping"""
+        return np.frombuffer(self.buffer, dtype=np.dtype(ref["dtype"]), count=ref["length"], offset=self.data_start + ref["offset"])
+    
+    def strings(self, ids, decoded=None):
+        """Decode string table entries, reusing (and filling) a decoded {id: str} cache"""
+        decoded = {} if decoded is None else decoded
+        offsets = self.string_offsets
+        data = self.string_data
+        values = []
+        for string_id in ids.tolist():
+            value = decoded.get(string_id)
+            if value is None:
+                value = decoded[string_id] = data[offsets[string_id]:offsets[string_id + 1]].tobytes().decode("utf-8")
+            values.append(value)
+        return values
+    
+    def matches(self, data_dir):
+        """Whether the snapshot was built from the summary JSON files currently in data_dir"""
+        for filename, digest in self.sources.items():
+            path = Path(data_dir) / filename
+            if not path.exists() or hashlib.sha256(path.read_bytes()).hexdigest() != digest:
+                return False
+        return True
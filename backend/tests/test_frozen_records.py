@@ -0,0 +1,65 @@
+"""
+Tests that records shared by every request can't be modified through a request
+"""
+
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ["COURTSIDE_RELOAD_INTERVAL"] = "0"
+from app import app, datasets
+from dataset import FrozenRecord, freeze
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+def test_frozen_record_rejects_item_assignment():
+    record = freeze({"state_name": "California", "teams": [{"abbreviation": "LAL"}]})
+    assert isinstance(record, FrozenRecord)
+    with pytest.raises(TypeError):
+        record["state_name"] = "Nevada"
+    with pytest.raises(TypeError):
+        record["teams"][0]["abbreviation"] = "LAC"
+    with pytest.raises(TypeError):
+        del record["teams"]
+    with pytest.raises(TypeError):
+        record.update(state_name="Nevada")
+    with pytest.raises(TypeError):
+        record.setdefault("total_wins", 0)
+    assert record == {"state_name": "California", "teams": ({"abbreviation": "LAL"},)}
+
+def test_concurrent_state_requests_leave_shared_records_unchanged(client):
+    dataset = datasets.current
+    shared_before = {
+        "states": json.dumps(dataset.states),
+        "states_with_teams": json.dumps(dataset.states_with_teams),
+        "states_by_name": json.dumps(dataset.states_by_name),
+        "teams": json.dumps(dataset.teams),
+    }
+    names = [state["state_name"] for state in dataset.states_with_teams]
+    paths = (["/api/states"] + [f"/api/states/{name}" for name in names]) * 20
+    
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        responses = list(executor.map(client.get, paths))
+    
+    assert all(response.status_code == 200 for response in responses)
+    assert datasets.current is dataset
+    assert json.dumps(dataset.states) == shared_before["states"]
+    assert json.dumps(dataset.states_with_teams) == shared_before["states_with_teams"]
+    assert json.dumps(dataset.states_by_name) == shared_before["states_by_name"]
+    assert json.dumps(dataset.teams) == shared_before["teams"]
+    
+    states_by_name = json.loads(shared_before["states_by_name"])
+    for path, response in zip(paths, responses):
+        if path == "/api/states":
+            assert response.json() == json.loads(shared_before["states_with_teams"])
+        else:
+            assert response.json() == states_by_name[path.rsplit("/", 1)[1].lower()]
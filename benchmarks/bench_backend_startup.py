@@ -0,0 +1,104 @@
+"""
+Benchmark for backend startup: JSON summaries vs the memory-mapped binary snapshot
+Starts a fresh interpreter per run, times app.load_data() and reports resident and heap memory, plus the
+total proportional memory of several workers running at once (mapped snapshot pages are shared)
+
+Usage: python benchmarks/bench_backend_startup.py [--runs 5] [--workers 4]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+
+# Runs inside the child process: prints one JSON line of measurements, then stays alive until stdin closes
+CHILD_SCRIPT = """
+import json, sys, time
+
+def memory():
+    fields = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[1].isdigit():
+                fields[parts[0].rstrip(':')] = int(parts[1]) / 1024
+    return fields
+
+import app
+before = memory()
+start = time.perf_counter()
+app.load_data()
+seconds = time.perf_counter() - start
+after = memory()
+print(json.dumps({'seconds': seconds, 'rss': after['Rss'] - before['Rss'], 'anonymous': after['Anonymous'] - before['Anonymous']}), flush=True)
+sys.stdin.read()
+"""
+
+def proportional_set_size(pid):
+    """PSS of a process in MB: shared pages are split between the processes mapping them"""
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Pss:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+def start_workers(use_snapshot, count):
+    """Start count backend processes side by side, returning (processes, their measurements)"""
+    env = dict(os.environ, COURTSIDE_SNAPSHOT="1" if use_snapshot else "0")
+    processes = [
+        subprocess.Popen(
+            [sys.executable, "-c", CHILD_SCRIPT], cwd=BACKEND_DIR, env=env,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+        )
+        for _ in range(count)
+    ]
+    results = []
+    for process in processes:
+        # Skip the app's own startup messages
+        line = process.stdout.readline()
+        while line and not line.startswith("{"):
+            line = process.stdout.readline()
+        results.append(json.loads(line))
+    return processes, results
+
+def stop_workers(processes):
+    """Let the workers exit and wait for them"""
+    for process in processes:
+        process.stdin.close()
+        process.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='Cold starts per mode')
+    parser.add_argument('--workers', type=int, default=4, help='Processes kept alive together to measure total PSS')
+    args = parser.parse_args()
+    
+    if not (BACKEND_DIR / "data" / "snapshot.bin").exists():
+        print("backend/data/snapshot.bin not found; run process_data.py or python data_snapshot.py first")
+        return
+    
+    print(f"Backend load_data(), median of {args.runs} cold starts; total PSS of {args.workers} workers running side by side")
+    for label, use_snapshot in [("JSON", False), ("snapshot", True)]:
+        runs = []
+        for _ in range(args.runs):
+            processes, results = start_workers(use_snapshot, 1)
+            stop_workers(processes)
+            runs.extend(results)
+        
+        processes, _ = start_workers(use_snapshot, args.workers)
+        total_pss = sum(proportional_set_size(process.pid) for process in processes)
+        stop_workers(processes)
+        
+        seconds = np.median([run['seconds'] for run in runs])
+        rss = np.median([run['rss'] for run in runs])
+        anonymous = np.median([run['anonymous'] for run in runs])
+        print(f"  {label:<9} load {seconds * 1000:7.1f}ms  RSS +{rss:6.1f}MB  heap +{anonymous:6.1f}MB  {args.workers} workers PSS {total_pss:7.1f}MB")
+
+if __name__ == '__main__':
+    main()
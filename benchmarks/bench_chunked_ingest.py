@@ -0,0 +1,99 @@
+"""
+Benchmark for the out-of-core aggregation mode
+Writes Kaggle-shaped game.csv and player_totals.csv tables at several sizes and, in a fresh process per run,
+aggregates them in memory (read, clean_data, build_aggregates) or streamed in chunks
+(stream_aggregates, as with --chunk-rows). Reports time and peak RSS per size and checks the streamed team
+records, rivalries, player totals and game cube equal the in-memory ones.
+
+Peak RSS of the streamed runs stays near the chunk size's; the in-memory runs grow with the tables. Player
+totals still hold one row per player, so --fixed-players keeps the player table the same size throughout.
+
+Usage: python benchmarks/bench_chunked_ingest.py [--games 65000] [--players 5000] [--scales 1 4 16] [--chunk-rows 100000] [--fixed-players]
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import multiprocessing
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from bench_clean_data import make_game_csv_table, make_player_totals_csv_table
+from game_cube import serialize_game_cube
+from process_data import DEFAULT_CHUNK_ROWS, PLAYER_TOTAL_COLUMNS, build_aggregates, clean_data, stream_aggregates
+from stage_profiler import peak_rss_mb, reset_peak_rss
+
+def aggregates_checksum(game_results, player_totals, game_cube):
+    """Digest of the aggregates that doesn't depend on team record order or total dtypes (merging makes them floats)"""
+    team_records, rivalries = game_results
+    digest = hashlib.sha256()
+    digest.update(team_records.sort_index().to_json().encode())
+    digest.update(rivalries.to_json().encode())
+    if player_totals is not None:
+        digest.update(player_totals.drop(columns='teams').astype(dict.fromkeys(PLAYER_TOTAL_COLUMNS, 'float64')).to_json().encode())
+        digest.update(repr([sorted(teams) for teams in player_totals['teams']]).encode())
+    if game_cube is not None:
+        digest.update(serialize_game_cube(game_cube))
+    return digest.hexdigest()
+
+def run_variant(variant, source_dir, chunk_rows, results):
+    """Aggregate the tables in this (fresh) process and report time, peak RSS and a checksum"""
+    reset_peak_rss()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if variant == 'streamed':
+            game_results, player_totals, game_cube, _ = stream_aggregates(source_dir, chunk_rows)
+        else:
+            games_df = pd.read_csv(source_dir / 'game.csv')
+            box_scores_df = pd.read_csv(source_dir / 'player_totals.csv')
+            _, _, games_df, box_scores_df = clean_data(pd.DataFrame(), pd.DataFrame(), games_df, box_scores_df)
+            aggregates, _ = build_aggregates(games_df, box_scores_df, None)
+            game_results, player_totals, game_cube = aggregates['game_results'], aggregates['player_totals'], aggregates['game_cube']
+    elapsed = time.perf_counter() - start
+    results.put({
+        'seconds': elapsed,
+        'peak_rss_mb': peak_rss_mb(),
+        'checksum': aggregates_checksum(game_results, player_totals, game_cube),
+    })
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--games', type=int, default=65_000, help='Rows in game.csv at scale 1 (the Kaggle file has about 65k)')
+    parser.add_argument('--players', type=int, default=5000, help='Players in player_totals.csv at scale 1')
+    parser.add_argument('--fixed-players', action='store_true', help='Keep the player table at scale 1 size for every scale')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 4, 16], help='Table sizes relative to scale 1')
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS, help='Rows per streamed chunk')
+    args = parser.parse_args()
+    
+    context = multiprocessing.get_context('spawn')
+    print(f"Synthetic tables, streamed in chunks of {args.chunk_rows:,} rows")
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            source_dir = Path(tmp)
+            n_players = args.players * (1 if args.fixed_players else scale)
+            make_game_csv_table(args.games * scale).to_csv(source_dir / 'game.csv', index=False)
+            make_player_totals_csv_table(n_players).to_csv(source_dir / 'player_totals.csv', index=False)
+            
+            reports = {}
+            for variant in ('in-memory', 'streamed'):
+                results = context.Queue()
+                process = context.Process(target=run_variant, args=(variant, source_dir, args.chunk_rows, results))
+                process.start()
+                reports[variant] = results.get()
+                process.join()
+        
+        line = f"  {scale:>3}x {args.games * scale:>10,} games {n_players:>7,} players"
+        for variant, report in reports.items():
+            line += f"  {variant} {report['seconds']:6.2f}s peak {report['peak_rss_mb']:5.0f} MB"
+        same = reports['in-memory']['checksum'] == reports['streamed']['checksum']
+        print(f"{line}  same aggregates: {same}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+"""
+Benchmark for clean_data memory use
+Writes Kaggle-shaped game.csv and player_totals.csv tables, then in a fresh process per variant reads them,
+cleans them with the original clean_data or the compact one and runs the game and player aggregation
+stages on the result. Reports the tables' in-memory size before and after cleaning, the cleaning time and
+the peak RSS of the whole run, and checks both variants build the same aggregates.
+
+Usage: python benchmarks/bench_clean_data.py [--games 65000] [--players 5000] [--scale 1]
+"""
+
+import argparse
+import contextlib
+import io
+import multiprocessing
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from bench_player_summary import make_player_tables
+from elo_ratings import build_elo_ratings
+from game_store import build_game_store
+from process_data import TEAM_ABBREV_MAP, TEAM_COORDINATES, build_aggregates, clean_data, frame_memory_mb
+from stage_profiler import peak_rss_mb, reset_peak_rss
+
+# Per-side box score columns of game.csv, after the team id/abbreviation/name and matchup columns
+GAME_STAT_COLUMNS = [
+    'fgm', 'fga', 'fg_pct', 'fg3m', 'fg3a', 'fg3_pct', 'ftm', 'fta', 'ft_pct', 'oreb', 'dreb', 'reb',
+    'ast', 'stl', 'blk', 'tov', 'pf', 'pts', 'plus_minus',
+]
+
+def make_game_csv_table(n_games, seed=0):
+    """Synthetic game.csv with the Kaggle file's columns; stats are floats and mostly missing before 1985"""
+    rng = np.random.default_rng(seed)
+    teams = np.array(sorted(TEAM_COORDINATES))
+    dates = pd.Timestamp('1946-11-01') + pd.to_timedelta(np.sort(rng.integers(0, 77 * 365, n_games)), unit='D')
+    home = rng.choice(teams, n_games)
+    away = rng.choice(teams, n_games)
+    columns = {
+        'season_id': 21946 + (dates.year - 1946).to_numpy(),
+        'game_id': np.arange(n_games) + 24600001,
+        'game_date': dates.strftime('%Y-%m-%d 00:00:00'),
+        'min': rng.choice([240, 265, 290], n_games),
+        'season_type': rng.choice(['Regular Season', 'Playoffs'], n_games, p=[0.93, 0.07]),
+    }
+    for side, side_teams in (('home', home), ('away', away)):
+        columns[f'team_id_{side}'] = 1610612700 + np.searchsorted(teams, side_teams)
+        columns[f'team_abbreviation_{side}'] = side_teams
+        columns[f'team_name_{side}'] = np.char.add(side_teams.astype(str), ' Team')
+        columns[f'matchup_{side}'] = np.char.add(np.char.add(side_teams.astype(str), ' vs. '), (away if side == 'home' else home).astype(str))
+        columns[f'wl_{side}'] = rng.choice(['W', 'L'], n_games)
+        for stat in GAME_STAT_COLUMNS:
+            columns[f'{stat}_{side}'] = rng.integers(0, 150, n_games).astype(float)
+        # Box score details are missing for most early games
+        for stat in GAME_STAT_COLUMNS[:-2]:
+            columns[f'{stat}_{side}'][(dates.year < 1985) & (rng.random(n_games) < 0.8)] = np.nan
+        columns[f'video_available_{side}'] = rng.integers(0, 2, n_games)
+    return pd.DataFrame(columns)
+
+def make_player_totals_csv_table(n_players, seed=0):
+    """Synthetic player_totals.csv: bench_player_summary's seasons plus the file's other descriptive columns"""
+    rng = np.random.default_rng(seed)
+    _, box_scores_df, _ = make_player_tables(n_players, seed)
+    n_rows = len(box_scores_df)
+    box_scores_df['seas_id'] = np.arange(n_rows)
+    box_scores_df['pos'] = rng.choice(['PG', 'SG', 'SF', 'PF', 'C', 'G-F', 'F-C'], n_rows)
+    box_scores_df['lg'] = rng.choice(['NBA', 'ABA', 'BAA'], n_rows, p=[0.9, 0.07, 0.03])
+    box_scores_df['age'] = rng.integers(19, 41, n_rows)
+    box_scores_df['experience'] = rng.integers(1, 21, n_rows)
+    box_scores_df['gs'] = rng.integers(0, 83, n_rows)
+    box_scores_df['mp'] = rng.integers(0, 3300, n_rows).astype(float)
+    return box_scores_df
+
+def legacy_clean_data(teams_df, players_df, games_df, box_scores_df):
+    """The original games and box score cleaning, kept for comparison"""
+    if 'game_date' in games_df.columns:
+        games_df['date'] = pd.to_datetime(games_df['game_date'], errors='coerce')
+        games_df = games_df.dropna(subset=['date'])
+        games_df['date'] = games_df['date'].dt.strftime('%Y-%m-%d')
+    if 'team_abbreviation_home' in games_df.columns:
+        games_df['home_team'] = games_df['team_abbreviation_home']
+    if 'team_abbreviation_away' in games_df.columns:
+        games_df['away_team'] = games_df['team_abbreviation_away']
+    if 'pts_home' in games_df.columns:
+        games_df['home_pts'] = games_df['pts_home']
+    if 'pts_away' in games_df.columns:
+        games_df['away_pts'] = games_df['pts_away']
+    if 'date' in games_df.columns:
+        games_df['year'] = pd.to_datetime(games_df['date']).dt.year
+        games_df['decade'] = (games_df['year'] // 10) * 10
+        games_df['decade_str'] = games_df['decade'].astype(str) + 's'
+    if 'home_pts' in games_df.columns and 'away_pts' in games_df.columns:
+        games_df['game_margin'] = games_df['home_pts'] - games_df['away_pts']
+    if 'minutes' in box_scores_df.columns:
+        box_scores_df = box_scores_df[box_scores_df['minutes'] >= 0]
+    if 'fgm' in box_scores_df.columns and 'fga' in box_scores_df.columns:
+        box_scores_df['fg_pct'] = box_scores_df.apply(lambda x: x['fgm'] / x['fga'] if x['fga'] > 0 else 0, axis=1)
+    return teams_df, players_df, games_df, box_scores_df
+
+def run_variant(variant, source_dir, results):
+    """Read, clean and aggregate in this (fresh) process and report sizes, timings and peak RSS"""
+    reset_peak_rss()
+    games_df = pd.read_csv(source_dir / 'game.csv')
+    box_scores_df = pd.read_csv(source_dir / 'player_totals.csv')
+    loaded_mb = frame_memory_mb(games_df, box_scores_df)
+    
+    clean = legacy_clean_data if variant == 'legacy' else clean_data
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        _, _, games_df, box_scores_df = clean(pd.DataFrame(), pd.DataFrame(), games_df, box_scores_df)
+    clean_time = time.perf_counter() - start
+    cleaned_mb = frame_memory_mb(games_df, box_scores_df)
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        aggregates, _ = build_aggregates(games_df, box_scores_df, None)
+        cube = aggregates['game_cube']
+        build_game_store(games_df)
+        elo = build_elo_ratings(games_df, TEAM_ABBREV_MAP)
+    _, rivalries = aggregates['game_results']
+    results.put({
+        'variant': variant,
+        'loaded_mb': loaded_mb,
+        'cleaned_mb': cleaned_mb,
+        'clean_s': clean_time,
+        'peak_rss_mb': peak_rss_mb(),
+        'checksum': (
+            rivalries.to_json(), aggregates['player_totals'].drop(columns='teams').to_json(),
+            int(cube['pair_wins'].sum()), str(elo),
+        ),
+    })
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--games', type=int, default=65_000, help='Rows in game.csv (the Kaggle file has about 65k)')
+    parser.add_argument('--players', type=int, default=5000, help='Players in player_totals.csv')
+    parser.add_argument('--scale', type=int, default=1, help='Multiply both table sizes')
+    args = parser.parse_args()
+    
+    context = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as tmp:
+        source_dir = Path(tmp)
+        make_game_csv_table(args.games * args.scale).to_csv(source_dir / 'game.csv', index=False)
+        make_player_totals_csv_table(args.players * args.scale).to_csv(source_dir / 'player_totals.csv', index=False)
+        print(f"Synthetic game.csv: {args.games * args.scale:,} rows; player_totals.csv: "
+              f"{len(pd.read_csv(source_dir / 'player_totals.csv', usecols=['season'])):,} rows")
+        
+        reports = {}
+        for variant in ('legacy', 'compact'):
+            results = context.Queue()
+            process = context.Process(target=run_variant, args=(variant, source_dir, results))
+            process.start()
+            reports[variant] = results.get()
+            process.join()
+            report = reports[variant]
+            print(f"  {variant:<8} tables {report['loaded_mb']:7.1f} MB loaded -> {report['cleaned_mb']:7.1f} MB cleaned  "
+                  f"clean {report['clean_s']:.2f}s  peak RSS {report['peak_rss_mb']:.0f} MB")
+    
+    print(f"  same aggregates: {reports['legacy']['checksum'] == reports['compact']['checksum']}")
+
+if __name__ == '__main__':
+    main()
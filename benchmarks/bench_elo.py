@@ -0,0 +1,135 @@
+"""
+Benchmark for the Elo rating stage
+Times build_elo_ratings on a full-history game table and on a 10x expansion of it, and checks the kernel
+against a straightforward iterrows implementation
+
+The expansion is ten copies of the league with renamed teams, interleaved by date, so every copy must
+reproduce the base table's ratings exactly.
+
+Usage: python benchmarks/bench_elo.py [--games-csv path/to/game.csv] [--scale 10] [--skip-legacy]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from elo_ratings import HOME_ADVANTAGE, INITIAL_RATING, K_FACTOR, SEASON_REGRESSION, build_elo_ratings
+from game_cube import game_seasons
+from process_data import TEAM_ABBREV_MAP, TEAM_COORDINATES, clean_data
+
+# Roughly the size of the real game table: 1946-47 through 2022-23
+SYNTHETIC_GAMES = 70_000
+FIRST_DATE = '1946-11-01'
+HISTORY_DAYS = 77 * 365
+
+def make_history(n_games, seed=0):
+    """Synthetic cleaned games table spread over the league's history"""
+    rng = np.random.default_rng(seed)
+    teams = np.array(sorted(TEAM_COORDINATES))
+    home = rng.choice(teams, n_games)
+    away = rng.choice(teams, n_games)
+    # Nobody plays themselves
+    clash = home == away
+    away[clash] = teams[(np.searchsorted(teams, home[clash]) + 1) % len(teams)]
+    dates = pd.Timestamp(FIRST_DATE) + pd.to_timedelta(np.sort(rng.integers(0, HISTORY_DAYS, n_games)), unit='D')
+    return pd.DataFrame({
+        'home_team': home,
+        'away_team': away,
+        'home_pts': rng.integers(70, 150, n_games),
+        'away_pts': rng.integers(70, 150, n_games),
+        'date': dates.strftime('%Y-%m-%d'),
+    })
+
+def load_games_csv(path):
+    """Read Kaggle's game.csv and clean it like process_data.py"""
+    games_df = pd.read_csv(path)
+    _, _, games_df, _ = clean_data(pd.DataFrame(), pd.DataFrame(), games_df, pd.DataFrame())
+    return games_df
+
+def expand(games_df, scale):
+    """scale independent copies of the league (team names suffixed per copy), interleaved by date"""
+    copies = []
+    for copy in range(scale):
+        games = games_df.copy()
+        games['home_team'] = games['home_team'].astype(str).replace(TEAM_ABBREV_MAP) + f'~{copy}'
+        games['away_team'] = games['away_team'].astype(str).replace(TEAM_ABBREV_MAP) + f'~{copy}'
+        copies.append(games)
+    return pd.concat(copies, ignore_index=True).sort_values('date', kind='stable')
+
+def legacy_elo(games_df, aliases):
+    """Final rating per team with an iterrows loop and dict lookups"""
+    games = games_df.dropna(subset=['home_team', 'away_team', 'home_pts', 'away_pts', 'date'])
+    games = games.sort_values(['date', 'game_id'] if 'game_id' in games.columns else ['date'], kind='stable')
+    seasons = game_seasons(games['date'], games['season'] if 'season' in games.columns else None)
+    ratings = {}
+    last_season = {}
+    for (_, game), season in zip(games.iterrows(), seasons):
+        home = aliases.get(str(game['home_team']), str(game['home_team']))
+        away = aliases.get(str(game['away_team']), str(game['away_team']))
+        if home == away:
+            continue
+        for team in (home, away):
+            rating = ratings.get(team, INITIAL_RATING)
+            if last_season.get(team) != season:
+                rating += SEASON_REGRESSION * (INITIAL_RATING - rating)
+                last_season[team] = season
+            ratings[team] = rating
+        result = 1.0 if game['home_pts'] > game['away_pts'] else 0.0 if game['home_pts'] < game['away_pts'] else 0.5
+        expected = 1.0 / (1.0 + 10.0 ** (-(ratings[home] + HOME_ADVANTAGE - ratings[away]) / 400.0))
+        change = K_FACTOR * (result - expected)
+        ratings[home] += change
+        ratings[away] -= change
+    return {team: round(rating, 1) for team, rating in ratings.items()}
+
+def time_build(games_df, label):
+    """Time plain and margin-adjusted ratings for one table"""
+    timings = []
+    for margin_adjusted in (False, True):
+        start = time.perf_counter()
+        ratings = build_elo_ratings(games_df, TEAM_ABBREV_MAP, margin_adjusted=margin_adjusted)
+        timings.append(time.perf_counter() - start)
+        if not margin_adjusted:
+            plain = ratings
+    print(f"  {label:<10} {len(games_df):>9,} games  Elo {timings[0]:.3f}s  margin-adjusted {timings[1]:.3f}s  ({len(games_df) / timings[0] / 1e6:.2f}M games/s)")
+    return plain
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--games-csv', type=Path, default=None, help="Kaggle game.csv to use instead of a synthetic history")
+    parser.add_argument('--scale', type=int, default=10, help='Copies of the league in the expanded table')
+    parser.add_argument('--skip-legacy', action='store_true', help='Skip the iterrows reference')
+    args = parser.parse_args()
+    
+    if args.games_csv:
+        games_df = load_games_csv(args.games_csv)
+        print(f"Game table from {args.games_csv}")
+    else:
+        games_df = make_history(SYNTHETIC_GAMES)
+        print("Synthetic game table (pass --games-csv for the real one)")
+    
+    base = time_build(games_df, 'full')
+    expanded = time_build(expand(games_df, args.scale), f'{args.scale}x')
+    
+    # Every copy of the league is rated independently, so it must match the base ratings
+    base_ratings = {record['team']: record['rating'] for record in base}
+    copies_match = all(
+        base_ratings.get(record['team'].split('~')[0]) == record['rating'] for record in expanded
+    )
+    print(f"  every expanded copy matches the base ratings: {copies_match}")
+    
+    if args.skip_legacy:
+        return
+    
+    start = time.perf_counter()
+    legacy = legacy_elo(games_df, TEAM_ABBREV_MAP)
+    legacy_time = time.perf_counter() - start
+    print(f"  legacy iterrows on the full table: {legacy_time:.3f}s")
+    print(f"  final ratings match the iterrows reference: {legacy == base_ratings}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark for the vectorized game aggregation engine
+Compares aggregate_game_results against the original iterrows loops on a synthetic game table
+
+Usage: python benchmarks/bench_game_aggregation.py [--games 1000000] [--skip-legacy]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from process_data import TEAM_COORDINATES, aggregate_game_results, generate_rivalry_summary
+
+def make_games(n_games, seed=0):
+    """Build a synthetic cleaned games table with a sprinkling of missing scores"""
+    rng = np.random.default_rng(seed)
+    teams = np.array(sorted(TEAM_COORDINATES))
+    home_pts = rng.integers(70, 150, n_games).astype(float)
+    home_pts[rng.random(n_games) < 0.01] = np.nan
+    return pd.DataFrame({
+        'home_team': rng.choice(teams, n_games),
+        'away_team': rng.choice(teams, n_games),
+        'home_pts': home_pts,
+        'away_pts': rng.integers(70, 150, n_games).astype(float),
+    })
+
+def legacy_aggregate(games_df):
+    """The original row-by-row team W/L and rivalry loops, kept for comparison"""
+    team_stats = {abbrev: {'total_wins': 0, 'total_losses': 0} for abbrev in TEAM_COORDINATES}
+    for _, game in games_df.iterrows():
+        home_team = game.get('home_team')
+        away_team = game.get('away_team')
+        home_pts = game.get('home_pts', 0)
+        away_pts = game.get('away_pts', 0)
+        if pd.isna(home_team) or pd.isna(away_team) or pd.isna(home_pts) or pd.isna(away_pts):
+            continue
+        if home_team in team_stats:
+            if home_pts > away_pts:
+                team_stats[home_team]['total_wins'] += 1
+            else:
+                team_stats[home_team]['total_losses'] += 1
+        if away_team in team_stats:
+            if away_pts > home_pts:
+                team_stats[away_team]['total_wins'] += 1
+            else:
+                team_stats[away_team]['total_losses'] += 1
+    
+    rivalries = {}
+    for _, game in games_df.iterrows():
+        home_team = game.get('home_team')
+        away_team = game.get('away_team')
+        home_pts = game.get('home_pts', 0)
+        away_pts = game.get('away_pts', 0)
+        if pd.isna(home_team) or pd.isna(away_team) or pd.isna(home_pts) or pd.isna(away_pts):
+            continue
+        pair = tuple(sorted([str(home_team), str(away_team)]))
+        if pair not in rivalries:
+            rivalries[pair] = {'team1': pair[0], 'team2': pair[1], 'total_meetings': 0, 'team1_wins': 0, 'team2_wins': 0}
+        rivalries[pair]['total_meetings'] += 1
+        if str(home_team) == pair[0]:
+            if home_pts > away_pts:
+                rivalries[pair]['team1_wins'] += 1
+            else:
+                rivalries[pair]['team2_wins'] += 1
+        else:
+            if away_pts > home_pts:
+                rivalries[pair]['team1_wins'] += 1
+            else:
+                rivalries[pair]['team2_wins'] += 1
+    
+    return team_stats, list(rivalries.values())
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--games', type=int, default=1_000_000, help='Number of synthetic games')
+    parser.add_argument('--skip-legacy', action='store_true', help='Only time the vectorized engine')
+    args = parser.parse_args()
+    
+    games_df = make_games(args.games)
+    print(f"Synthetic table: {len(games_df):,} games")
+    
+    start = time.perf_counter()
+    game_results = aggregate_game_results(games_df)
+    vectorized_time = time.perf_counter() - start
+    print(f"  vectorized engine: {vectorized_time:.3f}s")
+    
+    if args.skip_legacy:
+        return
+    
+    start = time.perf_counter()
+    legacy_teams, legacy_rivalries = legacy_aggregate(games_df)
+    legacy_time = time.perf_counter() - start
+    print(f"  legacy iterrows:   {legacy_time:.3f}s")
+    print(f"  speedup:           {legacy_time / vectorized_time:.1f}x")
+    
+    # The rivalry JSON must be byte-identical to the legacy output
+    team_records, _ = game_results
+    teams_match = all(
+        stats['total_wins'] == int(team_records['wins'].get(abbrev, 0))
+        and stats['total_losses'] == int(team_records['losses'].get(abbrev, 0))
+        for abbrev, stats in legacy_teams.items()
+    )
+    rivalries_match = (
+        json.dumps(generate_rivalry_summary(games_df, game_results), indent=2)
+        == json.dumps(legacy_rivalries, indent=2)
+    )
+    print(f"  team records match: {teams_match}")
+    print(f"  rivalry JSON byte-identical: {rivalries_match}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark for the content-addressed output writer
+Writes the committed summaries the way process_data.py used to (indent=2, every run) and through
+OutputManifest (compact JSON, hashed, atomic, skipped when unchanged), and times the backend's data version
+check with a current manifest vs hashing every file
+
+Usage: python benchmarks/bench_output_writer.py [--data-dir backend/data] [--runs 5]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'backend'))
+from dataset import content_version, file_hashes, hashes_version, manifest_hashes, source_files
+from output_writer import OutputManifest
+
+SUMMARY_FILENAMES = ['team_summary.json', 'player_summary.json', 'rivalry_summary.json', 'state_summary.json']
+
+def legacy_write(output_dir, summaries):
+    """The original writer: indent=2, compared as text, then overwritten in place"""
+    written = 0
+    for filename, data in summaries.items():
+        content = json.dumps(data, indent=2)
+        path = output_dir / filename
+        if path.exists() and path.read_text() == content:
+            continue
+        path.write_text(content)
+        written += 1
+    return written
+
+def manifest_write(output_dir, summaries):
+    """Every summary through OutputManifest, then the manifest"""
+    manifest = OutputManifest(output_dir)
+    for filename, data in summaries.items():
+        manifest.write_json(filename, data)
+    manifest.save()
+    return len(manifest.written)
+
+def median_time(function, runs):
+    """Median seconds of runs calls, and the last call's result"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--data-dir', type=Path, default=ROOT / 'backend' / 'data', help='Directory with the summary JSON files')
+    parser.add_argument('--runs', type=int, default=5, help='Timed runs per measurement (median reported)')
+    args = parser.parse_args()
+    
+    summaries = {}
+    for filename in SUMMARY_FILENAMES:
+        with open(args.data_dir / filename, 'r') as f:
+            summaries[filename] = json.load(f)
+    print(f"Summaries from {args.data_dir}")
+    
+    for label, write in (('indent=2 writer', legacy_write), ('manifest writer', manifest_write)):
+        with tempfile.TemporaryDirectory() as tmp:
+            output_dir = Path(tmp)
+            start = time.perf_counter()
+            first_written = write(output_dir, summaries)
+            first_time = time.perf_counter() - start
+            unchanged_time, unchanged_written = median_time(lambda: write(output_dir, summaries), args.runs)
+            size = sum((output_dir / filename).stat().st_size for filename in SUMMARY_FILENAMES)
+            print(f"  {label}: {size / 1024:8.1f} KB  first run {first_time:.3f}s ({first_written} written)  "
+                  f"unchanged rerun {unchanged_time:.3f}s ({unchanged_written} written)")
+            
+            if write is manifest_write:
+                paths = source_files(output_dir)
+                hashed_time, hashed_version = median_time(lambda: hashes_version(file_hashes(output_dir, paths)), args.runs)
+                manifest_time, manifest_version = median_time(lambda: content_version(output_dir), args.runs)
+                print(f"  backend data version: hashing every file {hashed_time * 1000:.2f} ms, from the manifest "
+                      f"{manifest_time * 1000:.2f} ms (manifest current: {manifest_hashes(output_dir, paths) is not None}, "
+                      f"same version: {hashed_version == manifest_version})")
+
+if __name__ == '__main__':
+    main()
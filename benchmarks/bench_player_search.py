@@ -0,0 +1,80 @@
+"""
+Micro-benchmark for the player typeahead index
+Times PlayerSearch.search over every prefix of a sample of real player names, plus misspelled queries
+that exercise the fuzzy fallback, and reports latency percentiles
+
+Usage: python benchmarks/bench_player_search.py [--names 500] [--limit 10]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+from player_search import PlayerSearch, normalize_name
+
+def make_queries(players, n_names, seed=0):
+    """Every typed prefix of a sample of names, and one dropped-letter typo per name"""
+    rng = random.Random(seed)
+    names = [normalize_name(player["name"]) for player in players if player.get("name")]
+    sample = rng.sample(names, min(n_names, len(names)))
+    
+    prefixes = [name[:length] for name in sample for length in range(1, len(name) + 1)]
+    typos = []
+    for name in sample:
+        if len(name) > 4:
+            drop = rng.randrange(1, len(name))
+            typos.append((name, name[:drop] + name[drop + 1:]))
+    return prefixes, typos
+
+def time_queries(search, queries, limit):
+    """Per-query latency in microseconds"""
+    timings = np.empty(len(queries))
+    for i, query in enumerate(queries):
+        start = time.perf_counter()
+        search.search(query, limit=limit)
+        timings[i] = time.perf_counter() - start
+    return timings * 1e6
+
+def report(label, timings):
+    p50, p95, p99 = np.percentile(timings, [50, 95, 99])
+    print(f"  {label:<16} {len(timings):>6} queries  p50 {p50:7.1f}us  p95 {p95:7.1f}us  p99 {p99:7.1f}us  max {timings.max():8.1f}us")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--names', type=int, default=500, help='Number of player names to type out')
+    parser.add_argument('--limit', type=int, default=10, help='Results per query')
+    args = parser.parse_args()
+    
+    with open(BACKEND_DIR / "data" / "player_summary.json", "r") as f:
+        players = json.load(f)
+    
+    start = time.perf_counter()
+    search = PlayerSearch(players)
+    print(f"Indexed {len(players):,} players in {(time.perf_counter() - start) * 1000:.1f}ms")
+    
+    prefixes, typos = make_queries(players, args.names)
+    # Warm the lazily built token sets so the numbers reflect steady state
+    typo_queries = [typo for _, typo in typos]
+    time_queries(search, prefixes + typo_queries, args.limit)
+    
+    prefix_timings = time_queries(search, prefixes, args.limit)
+    typo_timings = time_queries(search, typo_queries, args.limit)
+    report("prefix", prefix_timings)
+    report("typo (fuzzy)", typo_timings)
+    report("all", np.concatenate([prefix_timings, typo_timings]))
+    
+    found = sum(
+        any(normalize_name(player["name"]) == name for player in search.search(typo, limit=args.limit))
+        for name, typo in typos
+    )
+    print(f"  typo recall@{args.limit}: {found / len(typos):.1%}")
+
+if __name__ == '__main__':
+    main()
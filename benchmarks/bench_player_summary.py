@@ -0,0 +1,196 @@
+"""
+Benchmark for the columnar player summary
+Compares generate_player_summary against the original per-player iterrows loops on synthetic player,
+player-season and advanced tables, at full size and scaled up
+
+Player ids in the player table and the season tables only partly overlap, as in Kaggle's data, so the
+rest are joined by name or added as new players.
+
+Usage: python benchmarks/bench_player_summary.py [--players 5000] [--scale 10] [--skip-legacy]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from player_identity import PlayerIdentityResolver
+from process_data import (
+    ADVANCED_TOTAL_COLUMNS, PLAYER_TOTAL_COLUMNS, TEAM_COORDINATES,
+    aggregate_advanced_stats, aggregate_player_totals, generate_player_summary,
+)
+
+FIRST_NAMES = ['LeBron', 'Kevin', 'Stephen', 'Nikola', 'Luka', 'Tim', 'Kobe', 'Anthony', 'Chris', 'Gary', 'Jalen', 'Tyrese']
+LAST_NAMES = ['James', 'Durant', 'Curry', 'Jokic', 'Doncic', 'Duncan', 'Bryant', 'Davis', 'Paul', 'Payton', 'Green', 'Smith']
+
+def make_player_tables(n_players, seed=0):
+    """Synthetic players, player_totals and advanced tables for n_players players with 1-20 seasons each"""
+    rng = np.random.default_rng(seed)
+    names = np.array([
+        f"{FIRST_NAMES[i % len(FIRST_NAMES)]} {LAST_NAMES[(i // len(FIRST_NAMES)) % len(LAST_NAMES)]} {i}"
+        for i in range(n_players)
+    ])
+
+    # player.csv knows 80% of the players; a quarter of those share an id with the season tables, the rest
+    # only match by name
+    listed = rng.random(n_players) < 0.8
+    shared_id = rng.random(n_players) < 0.25
+    players_df = pd.DataFrame({
+        'id': np.where(shared_id, np.arange(n_players), np.arange(n_players) + 10 * n_players)[listed],
+        'full_name': names[listed],
+    })
+
+    seasons = rng.integers(1, 21, n_players)
+    player = np.repeat(np.arange(n_players), seasons)
+    n_rows = len(player)
+    games = rng.integers(1, 83, n_rows)
+    fga = rng.integers(0, 1500, n_rows).astype(float)
+    x3pa = rng.integers(0, 600, n_rows).astype(float)
+    fta = rng.integers(0, 700, n_rows).astype(float)
+    totals = {
+        'season': 1950 + rng.integers(0, 74, n_rows),
+        'player_id': player,
+        'player': names[player],
+        'tm': rng.choice(np.array(sorted(TEAM_COORDINATES) + ['TOT']), n_rows),
+        'g': games,
+        'pts': rng.integers(0, 2500, n_rows).astype(float),
+        'trb': rng.integers(0, 1200, n_rows).astype(float),
+        'ast': rng.integers(0, 900, n_rows).astype(float),
+        'stl': rng.integers(0, 200, n_rows).astype(float),
+        'blk': rng.integers(0, 250, n_rows).astype(float),
+        'fg': np.floor(fga * rng.random(n_rows)),
+        'fga': fga,
+        'x3p': np.floor(x3pa * rng.random(n_rows)),
+        'x3pa': x3pa,
+        'ft': np.floor(fta * rng.random(n_rows)),
+        'fta': fta,
+    }
+    box_scores_df = pd.DataFrame(totals)
+    # Early seasons didn't track steals, blocks or threes
+    early = box_scores_df['season'] < 1974
+    box_scores_df.loc[early, ['stl', 'blk', 'x3p', 'x3pa']] = np.nan
+
+    has_advanced = rng.random(n_rows) < 0.9
+    advanced_df = pd.DataFrame({
+        'season': box_scores_df['season'][has_advanced].to_numpy(),
+        'player_id': player[has_advanced],
+        'player': names[player][has_advanced],
+        'per': rng.normal(14, 5, has_advanced.sum()).round(1),
+        'bpm': rng.normal(0, 3, has_advanced.sum()).round(1),
+        'vorp': rng.normal(0.5, 1, has_advanced.sum()).round(1),
+        'ws': rng.normal(3, 2.5, has_advanced.sum()).round(1),
+        'usg_percent': rng.normal(19, 4, has_advanced.sum()).round(1),
+        'ts_percent': rng.normal(0.53, 0.05, has_advanced.sum()).round(3),
+        'e_fg_percent': rng.normal(0.49, 0.05, has_advanced.sum()).round(3),
+    })
+    return players_df, box_scores_df, advanced_df
+
+def legacy_player_summary(players_df, player_totals, advanced_df):
+    """The original per-player dict accumulation and rate loop (without awards), kept for comparison
+    
+    Box-score totals come from the columnar aggregation (whole numbers, so any summation order gives the
+    same totals); advanced stats are summed from the raw table per player with Series.sum, as the original did.
+    """
+    player_stats = {}
+    for _, player in players_df.iterrows():
+        player_id = player.get('player_id') or player.get('id')
+        if not player_id:
+            continue
+        player_stats[player_id] = {'player_id': player_id, 'name': player.get('name') or player.get('full_name', ''), 'teams': set()}
+        player_stats[player_id].update({total_col: 0 for total_col in PLAYER_TOTAL_COLUMNS})
+    resolver = PlayerIdentityResolver.from_players((player_id, stats['name']) for player_id, stats in player_stats.items())
+
+    for stats_player_id, totals in player_totals.iterrows():
+        target_player_id = stats_player_id if stats_player_id in player_stats else resolver.resolve(totals['name'])
+        if target_player_id is None:
+            target_player_id = stats_player_id
+            player_stats[target_player_id] = {'player_id': target_player_id, 'name': totals['name'], 'teams': set()}
+            player_stats[target_player_id].update({total_col: 0 for total_col in PLAYER_TOTAL_COLUMNS})
+            resolver.add(target_player_id, totals['name'])
+        target = player_stats[target_player_id]
+        target['total_games'] += int(totals['total_games'])
+        for total_col in PLAYER_TOTAL_COLUMNS:
+            if total_col != 'total_games':
+                target[total_col] += float(totals[total_col])
+        target['teams'].update(totals['teams'])
+
+    for player_id, group in advanced_df.groupby('player_id'):
+        if player_id in player_stats:
+            for total_col, source_col in ADVANCED_TOTAL_COLUMNS.items():
+                player_stats[player_id][total_col] = group[source_col].sum() if source_col in group.columns else 0
+            player_stats[player_id]['advanced_seasons'] = len(group)
+
+    player_summary = []
+    for player_id, stats in player_stats.items():
+        games = stats['total_games']
+        seasons = stats.get('advanced_seasons', 0)
+        per_game = lambda total: stats[total] / games if games > 0 else 0
+        ratio = lambda made, attempted: stats[made] / stats[attempted] if stats[attempted] > 0 else 0
+        per_season = lambda total: stats.get(total, 0) / seasons if seasons > 0 else 0
+        player_summary.append({
+            'player_id': player_id,
+            'name': stats['name'],
+            'teams': sorted(list(stats['teams'])),
+            'career_ppg': round(per_game('total_points'), 1),
+            'career_rpg': round(per_game('total_rebounds'), 1),
+            'career_apg': round(per_game('total_assists'), 1),
+            'career_spg': round(per_game('total_steals'), 1),
+            'career_bpg': round(per_game('total_blocks'), 1),
+            'career_fg_pct': round(ratio('total_fg_made', 'total_fg_attempted'), 4),
+            'career_3p_pct': round(ratio('total_3p_made', 'total_3p_attempted'), 4),
+            'career_ft_pct': round(ratio('total_ft_made', 'total_ft_attempted'), 4),
+            'career_ts_pct': round(per_season('total_ts_pct'), 4),
+            'career_efg_pct': round(per_season('total_efg_pct'), 4),
+            'career_per': round(per_season('total_per'), 1),
+            'career_bpm': round(per_season('total_bpm'), 1),
+            'career_vorp': round(stats.get('total_vorp', 0), 1),
+            'career_ws': round(stats.get('total_ws', 0), 1),
+            'career_usg_pct': round(per_season('total_usg_pct'), 4),
+            'all_star_appearances': 0,
+            'mvp_count': 0,
+            'all_nba_count': 0,
+            'total_games': games,
+        })
+    return player_summary
+
+def time_summary(players_df, box_scores_df, advanced_df, label, skip_legacy):
+    """Time aggregation and summary for one set of tables, and the legacy loops on the same tables"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        player_totals = aggregate_player_totals(box_scores_df)
+        advanced_stats = aggregate_advanced_stats(advanced_df)
+        aggregate_time = time.perf_counter() - start
+        start = time.perf_counter()
+        summary = generate_player_summary(players_df, box_scores_df, advanced_df, player_totals=player_totals, advanced_stats=advanced_stats)
+        summary_time = time.perf_counter() - start
+    print(f"  {label:<6} {len(box_scores_df):>9,} player-seasons, {len(summary):>7,} players  "
+          f"aggregate {aggregate_time:.3f}s  summary {summary_time:.3f}s")
+    if skip_legacy:
+        return
+
+    start = time.perf_counter()
+    legacy = legacy_player_summary(players_df, player_totals, advanced_df)
+    legacy_time = time.perf_counter() - start
+    identical = json.dumps(summary, indent=2) == json.dumps(legacy, indent=2)
+    print(f"  {'':<6} legacy loops {legacy_time:.3f}s ({legacy_time / summary_time:.1f}x slower), JSON byte-identical: {identical}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--players', type=int, default=5000, help='Players in the full-size tables')
+    parser.add_argument('--scale', type=int, default=10, help='Size of the scaled tables relative to full size')
+    parser.add_argument('--skip-legacy', action='store_true', help='Only time the columnar summary')
+    args = parser.parse_args()
+
+    print("Synthetic player tables")
+    time_summary(*make_player_tables(args.players), 'full', args.skip_legacy)
+    time_summary(*make_player_tables(args.players * args.scale), f'{args.scale}x', args.skip_legacy)
+
+if __name__ == '__main__':
+    main()
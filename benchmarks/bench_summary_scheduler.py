@@ -0,0 +1,87 @@
+"""
+Benchmark for the parallel summary stage
+Times generate_summaries with one worker (every builder in this process) and with a pool of forked workers on
+synthetic team, game and player tables, and checks both produce byte-identical JSON
+
+The speedup is bounded by the slowest builder (the player summary at these sizes) and by the number of
+cores; on a single core the pool only adds its start-up cost.
+
+Usage: python benchmarks/bench_summary_scheduler.py [--players 5000] [--games 70000] [--scale 4] [--workers 3]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from bench_elo import make_history
+from bench_player_summary import make_player_tables
+from process_data import TEAM_COORDINATES, build_aggregates, generate_summaries
+from summary_scheduler import fork_context
+
+def make_team_tables(seed=0):
+    """Synthetic team.csv and team_stats_per_game.csv tables for the teams in TEAM_COORDINATES"""
+    rng = np.random.default_rng(seed)
+    abbreviations = sorted(TEAM_COORDINATES)
+    teams_df = pd.DataFrame({
+        'id': np.arange(len(abbreviations)) + 1610612737,
+        'abbreviation': abbreviations,
+        'full_name': [f"{TEAM_COORDINATES[abbrev]['city']} {abbrev}" for abbrev in abbreviations],
+        'city': [TEAM_COORDINATES[abbrev]['city'] for abbrev in abbreviations],
+        'state': [TEAM_COORDINATES[abbrev]['state'] for abbrev in abbreviations],
+    })
+    seasons = np.arange(1950, 2024)
+    team_stats_per_game_df = pd.DataFrame({
+        'season': np.repeat(seasons, len(abbreviations)),
+        'abbreviation': np.tile(abbreviations, len(seasons)),
+        'pts_per_game': rng.normal(105, 8, len(seasons) * len(abbreviations)).round(1),
+        'trb_per_game': rng.normal(44, 3, len(seasons) * len(abbreviations)).round(1),
+        'ast_per_game': rng.normal(24, 3, len(seasons) * len(abbreviations)).round(1),
+    })
+    return teams_df, team_stats_per_game_df
+
+def time_summaries(tables, workers, label):
+    """Time generate_summaries on one set of tables; returns the summaries' JSON and the time taken"""
+    teams_df, team_stats_per_game_df, players_df, box_scores_df, advanced_df, games_df, aggregates = tables
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        summaries = generate_summaries(
+            teams_df, players_df, games_df, box_scores_df, team_stats_per_game_df, pd.DataFrame(), advanced_df,
+            pd.DataFrame(), pd.DataFrame(), {}, {}, aggregates, workers=workers,
+        )
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<6} {workers} worker{'s' if workers > 1 else ' '}  {elapsed:.3f}s")
+    return {filename: json.dumps(data, indent=2) for filename, data in summaries.items()}, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--players', type=int, default=5000, help='Players in the full-size tables')
+    parser.add_argument('--games', type=int, default=70_000, help='Games in the full-size tables')
+    parser.add_argument('--scale', type=int, default=4, help='Size of the scaled tables relative to full size')
+    parser.add_argument('--workers', type=int, default=3, help='Worker processes for the parallel runs')
+    args = parser.parse_args()
+    
+    print(f"Synthetic tables, {os.cpu_count()} CPUs{'' if fork_context() else ' (no fork: the pool runs serially)'}")
+    teams_df, team_stats_per_game_df = make_team_tables()
+    for label, scale in (('full', 1), (f'{args.scale}x', args.scale)):
+        players_df, box_scores_df, advanced_df = make_player_tables(args.players * scale)
+        games_df = make_history(args.games * scale)
+        with contextlib.redirect_stdout(io.StringIO()):
+            aggregates, _ = build_aggregates(games_df, box_scores_df, advanced_df)
+        tables = (teams_df, team_stats_per_game_df, players_df, box_scores_df, advanced_df, games_df, aggregates)
+        
+        serial, serial_time = time_summaries(tables, 1, label)
+        parallel, parallel_time = time_summaries(tables, args.workers, label)
+        print(f"  {'':<6} speedup {serial_time / parallel_time:.2f}x, JSON byte-identical: {serial == parallel}")
+
+if __name__ == '__main__':
+    main()
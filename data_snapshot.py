@@ -0,0 +1,187 @@
+"""
+Binary Data Snapshot
+Packs the summary files into one struct-of-arrays file with a shared string table, plus the ready-made
+response bodies of the whole-table endpoints, which the backend memory-maps at startup instead of
+parsing JSON
+
+Usage: python data_snapshot.py [backend/data]  (rebuild the snapshot from existing summary JSON files)
+"""
+
+import gzip
+import hashlib
+import json
+import struct
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from output_writer import OutputManifest, serialize_json
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; the backend compresses missing encodings itself
+    brotli = None
+
+SNAPSHOT_MAGIC = b'CSNAPSHT'
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_FILENAME = 'snapshot.bin'
+SNAPSHOT_TABLES = ['team_summary', 'player_summary', 'rivalry_summary', 'state_summary']
+
+# Tables the API serves whole; their response bodies are stored pre-serialized and pre-compressed
+BODY_TABLES = ['team_summary', 'player_summary']
+
+# Every array starts on this boundary so the reader can view it in place
+ALIGNMENT = 8
+
+class UnsupportedSnapshotValue(ValueError):
+    """Raised when a summary holds a value the snapshot format has no column kind for"""
+
+def summary_sha256(data):
+    """Hash of the summary JSON exactly as process_data.py writes it"""
+    return hashlib.sha256(serialize_json(data)).hexdigest()
+
+def response_bodies(records):
+    """The API's JSON response body for records, raw and compressed exactly as backend/precompressed.py does"""
+    body = json.dumps(records, ensure_ascii=False, allow_nan=False, indent=None, separators=(',', ':')).encode('utf-8')
+    bodies = {'identity': body, 'gzip': gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        bodies['br'] = brotli.compress(body, quality=9)
+    return bodies
+
+def column_kind(values):
+    """Pick the column kind for a field's values"""
+    present = [value for value in values if value is not None]
+    # Subclasses (e.g. numpy.float64) encode like their base type, as they do in JSON
+    types = {next((base for base in (bool, int, float, str, list) if isinstance(value, base)), type(value)) for value in present}
+    if types <= {bool}:
+        return 'bool'
+    if types <= {int}:
+        return 'int'
+    if types <= {float}:
+        return 'float'
+    if types <= {int, float}:
+        return 'number'
+    if types <= {str}:
+        return 'str'
+    if types <= {list}:
+        item_types = {type(item) for value in present for item in value}
+        if item_types <= {str}:
+            return 'str_list'
+        if item_types <= {int}:
+            return 'int_list'
+    raise UnsupportedSnapshotValue(f"No snapshot column kind for values of types {sorted(t.__name__ for t in types)}")
+
+class SnapshotWriter:
+    """Accumulates aligned arrays and a deduplicated string table"""
+    
+    def __init__(self):
+        self.chunks = []
+        self.size = 0
+        self.strings = {}
+    
+    def array(self, values, dtype):
+        """Append an array, returning its reference for the header"""
+        array = np.ascontiguousarray(values, dtype=dtype)
+        padding = -self.size % ALIGNMENT
+        if padding:
+            self.chunks.append(b'\0' * padding)
+            self.size += padding
+        ref = {'offset': self.size, 'dtype': array.dtype.str, 'length': int(array.size)}
+        data = array.tobytes()
+        self.chunks.append(data)
+        self.size += len(data)
+        return ref
+    
+    def string_ids(self, values):
+        """String table ids for values"""
+        return [self.strings.setdefault(value, len(self.strings)) for value in values]
+    
+    def column(self, values):
+        """Encode one field's values as arrays, returning the column header"""
+        kind = column_kind(values)
+        nulls = [value is None for value in values]
+        header = {'kind': kind}
+        if any(nulls):
+            header['nulls'] = self.array(nulls, np.bool_)
+        
+        if kind == 'bool':
+            header['values'] = self.array([bool(value) for value in values], np.bool_)
+        elif kind == 'int':
+            header['values'] = self.array([value or 0 for value in values], np.int64)
+        elif kind in ('float', 'number'):
+            header['values'] = self.array([0.0 if value is None else value for value in values], np.float64)
+            if kind == 'number':
+                # Remember which values were ints so they serialize back as 0, not 0.0
+                header['is_int'] = self.array([isinstance(value, int) for value in values], np.bool_)
+        elif kind == 'str':
+            header['values'] = self.array(self.string_ids(['' if value is None else value for value in values]), np.uint32)
+        else:
+            lists = [value or [] for value in values]
+            header['offsets'] = self.array(np.cumsum([0] + [len(value) for value in lists]), np.int64)
+            items = [item for value in lists for item in value]
+            if kind == 'str_list':
+                header['values'] = self.array(self.string_ids(items), np.uint32)
+            else:
+                header['values'] = self.array(items, np.int64)
+        return header
+    
+    def table(self, records):
+        """Encode a list of flat records column by column
+        
+        Records may leave out fields (teams without per-game stats), as long as the fields they do have
+        come in the table's field order.
+        """
+        fields = list(dict.fromkeys(field for record in records for field in record))
+        if any(list(record) != [field for field in fields if field in record] for record in records):
+            raise UnsupportedSnapshotValue("Record fields must come in the same order in every record")
+        
+        columns = []
+        for field in fields:
+            column = {'name': field, **self.column([record.get(field) for record in records])}
+            missing = [field not in record for record in records]
+            if any(missing):
+                column['missing'] = self.array(missing, np.bool_)
+            columns.append(column)
+        return {'rows': len(records), 'columns': columns}
+
+def build_snapshot(summaries):
+    """Serialize {table name: records} into snapshot bytes"""
+    writer = SnapshotWriter()
+    tables = {name: writer.table(records) for name, records in summaries.items()}
+    bodies = {
+        name: {
+            coding: writer.array(np.frombuffer(body, dtype=np.uint8), np.uint8)
+            for coding, body in response_bodies(summaries[name]).items()
+        }
+        for name in BODY_TABLES if name in summaries
+    }
+    
+    encoded = [value.encode('utf-8') for value in writer.strings]
+    string_offsets = writer.array(np.cumsum([0] + [len(value) for value in encoded]), np.int64)
+    string_data = writer.array(np.frombuffer(b''.join(encoded), dtype=np.uint8), np.uint8)
+    
+    header = json.dumps({
+        'version': SNAPSHOT_FORMAT_VERSION,
+        'sources': {f'{name}.json': summary_sha256(records) for name, records in summaries.items()},
+        'strings': {'offsets': string_offsets, 'data': string_data},
+        'tables': tables,
+        'bodies': bodies,
+    }, separators=(',', ':')).encode('utf-8')
+    header += b' ' * (-len(header) % ALIGNMENT)
+    return SNAPSHOT_MAGIC + struct.pack('<Q', len(header)) + header + b''.join(writer.chunks)
+
+def main():
+    data_dir = Path(sys.argv[1] if len(sys.argv) > 1 else 'backend/data')
+    summaries = {}
+    for name in SNAPSHOT_TABLES:
+        with open(data_dir / f'{name}.json', 'r') as f:
+            summaries[name] = json.load(f)
+    # Only the snapshot is rebuilt; the summaries and other outputs stay listed as process_data.py left them
+    manifest = OutputManifest(data_dir, extend=True)
+    written = manifest.write(SNAPSHOT_FILENAME, build_snapshot(summaries))
+    manifest.save()
+    print(f"{data_dir / SNAPSHOT_FILENAME}: {'written' if written else 'unchanged'}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""
+Elo Ratings
+Chronological Elo ratings for every franchise over the full game history, optionally adjusted for the
+margin of victory, summarized as per-season rating series for elo_ratings.json
+"""
+
+import numpy as np
+import pandas as pd
+
+from game_cube import game_seasons
+
+ELO_FILENAME = 'elo_ratings.json'
+
+INITIAL_RATING = 1500.0
+K_FACTOR = 20.0
+HOME_ADVANTAGE = 100.0
+
+# Share of the way back to INITIAL_RATING a rating moves before a team's first game of a new season
+SEASON_REGRESSION = 0.25
+
+def elo_kernel(home, away, home_result, margin, season, n_teams, k_factor=K_FACTOR, home_advantage=HOME_ADVANTAGE, margin_adjusted=False):
+    """Run Elo over games in chronological order
+    
+    home and away are team codes below n_teams, home_result is 1, 0.5 or 0 from the home side, margin the
+    absolute point margin and season each game's season. Margin adjustment scales each update by
+    ((margin + 3) ** 0.8) / (7.5 + 0.006 * winner's rating edge), which damps blowouts by favourites.
+    Returns (home rating before, away rating before, change to the home rating) per game; the away
+    rating changes by the negative.
+    """
+    n_games = len(home)
+    home_before = np.empty(n_games, dtype=np.float64)
+    away_before = np.empty(n_games, dtype=np.float64)
+    home_change = np.empty(n_games, dtype=np.float64)
+    
+    # Each game depends on the ratings the previous ones left, so the loop is sequential; it runs on plain
+    # Python floats, which index and add far faster one at a time than NumPy scalars
+    ratings = [INITIAL_RATING] * n_teams
+    last_season = [None] * n_teams
+    for g, (h, a, result, points, s) in enumerate(zip(home.tolist(), away.tolist(), home_result.tolist(), margin.tolist(), season.tolist())):
+        home_rating = ratings[h]
+        away_rating = ratings[a]
+        if last_season[h] != s:
+            home_rating += SEASON_REGRESSION * (INITIAL_RATING - home_rating)
+            last_season[h] = s
+        if last_season[a] != s:
+            away_rating += SEASON_REGRESSION * (INITIAL_RATING - away_rating)
+            last_season[a] = s
+        
+        edge = home_rating + home_advantage - away_rating
+        change = k_factor * (result - 1.0 / (1.0 + 10.0 ** (-edge / 400.0)))
+        if margin_adjusted and result != 0.5:
+            winner_edge = edge if result > 0.5 else -edge
+            change *= (points + 3.0) ** 0.8 / (7.5 + 0.006 * winner_edge)
+        
+        ratings[h] = home_rating + change
+        ratings[a] = away_rating - change
+        home_before[g] = home_rating
+        away_before[g] = away_rating
+        home_change[g] = change
+    return home_before, away_before, home_change
+
+def build_elo_ratings(games_df, aliases=None, margin_adjusted=False):
+    """Elo ratings per franchise with per-season start, end and peak ratings
+    
+    aliases maps old abbreviations to the franchise's current one (e.g. SEA -> OKC) so relocated teams
+    keep their rating. Games are processed by date, then game_id when present, and belong to the season
+    of game.csv's season_id (by date only without it, see game_seasons). Returns a list of
+    {team, rating, seasons: [{season, start, end, peak, games}]} sorted by team, or None if games_df has
+    no dates.
+    """
+    required = ['home_team', 'away_team', 'home_pts', 'away_pts', 'date']
+    if any(col not in games_df.columns for col in required):
+        return None
+    
+    # Skip rows with missing data, like aggregate_game_results
+    valid = games_df[required].notna().all(axis=1).to_numpy()
+    order_columns = ['date', 'game_id'] if 'game_id' in games_df.columns else ['date']
+    games = games_df[valid].sort_values(order_columns, kind='stable')
+    if games.empty:
+        return []
+    
+    home = games['home_team'].astype(str).replace(aliases or {}).to_numpy()
+    away = games['away_team'].astype(str).replace(aliases or {}).to_numpy()
+    home_pts = games['home_pts'].to_numpy().astype(np.int64)
+    away_pts = games['away_pts'].to_numpy().astype(np.int64)
+    seasons = game_seasons(games['date'], games['season'] if 'season' in games.columns else None)
+    
+    # A franchise can't play itself once old abbreviations are merged
+    distinct = home != away
+    if not distinct.all():
+        home, away, home_pts, away_pts, seasons = home[distinct], away[distinct], home_pts[distinct], away_pts[distinct], seasons[distinct]
+        if len(home) == 0:
+            return []
+    
+    # Hash-based factorize; sorting object strings as np.unique does dominates on large tables
+    codes, teams = pd.factorize(np.concatenate([home, away]), sort=True)
+    home_code, away_code = codes[:len(home)], codes[len(home):]
+    home_result = (np.sign(home_pts - away_pts) + 1) / 2
+    
+    home_before, away_before, home_change = elo_kernel(
+        home_code, away_code, home_result, np.abs(home_pts - away_pts), seasons, len(teams), margin_adjusted=margin_adjusted
+    )
+    
+    # Both sides of every game as rows, grouped by team and season in game order
+    team = np.concatenate([home_code, away_code])
+    season = np.concatenate([seasons, seasons])
+    before = np.concatenate([home_before, away_before])
+    after = np.concatenate([home_before + home_change, away_before - home_change])
+    game = np.concatenate([np.arange(len(home)), np.arange(len(home))])
+    order = np.lexsort((game, season, team))
+    team, season, before, after = team[order], season[order], before[order], after[order]
+    
+    starts = np.flatnonzero(np.r_[True, (team[1:] != team[:-1]) | (season[1:] != season[:-1])])
+    ends = np.r_[starts[1:], len(team)] - 1
+    peaks = np.maximum.reduceat(after, starts)
+    
+    ratings = {}
+    for t, s, start, end, peak, n_games in zip(
+        team[starts].tolist(), season[starts].tolist(), before[starts].tolist(), after[ends].tolist(),
+        peaks.tolist(), (ends - starts + 1).tolist(),
+    ):
+        record = ratings.setdefault(t, {'team': str(teams[t]), 'rating': None, 'seasons': []})
+        record['seasons'].append({
+            'season': s,
+            'start': round(start, 1),
+            'end': round(end, 1),
+            'peak': round(peak, 1),
+            'games': n_games,
+        })
+        record['rating'] = round(end, 1)
+    return [ratings[t] for t in sorted(ratings)]
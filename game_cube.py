@@ -0,0 +1,143 @@
+"""
+Game Counts Cube
+Dense team-pair x decade and team x season arrays of wins and points, built from the cleaned games table
+and shipped to backend/data as an .npz the API can index directly
+"""
+
+import io
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+CUBE_FORMAT_VERSION = 1
+GAME_CUBE_FILENAME = 'game_cube.npz'
+
+# Fixed member timestamp so identical cubes serialize to identical bytes
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+def game_seasons(dates, seasons=None):
+    """NBA season (ending year, as in the other tables) for each game
+    
+    seasons is the cleaned games table's season column (from game.csv's season_id). Games without one
+    fall back to their date, with seasons rolling over in July; that misplaces late-running seasons such
+    as the 2020 bubble, which finished in October.
+    """
+    dates = pd.to_datetime(dates)
+    by_date = (dates.dt.year + (dates.dt.month >= 7)).to_numpy()
+    if seasons is None:
+        return by_date
+    seasons = pd.to_numeric(seasons).to_numpy(dtype=np.float64)
+    return np.where(np.isnan(seasons), by_date, seasons).astype(by_date.dtype)
+
+def build_game_cube(games_df):
+    """Count wins and points per ordered team pair and decade, and per team and season
+    
+    pair_wins[i, j, d] is how often team i beat team j in decade d and pair_points[i, j, d] the points
+    i scored against j. Wins follow the rivalry summary (a tied game goes to the alphabetically later
+    team) so summing over decades reproduces rivalry_summary.json; season records follow the team
+    summary (a tie is a loss for both). Returns None if games_df has no dates.
+    """
+    required = ['home_team', 'away_team', 'home_pts', 'away_pts', 'date']
+    if any(col not in games_df.columns for col in required):
+        return None
+    
+    # Skip rows with missing data, like aggregate_game_results
+    valid = games_df[required].notna().all(axis=1).to_numpy()
+    games = games_df[valid]
+    
+    home = games['home_team'].to_numpy().astype(str)
+    away = games['away_team'].to_numpy().astype(str)
+    home_pts = games['home_pts'].to_numpy().astype(np.int64)
+    away_pts = games['away_pts'].to_numpy().astype(np.int64)
+    seasons_of_games = game_seasons(games['date'], games['season'] if 'season' in games.columns else None)
+    if 'decade' in games.columns:
+        decades_of_games = games['decade'].to_numpy().astype(np.int64)
+    else:
+        decades_of_games = pd.to_datetime(games['date']).dt.year.to_numpy() // 10 * 10
+    
+    teams, codes = np.unique(np.concatenate([home, away]), return_inverse=True)
+    home_code, away_code = codes[:len(home)], codes[len(home):]
+    decades, decade_code = np.unique(decades_of_games, return_inverse=True)
+    seasons, season_code = np.unique(seasons_of_games, return_inverse=True)
+    n_teams, n_decades, n_seasons = len(teams), len(decades), len(seasons)
+    
+    def count(index, weights, shape):
+        size = int(np.prod(shape))
+        return np.bincount(index, weights=weights, minlength=size).astype(np.int32).reshape(shape)
+    
+    # Pair winner as in the rivalry summary: the sorted-first team wins only on strictly more points
+    home_first = home <= away
+    team1_won = np.where(home_first, home_pts > away_pts, away_pts > home_pts)
+    home_won_pair = team1_won == home_first
+    winner = np.where(home_won_pair, home_code, away_code)
+    loser = np.where(home_won_pair, away_code, home_code)
+    
+    pair_shape = (n_teams, n_teams, n_decades)
+    pair_wins = count((winner * n_teams + loser) * n_decades + decade_code, None, pair_shape)
+    pair_points = count(
+        np.concatenate([(home_code * n_teams + away_code) * n_decades + decade_code,
+                        (away_code * n_teams + home_code) * n_decades + decade_code]),
+        np.concatenate([home_pts, away_pts]),
+        pair_shape,
+    )
+    
+    # Season records as in the team summary: a win needs strictly more points
+    season_shape = (n_teams, n_seasons)
+    team_index = np.concatenate([home_code, away_code]) * n_seasons + np.concatenate([season_code, season_code])
+    won = np.concatenate([home_pts > away_pts, away_pts > home_pts])
+    season_wins = count(team_index, won, season_shape)
+    season_games = count(team_index, None, season_shape)
+    
+    return {
+        'version': np.array(CUBE_FORMAT_VERSION, dtype=np.int32),
+        'teams': teams.astype('U'),
+        'decades': decades.astype(np.int16),
+        'seasons': seasons.astype(np.int16),
+        'pair_wins': pair_wins,
+        'pair_points': pair_points,
+        'season_wins': season_wins,
+        'season_losses': season_games - season_wins,
+        'season_points_for': count(team_index, np.concatenate([home_pts, away_pts]), season_shape),
+        'season_points_against': count(team_index, np.concatenate([away_pts, home_pts]), season_shape),
+    }
+
+def merge_game_cubes(base, delta):
+    """Add two cubes built from disjoint sets of games, aligning their team, decade and season axes
+    
+    The result is the cube build_game_cube would return for both sets of games together.
+    """
+    if base is None or delta is None:
+        return base if delta is None else delta
+    
+    teams = np.union1d(base['teams'], delta['teams'])
+    decades = np.union1d(base['decades'], delta['decades'])
+    seasons = np.union1d(base['seasons'], delta['seasons'])
+    merged = {
+        'version': np.array(CUBE_FORMAT_VERSION, dtype=np.int32),
+        'teams': teams.astype('U'),
+        'decades': decades.astype(np.int16),
+        'seasons': seasons.astype(np.int16),
+    }
+    for name in ('pair_wins', 'pair_points', 'season_wins', 'season_losses', 'season_points_for', 'season_points_against'):
+        shape = (len(teams), len(teams), len(decades)) if name.startswith('pair_') else (len(teams), len(seasons))
+        merged[name] = np.zeros(shape, dtype=np.int32)
+        for cube in (base, delta):
+            team_index = np.searchsorted(teams, cube['teams'])
+            if name.startswith('pair_'):
+                merged[name][np.ix_(team_index, team_index, np.searchsorted(decades, cube['decades']))] += cube[name]
+            else:
+                merged[name][np.ix_(team_index, np.searchsorted(seasons, cube['seasons']))] += cube[name]
+    return merged
+
+def serialize_game_cube(cube):
+    """Serialize a cube as a compressed .npz with deterministic bytes"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, array in cube.items():
+            array_buffer = io.BytesIO()
+            np.lib.format.write_array(array_buffer, np.ascontiguousarray(array), allow_pickle=False)
+            info = zipfile.ZipInfo(f'{name}.npy', date_time=ZIP_DATE_TIME)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            archive.writestr(info, array_buffer.getvalue())
+    return buffer.getvalue()
@@ -0,0 +1,69 @@
+"""
+Columnar Game Store
+Every cleaned game as fixed-width NumPy columns sorted by team pair and date, written as .npy files the
+backend memory-maps for head-to-head queries
+"""
+
+import io
+
+import numpy as np
+
+GAME_STORE_DIRNAME = 'games'
+
+def team_code_dtype(n_teams):
+    """Smallest unsigned dtype that can hold n_teams dictionary codes"""
+    return np.uint8 if n_teams <= np.iinfo(np.uint8).max + 1 else np.uint16
+
+def build_game_store(games_df):
+    """Dictionary-encode and sort the games table into columns
+    
+    team1/team2 are codes into 'teams' with team1 <= team2 (the rivalry summary's pair order), dates are
+    days since 1970-01-01 and points are int16. pair_offsets[team1 * n_teams + team2] is where that pair's
+    games start, so a pair's games are pair_offsets[k]:pair_offsets[k + 1] and sorted by date.
+    Returns None if games_df has no dates.
+    """
+    required = ['home_team', 'away_team', 'home_pts', 'away_pts', 'date']
+    if any(col not in games_df.columns for col in required):
+        return None
+    
+    # Skip rows with missing data, like aggregate_game_results
+    valid = games_df[required].notna().all(axis=1).to_numpy()
+    games = games_df[valid]
+    
+    home = games['home_team'].to_numpy().astype(str)
+    away = games['away_team'].to_numpy().astype(str)
+    home_pts = games['home_pts'].to_numpy().astype(np.int16)
+    away_pts = games['away_pts'].to_numpy().astype(np.int16)
+    dates = games['date'].to_numpy().astype('datetime64[D]').astype(np.int32)
+    
+    teams, codes = np.unique(np.concatenate([home, away]), return_inverse=True)
+    home_code, away_code = codes[:len(home)], codes[len(home):]
+    n_teams = len(teams)
+    
+    home_first = home_code <= away_code
+    team1 = np.where(home_first, home_code, away_code)
+    team2 = np.where(home_first, away_code, home_code)
+    team1_pts = np.where(home_first, home_pts, away_pts)
+    team2_pts = np.where(home_first, away_pts, home_pts)
+    
+    order = np.lexsort((dates, team2, team1))
+    pair = team1[order].astype(np.int64) * n_teams + team2[order]
+    pair_offsets = np.searchsorted(pair, np.arange(n_teams * n_teams + 1)).astype(np.int32)
+    
+    code_dtype = team_code_dtype(n_teams)
+    return {
+        'teams': teams.astype('U'),
+        'pair_offsets': pair_offsets,
+        'team1': team1[order].astype(code_dtype),
+        'team2': team2[order].astype(code_dtype),
+        'date': dates[order],
+        'team1_pts': team1_pts[order],
+        'team2_pts': team2_pts[order],
+        'team1_home': home_first[order],
+    }
+
+def serialize_column(column):
+    """A column's .npy file content"""
+    buffer = io.BytesIO()
+    np.lib.format.write_array(buffer, np.ascontiguousarray(column), allow_pickle=False)
+    return buffer.getvalue()
@@ -0,0 +1,135 @@
+"""
+Content-Addressed Output Writer
+Writes pipeline outputs only when their content changed, always through a temp file renamed over the
+target, and keeps a manifest of every output's SHA-256 and size that downstream consumers can key off
+"""
+
+import hashlib
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+MANIFEST_FILENAME = 'manifest.json'
+MANIFEST_FORMAT_VERSION = 1
+
+def serialize_json(data):
+    """Compact JSON bytes, the form summary files are written in"""
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+def file_sha256(path, chunk_size=1 << 20):
+    """Hash a file's contents in fixed-size chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def manifest_digest(files):
+    """One hash over every file's hash, as `sha256sum` would list them sorted by name
+    
+    It changes exactly when some file's content does, so a consumer can compare it alone.
+    """
+    listing = ''.join(f"{files[name]['sha256']}  {name}\n" for name in sorted(files))
+    return hashlib.sha256(listing.encode('utf-8')).hexdigest()
+
+@contextmanager
+def atomic_path(path):
+    """A temp path next to path, renamed over it if the block succeeds and removed if it fails
+    
+    Readers see the old file or the new one, never a partial write, and processes that have the old file
+    mapped keep their copy.
+    """
+    path = Path(path)
+    temp_path = path.with_name(path.name + '.tmp')
+    try:
+        yield temp_path
+        os.replace(temp_path, path)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+
+def write_if_changed(path, content):
+    """Atomically write content unless path already holds exactly those bytes; returns True if written"""
+    path = Path(path)
+    if path.exists() and path.stat().st_size == len(content) and path.read_bytes() == content:
+        return False
+    with atomic_path(path) as temp_path:
+        temp_path.write_bytes(content)
+    return True
+
+class OutputManifest:
+    """Writes outputs into a directory and records their hashes and sizes in its manifest.json
+    
+    Files the previous manifest listed that this run didn't produce are kept in the manifest as long as
+    they still exist, re-hashed from disk and marked carried_over, so consumers can tell a stale output
+    (e.g. a snapshot this run couldn't encode) from one this run vouches for. Outputs a run knows to be
+    out of date are deleted with remove() instead. A tool that updates only some outputs (extend=True)
+    leaves the other entries as the run that produced them left them.
+    """
+    
+    def __init__(self, directory, extend=False):
+        self.directory = Path(directory)
+        self.extend = extend
+        self.files = {}
+        self.written = []
+        self.removed = []
+        self.sha256 = None
+        self.previous = self.load(self.directory)
+    
+    @staticmethod
+    def load(directory):
+        """The manifest saved in directory, or None"""
+        try:
+            with open(Path(directory) / MANIFEST_FILENAME, 'r') as f:
+                manifest = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return manifest if manifest.get('version') == MANIFEST_FORMAT_VERSION else None
+    
+    def write(self, name, content):
+        """Record content as the output name (a path relative to the directory) and write it if it changed"""
+        path = self.directory / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.files[name] = {'sha256': hashlib.sha256(content).hexdigest(), 'bytes': len(content)}
+        if write_if_changed(path, content):
+            self.written.append(name)
+            return True
+        return False
+    
+    def write_json(self, name, data):
+        """write() for data serialized with serialize_json"""
+        return self.write(name, serialize_json(data))
+    
+    def remove(self, name):
+        """Delete the output name if it exists, so neither the directory nor the manifest keeps it"""
+        path = self.directory / name
+        self.files.pop(name, None)
+        if not path.exists():
+            return False
+        path.unlink()
+        self.removed.append(name)
+        return True
+    
+    def save(self):
+        """Write manifest.json after every output is in place; returns True if it changed"""
+        files = dict(self.files)
+        for name, entry in (self.previous or {}).get('files', {}).items():
+            path = self.directory / name
+            if name not in files and path.exists():
+                files[name] = {'sha256': file_sha256(path), 'bytes': path.stat().st_size}
+                if not self.extend or entry.get('carried_over'):
+                    files[name]['carried_over'] = True
+        files = dict(sorted(files.items()))
+        self.sha256 = manifest_digest(files)
+        manifest = {'version': MANIFEST_FORMAT_VERSION, 'sha256': self.sha256, 'files': files}
+        content = json.dumps(manifest, indent=2).encode('utf-8')
+        
+        # Consumers trust the manifest only for files older than it, so it is rewritten even with the same
+        # content when a file was touched after it
+        path = self.directory / MANIFEST_FILENAME
+        if not path.exists() or all((self.directory / name).stat().st_mtime_ns <= path.stat().st_mtime_ns for name in files):
+            return write_if_changed(path, content)
+        with atomic_path(path) as temp_path:
+            temp_path.write_bytes(content)
+        return True
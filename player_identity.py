@@ -0,0 +1,124 @@
+"""
+Player Identity Resolver
+Normalized-name hash index for matching players across datasets that use different ids
+"""
+
+import re
+import unicodedata
+
+import pandas as pd
+
+# Generational suffixes a name may carry in one source and omit in another
+NAME_SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv', 'v'}
+
+DROPPED_PUNCTUATION = re.compile(r"[.'’`]")
+SEPARATORS = re.compile(r'[^a-z0-9]+')
+
+def normalize_name(name, keep_suffixes=False):
+    """Normalize a player name for matching: case, accents, punctuation and (unless keep_suffixes) suffixes"""
+    if name is None or (not isinstance(name, str) and pd.isna(name)):
+        return ''
+    
+    # Strip accents (Jokić → jokic, Dončić → doncic); most names are plain ASCII and have none
+    text = str(name)
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text)
+        text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    text = text.lower()
+    
+    # Drop periods/apostrophes, treat hyphens and other separators as spaces
+    text = DROPPED_PUNCTUATION.sub('', text)
+    text = SEPARATORS.sub(' ', text)
+    key = ' '.join(text.split())
+    return key if keep_suffixes else strip_suffixes(key)
+
+def strip_suffixes(key):
+    """Drop trailing generational suffixes (Jr., Sr., II, III, ...) from a normalized name"""
+    tokens = key.split()
+    while len(tokens) > 1 and tokens[-1] in NAME_SUFFIXES:
+        tokens.pop()
+    return ' '.join(tokens)
+
+class PlayerIdentityResolver:
+    """Maps normalized player names to player ids, built once and queried in O(1)
+    
+    Names are looked up with their suffixes, so Gary Payton and Gary Payton II stay apart. Players sharing
+    an exact name resolve to the first registered one, as the old name loop did. Only a name with a suffix
+    that has no exact match falls back to a player registered without one, and only when no player carries
+    a suffix on that base name: a suffix never stands in for another suffix or for none.
+    """
+    
+    def __init__(self):
+        self.exact_index = {}
+        self.index = {}
+        self.ambiguous = {}
+    
+    @classmethod
+    def from_players(cls, players):
+        """Build the index from (player_id, name) pairs, keeping insertion order per name"""
+        resolver = cls()
+        for player_id, name in players:
+            resolver.add(player_id, name)
+        return resolver
+    
+    def add(self, player_id, name):
+        """Register a player id under its normalized name, with and without suffixes"""
+        key = normalize_name(name, keep_suffixes=True)
+        if not key:
+            return
+        for index, index_key in ((self.exact_index, key), (self.index, strip_suffixes(key))):
+            candidates = index.setdefault(index_key, [])
+            if player_id not in candidates:
+                candidates.append(player_id)
+    
+    def resolve(self, name):
+        """Resolve a name to a player id, or None if unknown
+        
+        Names that match several players are recorded in self.ambiguous.
+        """
+        key = normalize_name(name, keep_suffixes=True)
+        candidates = self.exact_index.get(key)
+        if candidates:
+            if len(candidates) > 1:
+                self.ambiguous[key] = list(candidates)
+            return candidates[0]
+        
+        # Without a suffix the name has no fallback: a suffixed namesake is a different player (a son)
+        base = strip_suffixes(key)
+        if base == key:
+            return None
+        candidates = self.exact_index.get(base)
+        if not candidates:
+            return None
+        # Everyone on the base name, suffixed or not; with a father and a son the suffix can't be dropped
+        namesakes = self.index[base]
+        if len(namesakes) > 1:
+            self.ambiguous[base] = list(namesakes)
+            return None
+        return candidates[0]
+    
+    def resolve_many(self, names):
+        """Resolve an iterable of (source_id, name) pairs to {source_id: player_id} for matched names"""
+        resolved = {}
+        for source_id, name in names:
+            player_id = self.resolve(name)
+            if player_id is not None:
+                resolved[source_id] = player_id
+        return resolved
+    
+    def count_by_player(self, names):
+        """Count occurrences of each name, keyed by resolved player id (unmatched names are skipped)"""
+        counts = {}
+        for name, count in pd.Series(names, dtype='object').value_counts().items():
+            player_id = self.resolve(name)
+            if player_id is not None:
+                counts[player_id] = counts.get(player_id, 0) + int(count)
+        return counts
+    
+    def report_ambiguous(self, limit=10):
+        """Print the ambiguous names seen so far"""
+        if not self.ambiguous:
+            return
+        print(f"  {len(self.ambiguous)} ambiguous player names (exact names matched to the first player, others left unmatched):")
+        for key, candidates in list(self.ambiguous.items())[:limit]:
+            print(f"    - {key}: {candidates}")
@@ -5,11 +5,23 @@ Streams data from Kaggle dataset and generates summary JSON files
 
 import os
 import json
+import argparse
+import time
+import numpy as np
 import pandas as pd
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 import kagglehub
-from kagglehub import KaggleDatasetAdapter
+from data_snapshot import SNAPSHOT_FILENAME, UnsupportedSnapshotValue, build_snapshot
+from elo_ratings import ELO_FILENAME, build_elo_ratings
+from game_cube import GAME_CUBE_FILENAME, build_game_cube, merge_game_cubes, serialize_game_cube
+from game_store import GAME_STORE_DIRNAME, build_game_store, serialize_column
+from output_writer import MANIFEST_FILENAME, OutputManifest, atomic_path, serialize_json
+from player_identity import PlayerIdentityResolver
+from stage_profiler import DEFAULT_PROFILE_DIR, PROFILE_REPORT_FILENAME, PROFILERS, StageProfiler, count_rows, peak_rss_mb
+from summary_scheduler import DEFAULT_WORKERS, SummaryTask, run_tasks
+from table_cache import DEFAULT_CACHE_DIR, TableCache
 
 # Load environment variables
 load_dotenv()
@@ -127,200 +139,241 @@ TEAM_COORDINATES = {
     'WAS': {'city': 'Washington', 'state': 'District of Columbia', 'lat': 38.907, 'lng': -77.036},
 }
 
-def load_data():
-    """Load CSV files from Kaggle datasets"""
-    print("Loading data from Kaggle...")
-    dataset1 = 'wyattowalsh/basketball'
-    dataset2 = 'rodneycarroll78/nba-stats-1980-2024'
-    
-    # Load original dataset files
-    print("  Loading team.csv from wyattowalsh/basketball...")
-    teams_df = kagglehub.dataset_load(
-        KaggleDatasetAdapter.PANDAS,
-        dataset1,
-        path="csv/team.csv"
-    )
-    print(f"  Loaded {len(teams_df)} teams")
+# Kaggle datasets the pipeline reads from
+DATASET_BASKETBALL = 'wyattowalsh/basketball'
+DATASET_NBA_STATS = 'rodneycarroll78/nba-stats-1980-2024'
+
+# Source tables: (cache name, dataset, candidate file names); the first candidate found is loaded
+SOURCE_TABLES = [
+    ('team', DATASET_BASKETBALL, ['csv/team.csv']),
+    ('player', DATASET_BASKETBALL, ['csv/player.csv']),
+    ('game', DATASET_BASKETBALL, ['csv/game.csv']),
+    ('player_totals', DATASET_NBA_STATS, ['player_totals.csv', 'Player Totals.csv', 'player_totals.CSV']),
+    ('team_stats_per_game', DATASET_NBA_STATS, ['team_stats_per_game.csv', 'Team Stats Per Game.csv', 'team_stats_per_game.CSV']),
+    ('team_summaries', DATASET_NBA_STATS, ['team_summaries.csv', 'Team Summaries.csv', 'team_summaries.CSV']),
+    ('advanced', DATASET_NBA_STATS, ['advanced.csv', 'Advanced.csv', 'advanced.CSV']),
+    ('all_star_selections', DATASET_NBA_STATS, ['all_star_selections.csv', 'All Star Selections.csv', 'all_star_selections.CSV']),
+    ('awards_voting_results', DATASET_NBA_STATS, ['awards_voting_results.csv', 'Awards Voting Results.csv', 'awards_voting_results.CSV']),
+]
+
+# Default number of tables read concurrently by load_data
+DEFAULT_LOAD_WORKERS = int(os.getenv('COURTSIDE_LOAD_WORKERS', min(len(SOURCE_TABLES), os.cpu_count() or 1)))
+
+def find_source_file(directory, candidates):
+    """Return the first candidate file that exists in directory (also trying bare file names), or None"""
+    directory = Path(directory)
+    for candidate in candidates:
+        for path in (directory / candidate, directory / Path(candidate).name):
+            if path.exists():
+                return path
+    return None
+
+def load_source_table(cache, name, dataset, candidates, dataset_dirs, source_dir=None):
+    """Load one source table through the table cache, returning (df, source file name, seconds)"""
+    start = time.perf_counter()
     
-    print("  Loading player.csv from wyattowalsh/basketball...")
-    players_df = kagglehub.dataset_load(
-        KaggleDatasetAdapter.PANDAS,
-        dataset1,
-        path="csv/player.csv"
-    )
-    print(f"  Loaded {len(players_df)} players")
+    if source_dir is not None:
+        # Local fixture directory instead of kagglehub
+        source_path = find_source_file(source_dir, candidates)
+    elif dataset == DATASET_BASKETBALL:
+        # Large dataset: download just this file
+        try:
+            source_path = Path(kagglehub.dataset_download(dataset, path=candidates[0]))
+        except Exception as e:
+            cached = cache.read_cached(name)
+            if cached is None:
+                raise
+            print(f"  Could not reach Kaggle ({e}), using cached {name}")
+            return cached, 'cache', time.perf_counter() - start
+    else:
+        dataset_dir = dataset_dirs.get(dataset)
+        if dataset_dir is None:
+            # Dataset download failed: use the cached copy if there is one
+            cached = cache.read_cached(name)
+            if cached is None:
+                return pd.DataFrame(), None, time.perf_counter() - start
+            return cached, 'cache', time.perf_counter() - start
+        source_path = find_source_file(dataset_dir, candidates)
     
-    print("  Loading game.csv from wyattowalsh/basketball...")
-    games_df = kagglehub.dataset_load(
-        KaggleDatasetAdapter.PANDAS,
-        dataset1,
-        path="csv/game.csv"
-    )
-    print(f"  Loaded {len(games_df)} games")
+    if source_path is None:
+        return pd.DataFrame(), None, time.perf_counter() - start
     
-    # Download the new dataset first
-    print("  Downloading rodneycarroll78/nba-stats-1980-2024...")
-    player_totals_df = pd.DataFrame()
-    team_stats_per_game_df = pd.DataFrame()
-    team_summaries_df = pd.DataFrame()
+    df = cache.read_csv(name, source_path)
+    return df, source_path.name, time.perf_counter() - start
+
+def source_table_path(name, source_dir=None):
+    """Path of one source table's CSV in source_dir or its downloaded Kaggle dataset, or None if not found"""
+    _, dataset, candidates = next(table for table in SOURCE_TABLES if table[0] == name)
+    if source_dir is not None:
+        return find_source_file(source_dir, candidates)
+    if dataset == DATASET_BASKETBALL:
+        # Large dataset: download just this file
+        return Path(kagglehub.dataset_download(dataset, path=candidates[0]))
+    return find_source_file(Path(kagglehub.dataset_download(dataset)), candidates)
+
+def load_data(cache_dir=DEFAULT_CACHE_DIR, workers=DEFAULT_LOAD_WORKERS, source_dir=None, tables=None):
+    """Load CSV files from Kaggle datasets (or a local directory of CSVs) on a thread pool
     
-    try:
-        dataset_path = kagglehub.dataset_download(dataset2)
-        print(f"  Dataset downloaded to: {dataset_path}")
-        
-        # Load player stats from the downloaded dataset
-        print("  Loading player_totals.csv...")
-        player_totals_path = Path(dataset_path) / "player_totals.csv"
-        if player_totals_path.exists():
-            player_totals_df = pd.read_csv(player_totals_path)
-            print(f"  Loaded {len(player_totals_df)} player season records")
-        else:
-            print(f"  player_totals.csv not found in {dataset_path}")
-            # Try alternative names
-            for alt_name in ["Player Totals.csv", "player_totals.CSV"]:
-                alt_path = Path(dataset_path) / alt_name
-                if alt_path.exists():
-                    player_totals_df = pd.read_csv(alt_path)
-                    print(f"  Loaded {len(player_totals_df)} player season records from {alt_name}")
-                    break
-        
-        # Load team stats per game
-        print("  Loading team_stats_per_game.csv...")
-        team_stats_path = Path(dataset_path) / "team_stats_per_game.csv"
-        if team_stats_path.exists():
-            team_stats_per_game_df = pd.read_csv(team_stats_path)
-            print(f"  Loaded {len(team_stats_per_game_df)} team season records")
-        else:
-            print(f"  team_stats_per_game.csv not found, trying alternative names...")
-            for alt_name in ["Team Stats Per Game.csv", "team_stats_per_game.CSV"]:
-                alt_path = Path(dataset_path) / alt_name
-                if alt_path.exists():
-                    team_stats_per_game_df = pd.read_csv(alt_path)
-                    print(f"  Loaded {len(team_stats_per_game_df)} team season records from {alt_name}")
-                    break
-        
-        # Load team summaries (advanced stats)
-        print("  Loading team_summaries.csv...")
-        team_summaries_path = Path(dataset_path) / "team_summaries.csv"
-        if team_summaries_path.exists():
-            team_summaries_df = pd.read_csv(team_summaries_path)
-            print(f"  Loaded {len(team_summaries_df)} team summary records")
-        else:
-            print(f"  team_summaries.csv not found, trying alternative names...")
-            for alt_name in ["Team Summaries.csv", "team_summaries.CSV"]:
-                alt_path = Path(dataset_path) / alt_name
-                if alt_path.exists():
-                    team_summaries_df = pd.read_csv(alt_path)
-                    print(f"  Loaded {len(team_summaries_df)} team summary records from {alt_name}")
-                    break
-        
-        # Load advanced player stats
-        print("  Loading advanced.csv...")
-        advanced_df = pd.DataFrame()
-        advanced_path = Path(dataset_path) / "advanced.csv"
-        if advanced_path.exists():
-            advanced_df = pd.read_csv(advanced_path)
-            print(f"  Loaded {len(advanced_df)} advanced stat records")
-        else:
-            for alt_name in ["Advanced.csv", "advanced.CSV"]:
-                alt_path = Path(dataset_path) / alt_name
-                if alt_path.exists():
-                    advanced_df = pd.read_csv(alt_path)
-                    print(f"  Loaded {len(advanced_df)} advanced stat records from {alt_name}")
-                    break
-        
-        # Load all-star selections
-        print("  Loading all_star_selections.csv...")
-        all_star_df = pd.DataFrame()
-        all_star_path = Path(dataset_path) / "all_star_selections.csv"
-        if all_star_path.exists():
-            all_star_df = pd.read_csv(all_star_path)
-            print(f"  Loaded {len(all_star_df)} all-star selections")
-        else:
-            for alt_name in ["All Star Selections.csv", "all_star_selections.CSV"]:
-                alt_path = Path(dataset_path) / alt_name
-                if alt_path.exists():
-                    all_star_df = pd.read_csv(alt_path)
-                    print(f"  Loaded {len(all_star_df)} all-star selections from {alt_name}")
-                    break
-        
-        # Load awards (MVP, All-NBA, etc.)
-        print("  Loading awards_voting_results.csv...")
-        awards_df = pd.DataFrame()
-        awards_path = Path(dataset_path) / "awards_voting_results.csv"
-        if awards_path.exists():
-            awards_df = pd.read_csv(awards_path)
-            print(f"  Loaded {len(awards_df)} award voting records")
-        else:
-            for alt_name in ["Awards Voting Results.csv", "awards_voting_results.CSV"]:
-                alt_path = Path(dataset_path) / alt_name
-                if alt_path.exists():
-                    awards_df = pd.read_csv(alt_path)
-                    print(f"  Loaded {len(awards_df)} award voting records from {alt_name}")
-                    break
-        
-        # List available files for debugging
-        if player_totals_df.empty or team_stats_per_game_df.empty:
-            print(f"  Available files in dataset:")
-            for file in Path(dataset_path).glob("*.csv"):
-                print(f"    - {file.name}")
-                
-    except Exception as e:
-        print(f"  Error downloading/loading dataset: {e}")
-        print(f"  Will continue with placeholder stats")
-        advanced_df = pd.DataFrame()
-        all_star_df = pd.DataFrame()
-        awards_df = pd.DataFrame()
+    tables limits loading to the named source tables; the others are returned empty.
+    """
+    source_tables = [table for table in SOURCE_TABLES if tables is None or table[0] in tables]
+    if source_dir is not None:
+        print(f"Loading data from {source_dir}...")
+    else:
+        print("Loading data from Kaggle...")
+    
+    cache = TableCache(cache_dir)
+    if not cache.enabled:
+        print("  pyarrow not installed, table cache disabled")
+    
+    dataset_dirs = {}
+    if source_dir is None:
+        # Download the stats dataset up front; its tables are read from the downloaded directory
+        print(f"  Downloading {DATASET_NBA_STATS}...")
+        try:
+            dataset_dirs[DATASET_NBA_STATS] = Path(kagglehub.dataset_download(DATASET_NBA_STATS))
+            print(f"  Dataset downloaded to: {dataset_dirs[DATASET_NBA_STATS]}")
+        except Exception as e:
+            print(f"  Error downloading dataset: {e}")
+            print(f"  Will continue with cached tables where available, placeholder stats otherwise")
+    
+    # Read tables concurrently; pandas' CSV parser and Arrow reads release the GIL for most of the work
+    loaded = {name: pd.DataFrame() for name, _, _ in SOURCE_TABLES}
+    timings = {}
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = {
+            executor.submit(load_source_table, cache, name, dataset, candidates, dataset_dirs, source_dir): name
+            for name, dataset, candidates in source_tables
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            df, source_name, elapsed = future.result()
+            loaded[name] = df
+            timings[name] = elapsed
+            if source_name is None:
+                print(f"  {name}: not found")
+            else:
+                print(f"  Loaded {len(df)} {name} rows from {source_name} ({elapsed:.2f}s)")
+    total_time = time.perf_counter() - start
+    
+    print(f"  Loaded {len(source_tables)} tables with {max(1, workers)} workers in {total_time:.2f}s "
+          f"(sum of per-table times {sum(timings.values()):.2f}s)")
+    
+    # List available files for debugging
+    stats_dir = source_dir or dataset_dirs.get(DATASET_NBA_STATS)
+    missing = [name for name, _, _ in source_tables if name in ('player_totals', 'team_stats_per_game') and loaded[name].empty]
+    if stats_dir is not None and missing:
+        print(f"  Available files in dataset:")
+        for file in Path(stats_dir).glob("*.csv"):
+            print(f"    - {file.name}")
+    
+    player_totals_df = loaded['player_totals']
+    games_df = loaded['game']
     
     # Use player_totals as box_scores for player stats calculation
     box_scores_df = player_totals_df if not player_totals_df.empty else games_df.copy()
     
-    return teams_df, players_df, games_df, box_scores_df, team_stats_per_game_df, team_summaries_df, advanced_df, all_star_df, awards_df
+    return (
+        loaded['team'], loaded['player'], games_df, box_scores_df,
+        loaded['team_stats_per_game'], loaded['team_summaries'], loaded['advanced'],
+        loaded['all_star_selections'], loaded['awards_voting_results'],
+    )
 
-def clean_data(teams_df, players_df, games_df, box_scores_df):
-    """Clean and process CSV data"""
-    print("Cleaning and processing data...")
+# Repetitive code columns stored as categoricals after cleaning
+GAME_CATEGORY_COLUMNS = ['home_team', 'away_team', 'decade']
+BOX_SCORE_CATEGORY_COLUMNS = ['tm', 'pos', 'lg']
+
+# game.csv columns renamed to the names the summaries use
+GAME_COLUMN_NAMES = {
+    'team_abbreviation_home': 'home_team',
+    'team_abbreviation_away': 'away_team',
+    'pts_home': 'home_pts',
+    'pts_away': 'away_pts',
+}
+
+def frame_memory_mb(*frames):
+    """Combined in-memory size of DataFrames in MB, counting string contents"""
+    return sum(frame.memory_usage(deep=True).sum() for frame in frames) / (1024 * 1024)
+
+def compact_columns(df, category_columns):
+    """Downcast integer columns and store the given code columns as categoricals
     
-    # Clean teams - map column names
-    if 'abbreviation' in teams_df.columns:
-        teams_df['abbreviation'] = teams_df['abbreviation'].replace(TEAM_ABBREV_MAP)
+    Float columns holding only whole numbers and no missing values (counts read as floats) become integers
+    too. Other float columns stay float64 so sums over them, and the summaries built from them, are unchanged.
+    """
+    for col in df.columns:
+        series = df[col]
+        if col in category_columns:
+            df[col] = series.astype('category')
+        elif pd.api.types.is_bool_dtype(series):
+            continue
+        elif pd.api.types.is_integer_dtype(series):
+            df[col] = pd.to_numeric(series, downcast='integer')
+        elif pd.api.types.is_float_dtype(series):
+            values = series.to_numpy()
+            if len(values) and np.isfinite(values).all() and (values == np.trunc(values)).all():
+                df[col] = pd.to_numeric(values.astype(np.int64), downcast='integer')
+    return df
+
+def clean_games(games_df):
+    """Clean game.csv rows: datetime64 day dates, summary column names, season, decade and margin, compact dtypes
     
-    # Clean games - map column names to expected format
+    Works row by row, so chunks of the file can be cleaned separately.
+    """
     # game.csv has: team_id_home, team_abbreviation_home, pts_home, pts_away, game_date
     if 'game_date' in games_df.columns:
-        games_df['date'] = pd.to_datetime(games_df['game_date'], errors='coerce')
-        games_df = games_df.dropna(subset=['date'])
-        games_df['date'] = games_df['date'].dt.strftime('%Y-%m-%d')
-    
-    # Map to expected column names for easier processing
-    if 'team_abbreviation_home' in games_df.columns:
-        games_df['home_team'] = games_df['team_abbreviation_home']
-    if 'team_abbreviation_away' in games_df.columns:
-        games_df['away_team'] = games_df['team_abbreviation_away']
-    if 'pts_home' in games_df.columns:
-        games_df['home_pts'] = games_df['pts_home']
-    if 'pts_away' in games_df.columns:
-        games_df['away_pts'] = games_df['pts_away']
+        dates = pd.to_datetime(games_df['game_date'], errors='coerce')
+        games_df = games_df[dates.notna()].drop(columns='game_date')
+        games_df['date'] = dates[dates.notna()].dt.normalize()
+    
+    # Rename to expected column names for easier processing, rather than keeping both copies
+    renamed = {source: target for source, target in GAME_COLUMN_NAMES.items() if source in games_df.columns}
+    games_df = games_df.drop(columns=[target for target in renamed.values() if target in games_df.columns])
+    games_df = games_df.rename(columns=renamed)
+    
+    # Season (ending year, as in the other tables) from season_id, a season-type digit then the starting year
+    if 'season_id' in games_df.columns:
+        games_df['season'] = pd.to_numeric(games_df['season_id'], errors='coerce') % 10000 + 1
     
     # Add decade
     if 'date' in games_df.columns:
-        games_df['year'] = pd.to_datetime(games_df['date']).dt.year
-        games_df['decade'] = (games_df['year'] // 10) * 10
-        games_df['decade_str'] = games_df['decade'].astype(str) + 's'
+        games_df['decade'] = (pd.to_datetime(games_df['date']).dt.year // 10 * 10).astype('int16')
     
     # Calculate game margin
     if 'home_pts' in games_df.columns and 'away_pts' in games_df.columns:
         games_df['game_margin'] = games_df['home_pts'] - games_df['away_pts']
     
-    # Clean box scores
+    return compact_columns(games_df, GAME_CATEGORY_COLUMNS)
+
+def clean_box_scores(box_scores_df):
+    """Clean player_totals rows: drop negative minutes, add FG%, compact dtypes; works chunk by chunk too"""
     if 'minutes' in box_scores_df.columns:
         box_scores_df = box_scores_df[box_scores_df['minutes'] >= 0]
     
     # Calculate FG%
     if 'fgm' in box_scores_df.columns and 'fga' in box_scores_df.columns:
-        box_scores_df['fg_pct'] = box_scores_df.apply(
-            lambda x: x['fgm'] / x['fga'] if x['fga'] > 0 else 0, axis=1
-        )
+        attempted = box_scores_df['fga'] > 0
+        box_scores_df['fg_pct'] = (box_scores_df['fgm'] / box_scores_df['fga']).where(attempted, 0)
+    
+    return compact_columns(box_scores_df, BOX_SCORE_CATEGORY_COLUMNS)
+
+def clean_data(teams_df, players_df, games_df, box_scores_df):
+    """Clean and process CSV data
+    
+    Games keep dates as datetime64 days, team codes and decades as categoricals and integer columns
+    downcast; box score team, position and league codes become categoricals.
+    """
+    print("Cleaning and processing data...")
+    memory_before = frame_memory_mb(teams_df, players_df, games_df, box_scores_df)
+    peak_before = peak_rss_mb()
+    
+    # Clean teams - map column names
+    if 'abbreviation' in teams_df.columns:
+        teams_df['abbreviation'] = teams_df['abbreviation'].replace(TEAM_ABBREV_MAP)
+    
+    games_df = clean_games(games_df)
+    box_scores_df = clean_box_scores(box_scores_df)
     
     # Clean player names - map column names
     if 'full_name' in players_df.columns:
@@ -332,6 +385,12 @@ def clean_data(teams_df, players_df, games_df, box_scores_df):
     if 'id' in players_df.columns and 'player_id' not in players_df.columns:
         players_df['player_id'] = players_df['id']
     
+    memory_after = frame_memory_mb(teams_df, players_df, games_df, box_scores_df)
+    print(f"  Frame memory (DataFrame contents): {memory_before:.1f} MB -> {memory_after:.1f} MB")
+    # The process high-water mark, which is what limits build runners (per stage on Linux, see StageProfiler)
+    peak_after = peak_rss_mb()
+    if peak_after is not None:
+        print(f"  Peak RSS: {peak_before:.0f} MB before cleaning, {peak_after:.0f} MB after")
     print("Data cleaning complete!")
     return teams_df, players_df, games_df, box_scores_df
 
@@ -375,7 +434,104 @@ def load_championship_data():
     
     return championships, championship_years
 
-def generate_team_summary(teams_df, games_df, team_stats_per_game_df=None, team_summaries_df=None, championships=None, championship_years=None):
+def valid_games(games_df):
+    """(home, away, home_pts, away_pts) arrays for games with both teams and scores, or None if there are none"""
+    if 'home_team' not in games_df.columns or 'away_team' not in games_df.columns:
+        return None
+    
+    home_pts = games_df['home_pts'] if 'home_pts' in games_df.columns else pd.Series(0, index=games_df.index)
+    away_pts = games_df['away_pts'] if 'away_pts' in games_df.columns else pd.Series(0, index=games_df.index)
+    
+    # Skip rows with missing data
+    valid = (
+        games_df['home_team'].notna() & games_df['away_team'].notna()
+        & home_pts.notna() & away_pts.notna()
+    ).to_numpy()
+    if not valid.any():
+        return None
+    
+    home = games_df['home_team'].to_numpy()[valid].astype(str)
+    away = games_df['away_team'].to_numpy()[valid].astype(str)
+    return home, away, home_pts.to_numpy()[valid], away_pts.to_numpy()[valid]
+
+def aggregate_game_results(games_df):
+    """Compute per-team W/L and per-pair rivalry counts from games_df in one vectorized pass
+    
+    Returns (team_records, rivalries): team_records is indexed by abbreviation with wins/losses,
+    rivalries has one row per sorted team pair in order of first meeting.
+    """
+    team_records = pd.DataFrame({'wins': pd.Series(dtype='int64'), 'losses': pd.Series(dtype='int64')})
+    rivalries = pd.DataFrame({
+        'team1': pd.Series(dtype='object'),
+        'team2': pd.Series(dtype='object'),
+        'total_meetings': pd.Series(dtype='int64'),
+        'team1_wins': pd.Series(dtype='int64'),
+        'team2_wins': pd.Series(dtype='int64'),
+    })
+    
+    games = valid_games(games_df)
+    if games is None:
+        return team_records, rivalries
+    
+    home, away, home_pts, away_pts = games
+    home_won = home_pts > away_pts
+    away_won = away_pts > home_pts
+    
+    # Per-team records: stack home and away appearances and count wins per team
+    appearances = pd.DataFrame({
+        'team': np.concatenate([home, away]),
+        'won': np.concatenate([home_won, away_won]),
+    })
+    grouped = appearances.groupby('team', sort=False)['won']
+    team_records = pd.DataFrame({'wins': grouped.sum().astype('int64')})
+    team_records['losses'] = grouped.size().astype('int64') - team_records['wins']
+    
+    # Per-pair rivalries keyed on the sorted pair, in order of first meeting
+    home_first = home <= away
+    pairs = pd.DataFrame({
+        'team1': np.where(home_first, home, away),
+        'team2': np.where(home_first, away, home),
+        'team1_won': np.where(home_first, home_won, away_won),
+    })
+    grouped = pairs.groupby(['team1', 'team2'], sort=False)['team1_won']
+    rivalries = pd.DataFrame({
+        'total_meetings': grouped.size().astype('int64'),
+        'team1_wins': grouped.sum().astype('int64'),
+    })
+    rivalries['team2_wins'] = rivalries['total_meetings'] - rivalries['team1_wins']
+    rivalries = rivalries.reset_index()
+    
+    return team_records, rivalries
+
+def merge_game_results(base, delta, games_df=None):
+    """Combine two aggregate_game_results outputs
+    
+    Pairs first met in delta are ordered after base's, which matches a full aggregation when delta's games
+    come after base's in the table. Otherwise pass the whole games_df, and pairs are ordered by their first
+    meeting in it as aggregate_game_results orders them.
+    """
+    base_records, base_rivalries = base
+    delta_records, delta_rivalries = delta
+    team_records = base_records.add(delta_records, fill_value=0).astype('int64')
+    rivalries = pd.concat([base_rivalries, delta_rivalries], ignore_index=True)
+    rivalries = rivalries.groupby(['team1', 'team2'], sort=False, as_index=False).sum()
+    
+    games = valid_games(games_df) if games_df is not None else None
+    if games is not None:
+        home, away = games[0], games[1]
+        home_first = home <= away
+        first_meetings = pd.DataFrame({
+            'team1': np.where(home_first, home, away),
+            'team2': np.where(home_first, away, home),
+        }).drop_duplicates(ignore_index=True)
+        first_meetings['first_meeting'] = np.arange(len(first_meetings))
+        rivalries = rivalries.merge(first_meetings, on=['team1', 'team2'], how='left', sort=False)
+        # Pairs no longer in games_df keep their place after the others
+        rivalries = rivalries.sort_values('first_meeting', kind='stable', na_position='last', ignore_index=True)
+        rivalries = rivalries.drop(columns='first_meeting')
+    return team_records, rivalries
+
+def generate_team_summary(teams_df, games_df, team_stats_per_game_df=None, team_summaries_df=None, championships=None, championship_years=None, game_results=None):
     """Generate team_summary.json"""
     print("Generating team summary...")
     
@@ -383,6 +539,11 @@ def generate_team_summary(teams_df, games_df, team_stats_per_game_df=None, team_
     if championships is None or championship_years is None:
         championships, championship_years = load_championship_data()
     
+    # Aggregate game results if not provided
+    if game_results is None:
+        game_results = aggregate_game_results(games_df)
+    team_records, _ = game_results
+    
     team_stats = {}
     
     # Initialize with team info
@@ -402,29 +563,11 @@ def generate_team_summary(teams_df, games_df, team_stats_per_game_df=None, team_
             'championship_years': sorted(championship_years.get(abbrev, [])),
         }
     
-    # Calculate wins/losses from games
-    if 'home_team' in games_df.columns and 'away_team' in games_df.columns:
-        for _, game in games_df.iterrows():
-            home_team = game.get('home_team')
-            away_team = game.get('away_team')
-            home_pts = game.get('home_pts', 0)
-            away_pts = game.get('away_pts', 0)
-            
-            # Skip if missing data
-            if pd.isna(home_team) or pd.isna(away_team) or pd.isna(home_pts) or pd.isna(away_pts):
-                continue
-            
-            if home_team in team_stats:
-                if home_pts > away_pts:
-                    team_stats[home_team]['total_wins'] += 1
-                else:
-                    team_stats[home_team]['total_losses'] += 1
-            
-            if away_team in team_stats:
-                if away_pts > home_pts:
-                    team_stats[away_team]['total_wins'] += 1
-                else:
-                    team_stats[away_team]['total_losses'] += 1
+    # Apply wins/losses from the shared game aggregation
+    for abbrev, record in team_records.iterrows():
+        if abbrev in team_stats:
+            team_stats[abbrev]['total_wins'] = int(record['wins'])
+            team_stats[abbrev]['total_losses'] = int(record['losses'])
     
     # Calculate win percentage and add coordinates
     team_summary = []
@@ -478,169 +621,269 @@ def generate_team_summary(teams_df, games_df, team_stats_per_game_df=None, team_
     
     return team_summary
 
-def generate_player_summary(players_df, box_scores_df, advanced_df=None, all_star_df=None, awards_df=None):
-    """Generate player_summary.json"""
+# player_totals columns summed into per-player career totals: {total name: source column}
+PLAYER_TOTAL_COLUMNS = {
+    'total_games': 'g',
+    'total_points': 'pts',
+    'total_rebounds': 'trb',
+    'total_assists': 'ast',
+    'total_steals': 'stl',
+    'total_blocks': 'blk',
+    'total_fg_made': 'fg',
+    'total_fg_attempted': 'fga',
+    'total_3p_made': 'x3p',
+    'total_3p_attempted': 'x3pa',
+    'total_ft_made': 'ft',
+    'total_ft_attempted': 'fta',
+}
+
+# advanced.csv columns summed per player: {total name: source column}
+ADVANCED_TOTAL_COLUMNS = {
+    'total_per': 'per',
+    'total_bpm': 'bpm',
+    'total_vorp': 'vorp',
+    'total_ws': 'ws',
+    'total_usg_pct': 'usg_percent',
+    'total_ts_pct': 'ts_percent',
+    'total_efg_pct': 'e_fg_percent',
+}
+
+def aggregate_player_totals(box_scores_df):
+    """Sum player_totals rows per source player_id
+    
+    Returns a DataFrame indexed by player_id (sorted) with the PLAYER_TOTAL_COLUMNS totals, a
+    'teams' frozenset of mapped abbreviations and, when available, the player's 'name';
+    or None if box_scores_df has no player_id column.
+    """
+    if box_scores_df.empty or 'player_id' not in box_scores_df.columns:
+        return None
+    
+    grouped = box_scores_df.groupby('player_id')
+    aggregations = {
+        total_col: (source_col, 'sum')
+        for total_col, source_col in PLAYER_TOTAL_COLUMNS.items()
+        if source_col in box_scores_df.columns
+    }
+    if aggregations:
+        totals = grouped.agg(**aggregations)
+    else:
+        totals = pd.DataFrame(index=grouped.size().index)
+    
+    # Missing columns: games fall back to the number of season rows, everything else to 0
+    for total_col, source_col in PLAYER_TOTAL_COLUMNS.items():
+        if total_col not in totals.columns:
+            totals[total_col] = grouped.size() if total_col == 'total_games' else 0
+    totals = totals[list(PLAYER_TOTAL_COLUMNS)]
+    
+    # Collect unique teams, mapping old abbreviations to new ones
+    player_teams = {}
+    if 'tm' in box_scores_df.columns:
+        team_rows = box_scores_df[['player_id', 'tm']].dropna()
+        team_abbrevs = team_rows['tm'].astype(str).str.upper().str.strip().replace(TEAM_ABBREV_MAP)
+        team_rows = team_rows.assign(tm=team_abbrevs)[team_abbrevs != ''].drop_duplicates()
+        # Sets are built from the distinct (player, team) pairs; a per-group aggregation runs in Python anyway
+        for player_id, team in zip(team_rows['player_id'].tolist(), team_rows['tm'].tolist()):
+            player_teams.setdefault(player_id, set()).add(team)
+    totals['teams'] = pd.Series(
+        [frozenset(player_teams.get(player_id, ())) for player_id in totals.index.tolist()],
+        index=totals.index, dtype='object',
+    )
+    
+    # Name from each player's first row
+    if 'player' in box_scores_df.columns:
+        first_rows = box_scores_df.drop_duplicates('player_id').set_index('player_id')
+        totals['name'] = first_rows['player'].reindex(totals.index)
+    
+    return totals
+
+def merge_player_totals(base, delta):
+    """Combine two aggregate_player_totals results (base's names win over delta's)"""
+    if base is None or delta is None:
+        return base if delta is None else delta
+    
+    combined = base.reindex(base.index.union(delta.index))
+    delta = delta.reindex(combined.index)
+    for total_col in PLAYER_TOTAL_COLUMNS:
+        combined[total_col] = combined[total_col].fillna(0) + delta[total_col].fillna(0)
+    combined['teams'] = [
+        (base_teams if isinstance(base_teams, frozenset) else frozenset())
+        | (delta_teams if isinstance(delta_teams, frozenset) else frozenset())
+        for base_teams, delta_teams in zip(combined['teams'], delta['teams'])
+    ]
+    if 'name' in combined.columns:
+        combined['name'] = combined['name'].fillna(delta['name'])
+    return combined
+
+def aggregate_advanced_stats(advanced_df):
+    """Sum advanced.csv rows per player_id, with the number of seasons in 'advanced_seasons'
+    
+    Each player's seasons are added with one NumPy sum in file order, as Series.sum did per player in the
+    original loop. groupby's sum compensates for rounding error instead, which moves enough totals by an ulp
+    to change the published 4-decimal averages.
+    """
+    if advanced_df is None or advanced_df.empty or 'player_id' not in advanced_df.columns:
+        return None
+    
+    # Rows grouped by player (sorted like groupby's keys), keeping file order within each player
+    codes, player_ids = pd.factorize(advanced_df['player_id'], sort=True)
+    rows = np.flatnonzero(codes >= 0)
+    rows = rows[np.argsort(codes[rows], kind='stable')]
+    starts = np.flatnonzero(np.diff(codes[rows], prepend=-1))
+    ends = np.append(starts[1:], len(rows))
+    
+    advanced = pd.DataFrame(index=pd.Index(player_ids, name='player_id'))
+    present = {
+        total_col: source_col
+        for total_col, source_col in ADVANCED_TOTAL_COLUMNS.items()
+        if source_col in advanced_df.columns
+    }
+    if present:
+        # One row per stat, so each player's values are a contiguous slice as they were in a Series
+        values = np.nan_to_num(advanced_df[list(present.values())].to_numpy(dtype='float64')[rows], nan=0.0).T.copy()
+        sums = np.array([values[:, start:end].sum(axis=1) for start, end in zip(starts.tolist(), ends.tolist())])
+        sums = sums.reshape(len(starts), len(present))
+        for position, total_col in enumerate(present):
+            advanced[total_col] = sums[:, position]
+    for total_col in ADVANCED_TOTAL_COLUMNS:
+        if total_col not in advanced.columns:
+            advanced[total_col] = 0
+    advanced = advanced[list(ADVANCED_TOTAL_COLUMNS)]
+    advanced['advanced_seasons'] = (ends - starts).astype('int64')
+    return advanced
+
+def match_player_totals(player_totals, player_names, resolver):
+    """The player_names id each player_totals row adds to, or None to skip the row
+    
+    Rows match by player_id, then by name; unmatched names become new players in player_names and the
+    resolver, so later rows with the same name join them.
+    """
+    has_names = 'name' in player_totals.columns
+    stats_player_ids = player_totals.index.tolist()
+    names = player_totals['name'].tolist() if has_names else [None] * len(stats_player_ids)
+    
+    # Resolve every player_totals id missing from player_names in one bulk pass
+    name_matches = {}
+    if has_names:
+        unmatched = player_totals[~player_totals.index.isin(list(player_names))]
+        name_matches = resolver.resolve_many(zip(unmatched.index, unmatched['name']))
+        print(f"  Matched {len(name_matches)} of {len(unmatched)} unknown player ids by name")
+    
+    targets = []
+    for stats_player_id, player_name in zip(stats_player_ids, names):
+        target_player_id = None
+        if pd.isna(stats_player_id):
+            pass
+        elif stats_player_id in player_names:
+            target_player_id = stats_player_id
+        elif has_names:
+            # The name match, or a player created earlier in this loop
+            target_player_id = name_matches.get(stats_player_id)
+            if target_player_id is None:
+                target_player_id = resolver.resolve(player_name)
+            if target_player_id is None:
+                # New entry for a player not in the original dataset
+                target_player_id = stats_player_id
+                player_names[target_player_id] = player_name
+                resolver.add(target_player_id, player_name)
+        targets.append(target_player_id)
+    return targets
+
+def rounded_rates(numerator, denominator, digits, numpy_round=False):
+    """numerator / denominator rounded to digits as a list, with int 0 where denominator isn't positive
+    
+    Box score totals used to be summed as Python floats and advanced stats kept as NumPy floats, whose
+    round() differs for a few halfway values; numpy_round keeps the latter so the JSON is unchanged.
+    """
+    positive = denominator > 0
+    rates = np.divide(numerator, denominator, out=np.zeros(len(numerator)), where=positive)
+    if numpy_round:
+        rates = np.round(rates, digits)
+        return [rate if has_rate else 0 for rate, has_rate in zip(rates.tolist(), positive.tolist())]
+    return [round(rate, digits) if has_rate else 0 for rate, has_rate in zip(rates.tolist(), positive.tolist())]
+
+def generate_player_summary(players_df, box_scores_df, advanced_df=None, all_star_df=None, awards_df=None, player_totals=None, advanced_stats=None):
+    """Generate player_summary.json
+    
+    Season totals are matched to players once, then summed and turned into per-game rates and percentages
+    as aligned arrays with one slot per player.
+    """
     print("Generating player summary...")
     
-    player_stats = {}
+    # Initialize all players, in first-seen order (a repeated id keeps its place and takes the later name)
+    ids = players_df['player_id'].tolist() if 'player_id' in players_df.columns else [None] * len(players_df)
+    fallback_ids = players_df['id'].tolist() if 'id' in players_df.columns else [None] * len(players_df)
+    names = players_df['name'].tolist() if 'name' in players_df.columns else [None] * len(players_df)
+    full_names = players_df['full_name'].tolist() if 'full_name' in players_df.columns else [''] * len(players_df)
+    player_names = {}
+    for player_id, fallback_id, name, full_name in zip(ids, fallback_ids, names, full_names):
+        player_id = player_id or fallback_id
+        if player_id:
+            player_names[player_id] = name or full_name
     
-    # Initialize all players
-    for _, player in players_df.iterrows():
-        player_id = player.get('player_id') or player.get('id')
-        player_name = player.get('name') or player.get('full_name', '')
-        
-        if not player_id:
-            continue
-        
-        player_stats[player_id] = {
-            'player_id': player_id,
-            'name': player_name,
-            'teams': set(),  # Use set to avoid duplicates
-            'total_points': 0,
-            'total_rebounds': 0,
-            'total_assists': 0,
-            'total_steals': 0,
-            'total_blocks': 0,
-            'total_games': 0,
-            'total_fg_made': 0,
-            'total_fg_attempted': 0,
-            'total_3p_made': 0,
-            'total_3p_attempted': 0,
-            'total_ft_made': 0,
-            'total_ft_attempted': 0,
-        }
+    # Build the normalized-name index once; it backs every name-keyed join below
+    resolver = PlayerIdentityResolver.from_players(player_names.items())
+    
+    # Aggregate player_totals and advanced stats per source player_id if not provided
+    if player_totals is None:
+        player_totals = aggregate_player_totals(box_scores_df)
+    if advanced_stats is None:
+        advanced_stats = aggregate_advanced_stats(advanced_df)
     
     # Calculate stats from player_totals if available
     if not box_scores_df.empty and len(box_scores_df) > 0:
         # Check what columns are available
         print(f"  Player totals columns: {list(box_scores_df.columns)}")
-        
-        # The player_totals table should have: player_id, pts, trb, ast, g, tm
-        player_id_col = 'player_id'
-        pts_col = 'pts'
-        reb_col = 'trb'  # Total rebounds
-        ast_col = 'ast'
-        games_col = 'g'
-        team_col = 'tm'  # Team abbreviation
-        
-        # Check if columns exist
-        if player_id_col in box_scores_df.columns:
-            print(f"  Calculating stats from player_totals using columns: player_id={player_id_col}, pts={pts_col}, reb={reb_col}, ast={ast_col}, games={games_col}, team={team_col}")
-            
-            # Create a mapping from player_totals player_id/name to our player_stats
-            # First try by player_id, then by name
-            player_name_col = 'player' if 'player' in box_scores_df.columns else None
-            
-            # Group by player_id and aggregate
-            for stats_player_id, group in box_scores_df.groupby(player_id_col):
-                if pd.isna(stats_player_id):
-                    continue
-                
-                # Try to find matching player in our player_stats
-                target_player_id = None
-                
-                # First try direct player_id match
-                if stats_player_id in player_stats:
-                    target_player_id = stats_player_id
-                # If not found, try matching by name
-                elif player_name_col and player_name_col in group.columns:
-                    player_name = group[player_name_col].iloc[0] if len(group) > 0 else None
-                    if player_name:
-                        # Find player by name
-                        for pid, pdata in player_stats.items():
-                            if pdata['name'].lower() == str(player_name).lower():
-                                target_player_id = pid
-                                break
-                
-                if target_player_id is None:
-                    # Create new entry for player not in original dataset
-                    if player_name_col and player_name_col in group.columns:
-                        player_name = group[player_name_col].iloc[0]
-                        target_player_id = stats_player_id
-                        player_stats[target_player_id] = {
-                            'player_id': target_player_id,
-                            'name': player_name,
-                            'teams': set(),
-                            'total_points': 0,
-                            'total_rebounds': 0,
-                            'total_assists': 0,
-                            'total_steals': 0,
-                            'total_blocks': 0,
-                            'total_games': 0,
-                            'total_fg_made': 0,
-                            'total_fg_attempted': 0,
-                            'total_3p_made': 0,
-                            'total_3p_attempted': 0,
-                            'total_ft_made': 0,
-                            'total_ft_attempted': 0,
-                        }
-                    else:
-                        continue
-                
-                # Sum totals across all seasons
-                total_games = group[games_col].sum() if games_col in group.columns else len(group)
-                total_points = group[pts_col].sum() if pts_col in group.columns else 0
-                total_rebounds = group[reb_col].sum() if reb_col in group.columns else 0
-                total_assists = group[ast_col].sum() if ast_col in group.columns else 0
-                total_steals = group['stl'].sum() if 'stl' in group.columns else 0
-                total_blocks = group['blk'].sum() if 'blk' in group.columns else 0
-                total_fg_made = group['fg'].sum() if 'fg' in group.columns else 0
-                total_fg_attempted = group['fga'].sum() if 'fga' in group.columns else 0
-                total_3p_made = group['x3p'].sum() if 'x3p' in group.columns else 0
-                total_3p_attempted = group['x3pa'].sum() if 'x3pa' in group.columns else 0
-                total_ft_made = group['ft'].sum() if 'ft' in group.columns else 0
-                total_ft_attempted = group['fta'].sum() if 'fta' in group.columns else 0
-                
-                player_stats[target_player_id]['total_games'] += int(total_games)
-                player_stats[target_player_id]['total_points'] += float(total_points)
-                player_stats[target_player_id]['total_rebounds'] += float(total_rebounds)
-                player_stats[target_player_id]['total_assists'] += float(total_assists)
-                player_stats[target_player_id]['total_steals'] += float(total_steals)
-                player_stats[target_player_id]['total_blocks'] += float(total_blocks)
-                player_stats[target_player_id]['total_fg_made'] += float(total_fg_made)
-                player_stats[target_player_id]['total_fg_attempted'] += float(total_fg_attempted)
-                player_stats[target_player_id]['total_3p_made'] += float(total_3p_made)
-                player_stats[target_player_id]['total_3p_attempted'] += float(total_3p_attempted)
-                player_stats[target_player_id]['total_ft_made'] += float(total_ft_made)
-                player_stats[target_player_id]['total_ft_attempted'] += float(total_ft_attempted)
-                
-                # Collect unique teams
-                if team_col in group.columns:
-                    for team in group[team_col].dropna().unique():
-                        team_abbrev = str(team).upper().strip()
-                        # Map old abbreviations to new ones
-                        team_abbrev = TEAM_ABBREV_MAP.get(team_abbrev, team_abbrev)
-                        if team_abbrev:
-                            player_stats[target_player_id]['teams'].add(team_abbrev)
-        else:
-            print("  No player_id column found in player_totals, using placeholder stats")
-    
-    # Process advanced stats
-    if advanced_df is not None and not advanced_df.empty and 'player_id' in advanced_df.columns:
+    
+    targets = []
+    if player_totals is not None:
+        print(f"  Calculating stats from player_totals for {len(player_totals)} player ids")
+        targets = match_player_totals(player_totals, player_names, resolver)
+    elif not box_scores_df.empty:
+        print("  No player_id column found in player_totals, using placeholder stats")
+    
+    # One slot per player from here on
+    player_ids = list(player_names)
+    position = {player_id: i for i, player_id in enumerate(player_ids)}
+    n_players = len(player_ids)
+    
+    # Add totals across all seasons and source ids; bincount adds in row order, like the per-player sums did
+    rows = np.array([row for row, target in enumerate(targets) if target is not None], dtype=np.int64)
+    slots = np.array([position[target] for target in targets if target is not None], dtype=np.int64)
+    totals = {}
+    for total_col in PLAYER_TOTAL_COLUMNS:
+        values = player_totals[total_col].to_numpy(dtype=np.float64)[rows] if len(rows) else np.zeros(0)
+        if total_col == 'total_games':
+            values = np.trunc(values)
+        totals[total_col] = np.bincount(slots, weights=values, minlength=n_players)
+    total_games = totals['total_games'].astype(np.int64)
+    
+    teams = [set() for _ in range(n_players)]
+    if len(rows):
+        for slot, player_teams in zip(slots.tolist(), player_totals['teams'].to_numpy()[rows]):
+            teams[slot].update(player_teams)
+    
+    # Advanced stats attach to players by id only
+    advanced = {total_col: np.zeros(n_players) for total_col in ADVANCED_TOTAL_COLUMNS}
+    advanced_seasons = np.zeros(n_players, dtype=np.int64)
+    has_advanced = np.zeros(n_players, dtype=bool)
+    if advanced_stats is not None:
         print("  Processing advanced stats...")
-        for player_id, group in advanced_df.groupby('player_id'):
-            if pd.isna(player_id):
-                continue
-            if player_id in player_stats:
-                # Calculate career averages for advanced stats
-                player_stats[player_id]['total_per'] = group['per'].sum() if 'per' in group.columns else 0
-                player_stats[player_id]['total_bpm'] = group['bpm'].sum() if 'bpm' in group.columns else 0
-                player_stats[player_id]['total_vorp'] = group['vorp'].sum() if 'vorp' in group.columns else 0
-                player_stats[player_id]['total_ws'] = group['ws'].sum() if 'ws' in group.columns else 0
-                player_stats[player_id]['total_usg_pct'] = group['usg_percent'].sum() if 'usg_percent' in group.columns else 0
-                player_stats[player_id]['total_ts_pct'] = group['ts_percent'].sum() if 'ts_percent' in group.columns else 0
-                player_stats[player_id]['total_efg_pct'] = group['e_fg_percent'].sum() if 'e_fg_percent' in group.columns else 0
-                player_stats[player_id]['advanced_seasons'] = len(group)
+        advanced_rows = [
+            row for row, player_id in enumerate(advanced_stats.index.tolist())
+            if not pd.isna(player_id) and player_id in position
+        ]
+        advanced_slots = [position[player_id] for player_id in advanced_stats.index[advanced_rows].tolist()]
+        for total_col in ADVANCED_TOTAL_COLUMNS:
+            advanced[total_col][advanced_slots] = advanced_stats[total_col].to_numpy(dtype=np.float64)[advanced_rows]
+        advanced_seasons[advanced_slots] = np.trunc(advanced_stats['advanced_seasons'].to_numpy(dtype=np.float64)[advanced_rows])
+        has_advanced[advanced_slots] = True
     
     # Process all-star selections
     all_star_counts = {}
     if all_star_df is not None and not all_star_df.empty:
         print("  Processing all-star selections...")
         if 'player' in all_star_df.columns:
-            for _, row in all_star_df.iterrows():
-                player_name = str(row['player']).strip()
-                if player_name:
-                    all_star_counts[player_name] = all_star_counts.get(player_name, 0) + 1
+            all_star_counts = resolver.count_by_player(all_star_df['player'])
     
     # Process awards (MVP, All-NBA)
     mvp_counts = {}
@@ -648,120 +891,73 @@ def generate_player_summary(players_df, box_scores_df, advanced_df=None, all_sta
     if awards_df is not None and not awards_df.empty:
         print("  Processing awards...")
         if 'player' in awards_df.columns and 'award' in awards_df.columns:
-            for _, row in awards_df.iterrows():
-                player_name = str(row['player']).strip()
-                award = str(row['award']).strip().upper() if pd.notna(row['award']) else ''
-                if player_name:
-                    if 'MVP' in award:
-                        mvp_counts[player_name] = mvp_counts.get(player_name, 0) + 1
-                    if 'ALL-NBA' in award or 'ALL NBA' in award:
-                        all_nba_counts[player_name] = all_nba_counts.get(player_name, 0) + 1
-    
-    # Convert to final format
-    player_summary = []
-    for player_id, stats in player_stats.items():
-        total_games = stats['total_games']
-        career_ppg = stats['total_points'] / total_games if total_games > 0 else 0
-        career_rpg = stats['total_rebounds'] / total_games if total_games > 0 else 0
-        career_apg = stats['total_assists'] / total_games if total_games > 0 else 0
-        career_spg = stats['total_steals'] / total_games if total_games > 0 else 0
-        career_bpg = stats['total_blocks'] / total_games if total_games > 0 else 0
-        
-        # Calculate shooting percentages
-        fg_pct = stats['total_fg_made'] / stats['total_fg_attempted'] if stats['total_fg_attempted'] > 0 else 0
-        three_pct = stats['total_3p_made'] / stats['total_3p_attempted'] if stats['total_3p_attempted'] > 0 else 0
-        ft_pct = stats['total_ft_made'] / stats['total_ft_attempted'] if stats['total_ft_attempted'] > 0 else 0
-        
-        # Advanced stats averages
-        advanced_seasons = stats.get('advanced_seasons', 0)
-        career_per = stats.get('total_per', 0) / advanced_seasons if advanced_seasons > 0 else 0
-        career_bpm = stats.get('total_bpm', 0) / advanced_seasons if advanced_seasons > 0 else 0
-        career_vorp = stats.get('total_vorp', 0)  # VORP is cumulative
-        career_ws = stats.get('total_ws', 0)  # Win shares are cumulative
-        career_usg_pct = stats.get('total_usg_pct', 0) / advanced_seasons if advanced_seasons > 0 else 0
-        career_ts_pct = stats.get('total_ts_pct', 0) / advanced_seasons if advanced_seasons > 0 else 0
-        career_efg_pct = stats.get('total_efg_pct', 0) / advanced_seasons if advanced_seasons > 0 else 0
-        
-        # Awards
-        player_name = stats['name']
-        all_star_appearances = all_star_counts.get(player_name, 0)
-        mvp_count = mvp_counts.get(player_name, 0)
-        all_nba_count = all_nba_counts.get(player_name, 0)
-        
-        player_summary.append({
-            'player_id': player_id,
-            'name': stats['name'],
-            'teams': sorted(list(stats['teams'])),  # Convert set to sorted list
-            'career_ppg': round(career_ppg, 1),
-            'career_rpg': round(career_rpg, 1),
-            'career_apg': round(career_apg, 1),
-            'career_spg': round(career_spg, 1),
-            'career_bpg': round(career_bpg, 1),
-            'career_fg_pct': round(fg_pct, 4),
-            'career_3p_pct': round(three_pct, 4),
-            'career_ft_pct': round(ft_pct, 4),
-            'career_ts_pct': round(career_ts_pct, 4),
-            'career_efg_pct': round(career_efg_pct, 4),
-            'career_per': round(career_per, 1),
-            'career_bpm': round(career_bpm, 1),
-            'career_vorp': round(career_vorp, 1),
-            'career_ws': round(career_ws, 1),
-            'career_usg_pct': round(career_usg_pct, 4),
-            'all_star_appearances': all_star_appearances,
-            'mvp_count': mvp_count,
-            'all_nba_count': all_nba_count,
-            'total_games': total_games,
-        })
+            award = awards_df['award'].fillna('').astype(str).str.strip().str.upper()
+            is_mvp = award.str.contains('MVP', regex=False)
+            is_all_nba = award.str.contains('ALL-NBA', regex=False) | award.str.contains('ALL NBA', regex=False)
+            mvp_counts = resolver.count_by_player(awards_df.loc[is_mvp, 'player'])
+            all_nba_counts = resolver.count_by_player(awards_df.loc[is_all_nba, 'player'])
+    
+    resolver.report_ambiguous()
+    
+    # Per-game rates and shooting percentages
+    ones = np.ones(n_players)
+    rates = {
+        'career_ppg': rounded_rates(totals['total_points'], total_games, 1),
+        'career_rpg': rounded_rates(totals['total_rebounds'], total_games, 1),
+        'career_apg': rounded_rates(totals['total_assists'], total_games, 1),
+        'career_spg': rounded_rates(totals['total_steals'], total_games, 1),
+        'career_bpg': rounded_rates(totals['total_blocks'], total_games, 1),
+        'career_fg_pct': rounded_rates(totals['total_fg_made'], totals['total_fg_attempted'], 4),
+        'career_3p_pct': rounded_rates(totals['total_3p_made'], totals['total_3p_attempted'], 4),
+        'career_ft_pct': rounded_rates(totals['total_ft_made'], totals['total_ft_attempted'], 4),
+        # Advanced stats averages; VORP and win shares are cumulative
+        'career_ts_pct': rounded_rates(advanced['total_ts_pct'], advanced_seasons, 4, numpy_round=True),
+        'career_efg_pct': rounded_rates(advanced['total_efg_pct'], advanced_seasons, 4, numpy_round=True),
+        'career_per': rounded_rates(advanced['total_per'], advanced_seasons, 1, numpy_round=True),
+        'career_bpm': rounded_rates(advanced['total_bpm'], advanced_seasons, 1, numpy_round=True),
+        'career_vorp': rounded_rates(advanced['total_vorp'], np.where(has_advanced, ones, 0), 1, numpy_round=True),
+        'career_ws': rounded_rates(advanced['total_ws'], np.where(has_advanced, ones, 0), 1, numpy_round=True),
+        'career_usg_pct': rounded_rates(advanced['total_usg_pct'], advanced_seasons, 4, numpy_round=True),
+    }
+    
+    # Convert to final format, one record per row of the aligned columns
+    columns = {
+        'player_id': player_ids,
+        'name': list(player_names.values()),
+        'teams': [sorted(player_teams) for player_teams in teams],
+        **rates,
+        'all_star_appearances': [all_star_counts.get(player_id, 0) for player_id in player_ids],
+        'mvp_count': [mvp_counts.get(player_id, 0) for player_id in player_ids],
+        'all_nba_count': [all_nba_counts.get(player_id, 0) for player_id in player_ids],
+        'total_games': total_games.tolist(),
+    }
+    fields = list(columns)
+    player_summary = [dict(zip(fields, values)) for values in zip(*columns.values())]
     
     print(f"  Generated stats for {len(player_summary)} players")
     print(f"  Players with stats: {sum(1 for p in player_summary if p['total_games'] > 0)}")
     
     return player_summary
 
-def generate_rivalry_summary(games_df):
+def generate_rivalry_summary(games_df, game_results=None):
     """Generate rivalry_summary.json"""
     print("Generating rivalry summary...")
     
-    rivalries = {}
-    
-    if 'home_team' in games_df.columns and 'away_team' in games_df.columns:
-        for _, game in games_df.iterrows():
-            home_team = game.get('home_team')
-            away_team = game.get('away_team')
-            home_pts = game.get('home_pts', 0)
-            away_pts = game.get('away_pts', 0)
-            
-            # Skip if missing data
-            if pd.isna(home_team) or pd.isna(away_team) or pd.isna(home_pts) or pd.isna(away_pts):
-                continue
-            
-            # Create sorted pair key
-            pair = tuple(sorted([str(home_team), str(away_team)]))
-            
-            if pair not in rivalries:
-                rivalries[pair] = {
-                    'team1': pair[0],
-                    'team2': pair[1],
-                    'total_meetings': 0,
-                    'team1_wins': 0,
-                    'team2_wins': 0,
-                }
-            
-            rivalries[pair]['total_meetings'] += 1
-            
-            # Determine winner
-            if str(home_team) == pair[0]:
-                if home_pts > away_pts:
-                    rivalries[pair]['team1_wins'] += 1
-                else:
-                    rivalries[pair]['team2_wins'] += 1
-            else:
-                if away_pts > home_pts:
-                    rivalries[pair]['team1_wins'] += 1
-                else:
-                    rivalries[pair]['team2_wins'] += 1
+    # Aggregate game results if not provided
+    if game_results is None:
+        game_results = aggregate_game_results(games_df)
+    _, rivalries = game_results
     
-    return list(rivalries.values())
+    return [
+        {
+            'team1': row.team1,
+            'team2': row.team2,
+            'total_meetings': int(row.total_meetings),
+            'team1_wins': int(row.team1_wins),
+            'team2_wins': int(row.team2_wins),
+        }
+        for row in rivalries.itertuples(index=False)
+    ]
 
 def generate_state_summary(team_summary):
     """Generate state_summary.json"""
@@ -790,46 +986,386 @@ def generate_state_summary(team_summary):
     
     return list(state_stats.values())
 
-def main():
+# Incremental rebuild state (aggregates up to the last checkpoint), kept next to the table cache
+DEFAULT_STATE_PATH = DEFAULT_CACHE_DIR.parent / 'incremental_state.pkl'
+INCREMENTAL_STATE_VERSION = 4
+
+def game_checkpoint(games_df):
+    """Latest game date in games_df and the ids of the games played on it"""
+    if games_df.empty or 'date' not in games_df.columns:
+        return None
+    last_date = games_df['date'].max()
+    game_ids = []
+    if 'game_id' in games_df.columns:
+        game_ids = sorted(games_df.loc[games_df['date'] == last_date, 'game_id'].astype(str).unique())
+    # Saved as a YYYY-MM-DD string; date columns compare against it whether they hold strings or datetimes
+    return {'date': pd.Timestamp(last_date).strftime('%Y-%m-%d'), 'game_ids': game_ids}
+
+def new_games_mask(games_df, checkpoint):
+    """Boolean array marking games played after the checkpoint (including late games on the checkpoint date)"""
+    newer = games_df['date'] > checkpoint['date']
+    if 'game_id' in games_df.columns:
+        newer |= (games_df['date'] == checkpoint['date']) & ~games_df['game_id'].astype(str).isin(checkpoint['game_ids'])
+    return newer.to_numpy()
+
+def aggregate_by_season(df, aggregate, merge, checkpoint=None):
+    """Aggregate season rows on top of a checkpoint, returning (aggregates, new checkpoint)
+    
+    The checkpoint holds aggregates for completed seasons (before checkpoint['season']). The latest
+    season's totals keep changing until it ends, so its rows are re-aggregated on every run. Only suited
+    to whole-number totals, whose float sums come out the same however the rows are split.
+    """
+    if df is None or df.empty or 'season' not in df.columns:
+        return aggregate(df), None
+    
+    closed = None
+    if checkpoint is not None:
+        df = df[~(df['season'] < checkpoint['season'])]
+        closed = checkpoint['closed']
+    
+    latest_season = df['season'].max()
+    in_closed_season = df['season'] < latest_season
+    closed = merge(closed, aggregate(df[in_closed_season]))
+    result = merge(closed, aggregate(df[~in_closed_season]))
+    return result, {'season': latest_season, 'closed': closed}
+
+def build_aggregates(games_df, box_scores_df, advanced_df, state=None):
+    """Compute the game and player aggregates the summaries are built from
+    
+    Without state everything is aggregated from scratch. With a saved incremental state only games
+    after its checkpoint and box-score seasons from its checkpoint season onward are aggregated and
+    merged into its team records, rivalries, game cube and player totals. Rivalries are reordered
+    against the whole games table only when new games sit before old ones in it. Advanced stats are
+    fractional and always aggregated in full. Returns (aggregates, new_state).
+    """
+    state = state or {}
+    
+    games_state = state.get('games')
+    if games_state is not None and 'date' in games_df.columns:
+        is_new = new_games_mask(games_df, games_state['checkpoint'])
+        new_games_df = games_df[is_new]
+        print(f"  Applying {len(new_games_df)} new games since {games_state['checkpoint']['date']}")
+        # Games appended after the checkpointed ones leave every pair's first meeting where it was; games
+        # inserted earlier in the table can move it, and only then is pair order rebuilt from every game
+        appended = is_new[len(games_df) - len(new_games_df):].all()
+        game_results = merge_game_results(
+            games_state['results'], aggregate_game_results(new_games_df), None if appended else games_df
+        )
+        # The cube holds counts, so adding the new games' cube gives the full one
+        game_cube = merge_game_cubes(games_state['cube'], build_game_cube(new_games_df))
+    else:
+        game_results = aggregate_game_results(games_df)
+        game_cube = build_game_cube(games_df)
+    new_games_state = None
+    if 'date' in games_df.columns:
+        new_games_state = {'checkpoint': game_checkpoint(games_df), 'results': game_results, 'cube': game_cube}
+    
+    player_totals, totals_checkpoint = aggregate_by_season(
+        box_scores_df, aggregate_player_totals, merge_player_totals, state.get('player_totals')
+    )
+    # Advanced stats are fractional, so summing closed seasons and the latest one separately would round
+    # differently from one pass over every season; they are few enough to re-aggregate on every run
+    advanced_stats = aggregate_advanced_stats(advanced_df)
+    if state.get('player_totals') is not None:
+        print(f"  Re-aggregated player seasons from {state['player_totals']['season']} onward")
+    
+    aggregates = {
+        'game_results': game_results,
+        'game_cube': game_cube,
+        'player_totals': player_totals,
+        'advanced_stats': advanced_stats,
+    }
+    new_state = {
+        'version': INCREMENTAL_STATE_VERSION,
+        'games': new_games_state,
+        'player_totals': totals_checkpoint,
+    }
+    return aggregates, new_state
+
+# Out-of-core mode (--chunk-rows): these tables are read in chunks and folded into the aggregates
+STREAMED_TABLES = ('game', 'player_totals')
+DEFAULT_CHUNK_ROWS = 100_000
+
+def read_csv_chunks(path, chunk_rows):
+    """DataFrames of up to chunk_rows rows from a CSV file; none if path is None"""
+    if path is None:
+        return
+    with pd.read_csv(path, chunksize=chunk_rows) as reader:
+        yield from reader
+
+def stream_aggregates(source_dir=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Aggregate game.csv and player_totals.csv a chunk at a time, so neither table is held in memory
+    
+    Each chunk is cleaned like clean_data and its team records, rivalries, player totals and game cube are
+    merged into the running ones with the same merge functions incremental rebuilds use. The results equal
+    the in-memory path's, since the tables' totals are whole-number counts whose sums don't depend on
+    grouping. Returns (game_results, player_totals, game_cube, rows read).
+    """
+    game_results = player_totals = game_cube = None
+    rows_read = 0
+    
+    for chunk in read_csv_chunks(source_table_path('game', source_dir), chunk_rows):
+        rows_read += len(chunk)
+        chunk = clean_games(chunk)
+        chunk_results = aggregate_game_results(chunk)
+        game_results = chunk_results if game_results is None else merge_game_results(game_results, chunk_results)
+        game_cube = merge_game_cubes(game_cube, build_game_cube(chunk))
+    if game_results is None:
+        game_results = aggregate_game_results(pd.DataFrame())
+    print(f"  Streamed {rows_read:,} game rows")
+    
+    game_rows = rows_read
+    for chunk in read_csv_chunks(source_table_path('player_totals', source_dir), chunk_rows):
+        rows_read += len(chunk)
+        player_totals = merge_player_totals(player_totals, aggregate_player_totals(clean_box_scores(chunk)))
+    print(f"  Streamed {rows_read - game_rows:,} player season rows")
+    
+    return game_results, player_totals, game_cube, rows_read
+
+def load_incremental_state(path):
+    """Load a saved incremental state, or None if missing or from an older format"""
+    path = Path(path)
+    if not path.exists():
+        return None
+    state = pd.read_pickle(path)
+    if not isinstance(state, dict) or state.get('version') != INCREMENTAL_STATE_VERSION:
+        print(f"  Ignoring incremental state in {path} (format changed)")
+        return None
+    return state
+
+def save_incremental_state(path, state):
+    """Save the incremental state, replacing the previous one atomically"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with atomic_path(path) as temp_path:
+        pd.to_pickle(state, temp_path)
+
+def generate_summaries(teams_df, players_df, games_df, box_scores_df, team_stats_per_game_df, team_summaries_df, advanced_df, all_star_df, awards_df, championships, championship_years, aggregates, profiler=None, workers=1):
+    """Generate all four summaries from the aggregates, keyed by output file name
+    
+    The team, player and rivalry summaries only read the inputs, so they run concurrently on up to workers
+    processes; the state summary follows the team summary. Each summary is recorded as a stage of profiler
+    when one is given.
+    """
+    inputs = {
+        'teams_df': teams_df, 'players_df': players_df, 'games_df': games_df, 'box_scores_df': box_scores_df,
+        'team_stats_per_game_df': team_stats_per_game_df, 'team_summaries_df': team_summaries_df,
+        'advanced_df': advanced_df, 'all_star_df': all_star_df, 'awards_df': awards_df,
+        'championships': championships, 'championship_years': championship_years, **aggregates,
+    }
+    tasks = [
+        SummaryTask('team_summary', generate_team_summary, (
+            'teams_df', 'games_df', 'team_stats_per_game_df', 'team_summaries_df', 'championships',
+            'championship_years', 'game_results',
+        ), count_rows(teams_df, games_df)),
+        SummaryTask('player_summary', generate_player_summary, (
+            'players_df', 'box_scores_df', 'advanced_df', 'all_star_df', 'awards_df', 'player_totals', 'advanced_stats',
+        ), count_rows(players_df, box_scores_df, advanced_df)),
+        SummaryTask('rivalry_summary', generate_rivalry_summary, ('games_df', 'game_results'), len(games_df)),
+        SummaryTask('state_summary', generate_state_summary, ('team_summary',), None),
+    ]
+    results = run_tasks(tasks, inputs, workers, profiler)
+    return {f'{task.name}.json': results[task.name] for task in tasks}
+
+def parse_args(argv=None):
+    """Parse command-line options"""
+    parser = argparse.ArgumentParser(description="Generate Courtside summary JSON files from NBA datasets")
+    parser.add_argument('--source-dir', type=Path, default=None,
+                        help="Read source CSVs from this directory instead of downloading from Kaggle")
+    parser.add_argument('--load-workers', type=int, default=DEFAULT_LOAD_WORKERS,
+                        help=f"Number of source tables loaded concurrently (default: {DEFAULT_LOAD_WORKERS})")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f"Processes the summaries are built on (default: {DEFAULT_WORKERS}; 1 builds them in this process)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Only aggregate games and player seasons newer than the last saved checkpoint")
+    parser.add_argument('--verify', action='store_true',
+                        help="Also run a full rebuild and fail if its output differs from this run's")
+    parser.add_argument('--state-path', type=Path, default=DEFAULT_STATE_PATH,
+                        help=f"Where the incremental checkpoint is stored (default: {DEFAULT_STATE_PATH})")
+    parser.add_argument('--elo-margin', action='store_true',
+                        help="Scale Elo rating updates by the margin of victory")
+    parser.add_argument('--profile', choices=PROFILERS, default=None,
+                        help="Also profile each stage with cProfile or pyinstrument (profiles go to --profile-dir)")
+    parser.add_argument('--profile-dir', type=Path, default=DEFAULT_PROFILE_DIR,
+                        help=f"Directory for the stage report ({PROFILE_REPORT_FILENAME}, written every run to "
+                             f"{DEFAULT_PROFILE_DIR / PROFILE_REPORT_FILENAME} by default) and per-stage profiles "
+                             f"(default: {DEFAULT_PROFILE_DIR})")
+    parser.add_argument('--chunk-rows', type=int, nargs='?', const=DEFAULT_CHUNK_ROWS, default=None,
+                        help=f"Stream game.csv and player_totals.csv in chunks of this many rows (default: {DEFAULT_CHUNK_ROWS}) "
+                             "instead of loading them; skips the game store, Elo ratings and incremental state")
+    args = parser.parse_args(argv)
+    if args.chunk_rows is not None and args.chunk_rows < 1:
+        parser.error("--chunk-rows must be at least 1")
+    if args.chunk_rows is not None and args.incremental:
+        parser.error("--chunk-rows can't be combined with --incremental")
+    return args
+
+def main(argv=None):
     """Main execution function"""
+    args = parse_args(argv)
     print("Starting NBA data processing...")
     
+    # Wall/CPU time, peak RSS and row counts per stage, written next to the summaries
+    profiler = StageProfiler(args.profile, args.profile_dir)
+    
     # Stream data from Kaggle
-    teams_df, players_df, games_df, box_scores_df, team_stats_per_game_df, team_summaries_df, advanced_df, all_star_df, awards_df = load_data()
+    with profiler.stage('load_data') as stage:
+        teams_df, players_df, games_df, box_scores_df, team_stats_per_game_df, team_summaries_df, advanced_df, all_star_df, awards_df = load_data(
+            workers=args.load_workers, source_dir=args.source_dir,
+            tables=[name for name, _, _ in SOURCE_TABLES if name not in STREAMED_TABLES] if args.chunk_rows else None,
+        )
+        stage['rows_out'] = count_rows(
+            teams_df, players_df, games_df, box_scores_df, team_stats_per_game_df, team_summaries_df,
+            advanced_df, all_star_df, awards_df,
+        )
     
     # Clean and process data
-    teams_df, players_df, games_df, box_scores_df = clean_data(teams_df, players_df, games_df, box_scores_df)
+    with profiler.stage('clean_data', rows_in=count_rows(teams_df, players_df, games_df, box_scores_df)) as stage:
+        teams_df, players_df, games_df, box_scores_df = clean_data(teams_df, players_df, games_df, box_scores_df)
+        stage['rows_out'] = count_rows(teams_df, players_df, games_df, box_scores_df)
     
     # Load championship data
-    championships, championship_years = load_championship_data()
+    with profiler.stage('championships') as stage:
+        championships, championship_years = load_championship_data()
+        stage['rows_out'] = len(championships)
+    
+    # Aggregate games and player seasons, incrementally from the last checkpoint if requested
+    state = None
+    if args.incremental:
+        state = load_incremental_state(args.state_path)
+        if state is None:
+            print("No incremental state found, running a full rebuild")
+    if args.chunk_rows:
+        print(f"Streaming games and player seasons in chunks of {args.chunk_rows:,} rows...")
+        with profiler.stage('stream_aggregates') as stage:
+            game_results, player_totals, game_cube, stage['rows_in'] = stream_aggregates(args.source_dir, args.chunk_rows)
+            advanced_stats = aggregate_advanced_stats(advanced_df)
+            aggregates = {
+                'game_results': game_results, 'game_cube': game_cube,
+                'player_totals': player_totals, 'advanced_stats': advanced_stats,
+            }
+            stage['rows_out'] = count_rows(*game_results, player_totals, advanced_stats)
+        new_state = None
+    else:
+        print("Aggregating games and player seasons...")
+        with profiler.stage('aggregates', rows_in=count_rows(games_df, box_scores_df, advanced_df)) as stage:
+            aggregates, new_state = build_aggregates(games_df, box_scores_df, advanced_df, state)
+            stage['rows_out'] = count_rows(*aggregates['game_results'], aggregates['player_totals'], aggregates['advanced_stats'])
     
     # Generate summaries
-    team_summary = generate_team_summary(teams_df, games_df, team_stats_per_game_df, team_summaries_df, championships, championship_years)
-    player_summary = generate_player_summary(players_df, box_scores_df, advanced_df, all_star_df, awards_df)
-    rivalry_summary = generate_rivalry_summary(games_df)
-    state_summary = generate_state_summary(team_summary)
+    summaries = generate_summaries(
+        teams_df, players_df, games_df, box_scores_df, team_stats_per_game_df, team_summaries_df,
+        advanced_df, all_star_df, awards_df, championships, championship_years, aggregates, profiler, args.workers
+    )
     
-    # Save to backend/data/
-    output_dir = Path('backend/data')
-    output_dir.mkdir(parents=True, exist_ok=True)
+    # Check the incremental result against a from-scratch rebuild
+    if args.verify:
+        print("Verifying against a full rebuild...")
+        with profiler.stage('verify'):
+            full_games_df, full_box_scores_df = games_df, box_scores_df
+            if args.chunk_rows:
+                # Streamed tables are loaded in full for the comparison
+                _, _, full_games_df, full_box_scores_df, *_ = load_data(
+                    workers=args.load_workers, source_dir=args.source_dir, tables=STREAMED_TABLES
+                )
+                _, _, full_games_df, full_box_scores_df = clean_data(pd.DataFrame(), pd.DataFrame(), full_games_df, full_box_scores_df)
+            full_aggregates, _ = build_aggregates(full_games_df, full_box_scores_df, advanced_df)
+            full_summaries = generate_summaries(
+                teams_df, players_df, full_games_df, full_box_scores_df, team_stats_per_game_df, team_summaries_df,
+                advanced_df, all_star_df, awards_df, championships, championship_years, full_aggregates,
+                workers=args.workers,
+            )
+        mismatched = [
+            filename for filename, data in summaries.items()
+            if serialize_json(data) != serialize_json(full_summaries[filename])
+        ]
+        game_cube, full_game_cube = aggregates['game_cube'], full_aggregates['game_cube']
+        if (game_cube is None) != (full_game_cube is None) or (
+            game_cube is not None and serialize_game_cube(game_cube) != serialize_game_cube(full_game_cube)
+        ):
+            mismatched.append(GAME_CUBE_FILENAME)
+        if mismatched:
+            print(f"Verification failed: {', '.join(mismatched)} differ from a full rebuild")
+            raise SystemExit(1)
+        print("Verification passed: output matches a full rebuild")
     
-    with open(output_dir / 'team_summary.json', 'w') as f:
-        json.dump(team_summary, f, indent=2)
+    # Per-decade and per-season counts for filtered comparisons, merged like the other game aggregates
+    game_cube = aggregates['game_cube']
+    game_store = elo_ratings = None
+    if args.chunk_rows:
+        # The store and Elo ratings need every game at once; copies from an earlier run are removed when the
+        # outputs are written, since they would no longer match the summaries
+        print("Skipping the game store and Elo ratings (they need the full game table, run without --chunk-rows)")
+    else:
+        # Game-level columns for head-to-head history queries
+        print("Building columnar game store...")
+        with profiler.stage('game_store', rows_in=len(games_df)) as stage:
+            game_store = build_game_store(games_df)
+            stage['rows_out'] = len(game_store['date']) if game_store is not None else None
+        
+        # Chronological team strength, merged across relocations like the team summary
+        print("Building Elo ratings...")
+        with profiler.stage('elo_ratings', rows_in=len(games_df)) as stage:
+            elo_ratings = build_elo_ratings(games_df, TEAM_ABBREV_MAP, margin_adjusted=args.elo_margin)
+            stage['rows_out'] = len(elo_ratings) if elo_ratings is not None else None
     
-    with open(output_dir / 'player_summary.json', 'w') as f:
-        json.dump(player_summary, f, indent=2)
+    # Save to backend/data/ as compact JSON, leaving unchanged files untouched and replacing changed ones
+    # atomically. Everything is built first so the files change together and a running backend's reload
+    # watcher sees one burst of writes
+    output_dir = Path('backend/data')
+    output_dir.mkdir(parents=True, exist_ok=True)
     
-    with open(output_dir / 'rivalry_summary.json', 'w') as f:
-        json.dump(rivalry_summary, f, indent=2)
+    with profiler.stage('write_outputs'):
+        manifest = OutputManifest(output_dir)
+        for filename, data in summaries.items():
+            manifest.write_json(filename, data)
+        
+        # Binary snapshot of the same summaries for fast backend startup. If a field can't be encoded the backend
+        # still loads the JSON files (an older snapshot no longer matches them and is ignored)
+        try:
+            manifest.write(SNAPSHOT_FILENAME, build_snapshot({Path(filename).stem: data for filename, data in summaries.items()}))
+        except UnsupportedSnapshotValue as e:
+            print(f"  Skipping {SNAPSHOT_FILENAME}: {e}")
+        if game_cube is not None:
+            manifest.write(GAME_CUBE_FILENAME, serialize_game_cube(game_cube))
+        if elo_ratings is not None:
+            manifest.write_json(ELO_FILENAME, elo_ratings)
+        if game_store is not None:
+            for name, column in game_store.items():
+                manifest.write(f'{GAME_STORE_DIRNAME}/{name}.npy', serialize_column(column))
+        if args.chunk_rows:
+            stale = [ELO_FILENAME] + sorted(f'{GAME_STORE_DIRNAME}/{path.name}' for path in (output_dir / GAME_STORE_DIRNAME).glob('*.npy'))
+            for name in stale:
+                manifest.remove(name)
+        
+        # Hashes and sizes of every output, written last so it never describes files that aren't in place yet
+        manifest_changed = manifest.save()
+        if new_state is not None:
+            save_incremental_state(args.state_path, new_state)
     
-    with open(output_dir / 'state_summary.json', 'w') as f:
-        json.dump(state_summary, f, indent=2)
+    store_prefix = f'{GAME_STORE_DIRNAME}/'
+    written = [name for name in manifest.written if not name.startswith(store_prefix)]
+    outputs = [name for name in manifest.files if not name.startswith(store_prefix)]
+    store_written = [name for name in manifest.written if name.startswith(store_prefix)]
+    print(f"\nSummary files generated in {output_dir}/ ({len(written)} of {len(outputs)} changed)")
+    print(f"- team_summary.json: {len(summaries['team_summary.json'])} teams")
+    print(f"- player_summary.json: {len(summaries['player_summary.json'])} players")
+    print(f"- rivalry_summary.json: {len(summaries['rivalry_summary.json'])} rivalries")
+    print(f"- state_summary.json: {len(summaries['state_summary.json'])} states")
+    if game_cube is not None:
+        print(f"- {GAME_CUBE_FILENAME}: {len(game_cube['teams'])} teams x {len(game_cube['decades'])} decades, {len(game_cube['seasons'])} seasons")
+    if elo_ratings is not None:
+        print(f"- {ELO_FILENAME}: {len(elo_ratings)} teams{' (margin-adjusted)' if args.elo_margin else ''}")
+    if game_store is not None:
+        print(f"- {GAME_STORE_DIRNAME}/: {len(game_store['date'])} games ({len(store_written)} of {len(game_store)} columns changed)")
+    if manifest.removed:
+        print(f"- Removed {len(manifest.removed)} outputs this mode doesn't rebuild: {', '.join(manifest.removed)}")
+    print(f"- {MANIFEST_FILENAME}: content hash {manifest.sha256[:12]} ({'changed' if manifest_changed else 'unchanged'})")
     
-    print(f"\nSummary files generated in {output_dir}/")
-    print(f"- team_summary.json: {len(team_summary)} teams")
-    print(f"- player_summary.json: {len(player_summary)} players")
-    print(f"- rivalry_summary.json: {len(rivalry_summary)} rivalries")
-    print(f"- state_summary.json: {len(state_summary)} states")
+    profiler.print_summary()
+    # Kept out of backend/data, whose files are all served data the backend watches
+    profiler.write_report(args.profile_dir / PROFILE_REPORT_FILENAME)
+    print(f"Stage report written to {args.profile_dir / PROFILE_REPORT_FILENAME}")
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,197 @@
+"""
+Pipeline Stage Profiler
+Records wall time, CPU time, peak RSS and rows in/out for each stage of process_data.py, optionally with a
+cProfile or pyinstrument profile per stage, and writes the run's report as JSON
+"""
+
+import cProfile
+import json
+import platform
+import pstats
+import re
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+
+from output_writer import atomic_path
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+try:
+    from pyinstrument import Profiler as PyinstrumentProfiler
+except ImportError:  # pragma: no cover - pyinstrument is optional
+    PyinstrumentProfiler = None
+
+PROFILE_REPORT_FILENAME = 'pipeline_profile.json'
+PROFILERS = ('cprofile', 'pyinstrument')
+DEFAULT_PROFILE_DIR = Path('.cache/profiles')
+
+# Functions listed per stage in the report when profiling with cProfile
+TOP_FUNCTIONS = 15
+
+def count_rows(*tables):
+    """Total length of the given tables, skipping None"""
+    return sum(len(table) for table in tables if table is not None)
+
+def reset_peak_rss():
+    """Reset the process's peak RSS so the next reading covers one stage; returns False if unsupported
+    
+    Linux only: writing 5 to /proc/self/clear_refs resets VmHWM.
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+def peak_rss_mb():
+    """Peak resident set size in MB since the last reset (or since the process started), or None"""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            match = re.search(r'^VmHWM:\s+(\d+) kB', f.read(), re.MULTILINE)
+        if match:
+            return int(match.group(1)) / 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    # ru_maxrss is in bytes on macOS and kB elsewhere
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / (1024 * 1024) if sys.platform == 'darwin' else max_rss / 1024
+
+class NullProfiler:
+    """Stands in for StageProfiler where stages shouldn't be recorded (e.g. inside another stage)"""
+    
+    def stage(self, name, rows_in=None):
+        return nullcontext({})
+    
+    def worker(self):
+        return self
+    
+    def merge(self, other):
+        pass
+
+class StageProfiler:
+    """Collects one record per pipeline stage
+    
+    CPU time is the whole process's (time.process_time), so stages that use worker threads can report more
+    CPU than wall time. Profiles only cover the thread that runs the stage.
+    """
+    
+    def __init__(self, profiler=None, profile_dir=DEFAULT_PROFILE_DIR):
+        if profiler not in (None,) + PROFILERS:
+            raise ValueError(f"Unknown profiler {profiler!r} (expected one of {', '.join(PROFILERS)})")
+        if profiler == 'pyinstrument' and PyinstrumentProfiler is None:
+            raise ValueError("pyinstrument is not installed (pip install pyinstrument)")
+        self.profiler = profiler
+        self.profile_dir = Path(profile_dir)
+        self.stages = []
+        self.started_at = datetime.now(timezone.utc)
+        self.start_wall = time.perf_counter()
+        self.start_cpu = time.process_time()
+    
+    @contextmanager
+    def stage(self, name, rows_in=None):
+        """Time the enclosed block as one stage; set record['rows_out'] inside it"""
+        record = {'stage': name, 'rows_in': rows_in, 'rows_out': None}
+        peak_scope = 'stage' if reset_peak_rss() else 'process'
+        profile = self._start_profile()
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        try:
+            yield record
+        finally:
+            record['wall_s'] = round(time.perf_counter() - start_wall, 4)
+            record['cpu_s'] = round(time.process_time() - start_cpu, 4)
+            peak = peak_rss_mb()
+            record['peak_rss_mb'] = round(peak, 1) if peak is not None else None
+            record['peak_rss_scope'] = peak_scope
+            if profile is not None:
+                record.update(self._finish_profile(name, profile))
+            self.stages.append(record)
+    
+    def worker(self):
+        """An empty profiler with the same settings, for recording stages in another process"""
+        return StageProfiler(self.profiler, self.profile_dir)
+    
+    def merge(self, other):
+        """Add the stages another (worker) profiler recorded"""
+        self.stages.extend(other.stages)
+    
+    def _start_profile(self):
+        if self.profiler == 'cprofile':
+            profile = cProfile.Profile()
+            profile.enable()
+            return profile
+        if self.profiler == 'pyinstrument':
+            profile = PyinstrumentProfiler()
+            profile.start()
+            return profile
+        return None
+    
+    def _finish_profile(self, name, profile):
+        """Stop a stage's profile, save it under profile_dir and return its report fields"""
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        if self.profiler == 'pyinstrument':
+            profile.stop()
+            path = self.profile_dir / f"{name}.html"
+            path.write_text(profile.output_html())
+            return {'profile': str(path)}
+        
+        profile.disable()
+        path = self.profile_dir / f"{name}.prof"
+        profile.dump_stats(path)
+        stats = pstats.Stats(profile).stats
+        top = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:TOP_FUNCTIONS]
+        return {
+            'profile': str(path),
+            'top_functions': [
+                {
+                    'function': f"{function} ({Path(filename).name}:{line})",
+                    'calls': calls,
+                    'own_s': round(own_time, 4),
+                    'cumulative_s': round(cumulative_time, 4),
+                }
+                for (filename, line, function), (_, calls, own_time, cumulative_time, _) in top
+            ],
+        }
+    
+    def report(self):
+        """The run's stages and totals as a JSON-serializable dict"""
+        peak = max((stage['peak_rss_mb'] for stage in self.stages if stage['peak_rss_mb'] is not None), default=None)
+        return {
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'profiler': self.profiler,
+            'total': {
+                'wall_s': round(time.perf_counter() - self.start_wall, 4),
+                'cpu_s': round(time.process_time() - self.start_cpu, 4),
+                'peak_rss_mb': peak,
+            },
+            'stages': self.stages,
+        }
+    
+    def write_report(self, path):
+        """Write the report as JSON, replacing the previous run's"""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with atomic_path(path) as temp_path:
+            with open(temp_path, 'w') as f:
+                json.dump(self.report(), f, indent=2)
+    
+    def print_summary(self):
+        """Print one line per stage"""
+        print("\nStage timings:")
+        for stage in self.stages:
+            rows = ''
+            if stage['rows_in'] is not None or stage['rows_out'] is not None:
+                rows_in = f"{stage['rows_in']:,}" if stage['rows_in'] is not None else '-'
+                rows_out = f"{stage['rows_out']:,}" if stage['rows_out'] is not None else '-'
+                rows = f"  {rows_in} -> {rows_out} rows"
+            peak = f"{stage['peak_rss_mb']:.0f} MB" if stage['peak_rss_mb'] is not None else 'n/a'
+            print(f"  {stage['stage']:<20} {stage['wall_s']:8.2f}s wall {stage['cpu_s']:8.2f}s cpu  peak {peak}{rows}")
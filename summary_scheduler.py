@@ -0,0 +1,84 @@
+"""
+Summary Scheduler
+Runs the summary builders as a small dependency graph on a pool of forked worker processes. Workers read
+the pipeline's input tables from memory inherited from the parent (shared copy-on-write pages) instead of
+receiving pickled copies; only dependency results and the finished summaries cross process boundaries
+"""
+
+import multiprocessing
+import os
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from stage_profiler import NullProfiler, count_rows
+
+# Default number of worker processes for the summary builders
+DEFAULT_WORKERS = int(os.getenv('COURTSIDE_WORKERS', min(3, os.cpu_count() or 1)))
+
+# One builder: function(*args), where each arg names a shared input or an earlier task's result. rows_in is
+# reported for the task's stage; None counts the rows of the dependency results instead
+SummaryTask = namedtuple('SummaryTask', ['name', 'function', 'args', 'rows_in'])
+
+# Inputs of the schedule being run; forked workers inherit them with the rest of the parent's memory
+_shared_inputs = {}
+
+def fork_context():
+    """multiprocessing context whose workers inherit the parent's memory, or None where fork isn't available"""
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        return None
+    return multiprocessing.get_context('fork')
+
+def run_task(task, inputs, dependencies, profiler):
+    """Run one task; returns (result, profiler) so a worker's stage records reach the parent"""
+    args = [dependencies[arg] if arg in dependencies else inputs[arg] for arg in task.args]
+    rows_in = task.rows_in if task.rows_in is not None else count_rows(*dependencies.values())
+    with profiler.stage(task.name, rows_in=rows_in) as stage:
+        result = task.function(*args)
+        stage['rows_out'] = len(result)
+    return result, profiler
+
+def run_shared_task(task, dependencies, profiler):
+    """run_task in a worker, on the inputs inherited from the parent"""
+    return run_task(task, _shared_inputs, dependencies, profiler)
+
+def run_tasks(tasks, inputs, workers=DEFAULT_WORKERS, profiler=None):
+    """Run tasks as soon as their dependencies are done, on up to workers processes; returns {name: result}
+    
+    Each task is recorded as a stage of profiler. With one worker, or where fork isn't available, the tasks
+    run one after another in this process.
+    """
+    global _shared_inputs
+    profiler = profiler or NullProfiler()
+    task_names = {task.name for task in tasks}
+    depends_on = {task.name: [arg for arg in task.args if arg in task_names] for task in tasks}
+    
+    results = {}
+    context = fork_context()
+    if workers <= 1 or context is None or len(tasks) <= 1:
+        pending = list(tasks)
+        while pending:
+            task = next(task for task in pending if all(name in results for name in depends_on[task.name]))
+            pending.remove(task)
+            dependencies = {name: results[name] for name in depends_on[task.name]}
+            results[task.name], _ = run_task(task, inputs, dependencies, profiler)
+        return results
+    
+    # Workers fork when the pool starts, after the inputs are in place
+    _shared_inputs = inputs
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks)), mp_context=context) as executor:
+            pending = list(tasks)
+            running = {}
+            while pending or running:
+                for task in [task for task in pending if all(name in results for name in depends_on[task.name])]:
+                    pending.remove(task)
+                    dependencies = {name: results[name] for name in depends_on[task.name]}
+                    running[executor.submit(run_shared_task, task, dependencies, profiler.worker())] = task
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    results[task.name], worker_profiler = future.result()
+                    profiler.merge(worker_profiler)
+    finally:
+        _shared_inputs = {}
+    return results
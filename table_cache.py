@@ -0,0 +1,147 @@
+"""
+Local Columnar Table Cache
+Stores raw source CSVs as Arrow IPC files with compact dtypes so later runs can memory-map them
+instead of re-parsing CSV
+"""
+
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from output_writer import atomic_path, file_sha256
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover - cache is optional
+    pa = None
+    feather = None
+
+CACHE_FORMAT_VERSION = 1
+DEFAULT_CACHE_DIR = Path(os.getenv('COURTSIDE_CACHE_DIR', '.cache/tables'))
+
+# String columns with at most this share of distinct values are dictionary-encoded on disk
+DICTIONARY_MAX_RATIO = 0.5
+
+def compact_dtypes(df):
+    """Return a copy of df with integer columns downcast and repetitive strings as categoricals
+    
+    Float columns are left as float64 so summaries computed from cached tables stay bit-identical.
+    """
+    df = df.copy()
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_bool_dtype(series):
+            continue
+        if pd.api.types.is_integer_dtype(series):
+            df[col] = pd.to_numeric(series, downcast='integer')
+        elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            non_null = series.dropna()
+            if len(non_null) and non_null.map(type).eq(str).all():
+                if series.nunique() <= DICTIONARY_MAX_RATIO * len(series):
+                    df[col] = series.astype('category')
+    return df
+
+class TableCache:
+    """Arrow IPC cache of source tables, invalidated by source size, mtime and content hash"""
+    
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.enabled = pa is not None
+    
+    def _table_path(self, name):
+        return self.cache_dir / f"{name}.arrow"
+    
+    def _meta_path(self, name):
+        return self.cache_dir / f"{name}.json"
+    
+    def _read_meta(self, name):
+        try:
+            with open(self._meta_path(name), 'r') as f:
+                meta = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if meta.get('format_version') != CACHE_FORMAT_VERSION or not self._table_path(name).exists():
+            return None
+        return meta
+    
+    def _write_meta(self, name, meta):
+        with atomic_path(self._meta_path(name)) as temp_path:
+            with open(temp_path, 'w') as f:
+                json.dump(meta, f, indent=2)
+    
+    def is_valid(self, name, source_path):
+        """Check the cached copy against the source file
+        
+        Size must match. If mtime also matches the cache is trusted without reading the source;
+        if only mtime changed (e.g. re-download of the same file) the content hash decides.
+        """
+        meta = self._read_meta(name)
+        if meta is None:
+            return False
+        stat = Path(source_path).stat()
+        if stat.st_size != meta['size']:
+            return False
+        if stat.st_mtime_ns == meta['mtime_ns']:
+            return True
+        if file_sha256(source_path) != meta['sha256']:
+            return False
+        # Same content, new mtime: refresh metadata so the next check is stat-only
+        meta['mtime_ns'] = stat.st_mtime_ns
+        self._write_meta(name, meta)
+        return True
+    
+    def read_cached(self, name):
+        """Memory-map a cached table without checking its source, or None if not cached"""
+        if not self.enabled or self._read_meta(name) is None:
+            return None
+        table = feather.read_table(self._table_path(name), memory_map=True)
+        return self._to_pandas(table)
+    
+    def read_csv(self, name, source_path, **read_csv_kwargs):
+        """Read a source CSV through the cache, refreshing the cached copy when the source changed"""
+        if not self.enabled:
+            return pd.read_csv(source_path, **read_csv_kwargs)
+        
+        if self.is_valid(name, source_path):
+            return self.read_cached(name)
+        
+        df = pd.read_csv(source_path, **read_csv_kwargs)
+        try:
+            self.write(name, source_path, df)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            # Mixed-type columns can't be stored as Arrow; keep going with the parsed frame
+            print(f"  Could not cache {name}: {e}")
+        return df
+    
+    def write(self, name, source_path, df):
+        """Write df to the cache with compact dtypes, recording the source's size, mtime and hash"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        table = pa.Table.from_pandas(compact_dtypes(df), preserve_index=False)
+        
+        # Write to a temp file first so an interrupted run never leaves a half-written table
+        with atomic_path(self._table_path(name)) as temp_path:
+            feather.write_feather(table, temp_path, compression='uncompressed')
+        
+        stat = Path(source_path).stat()
+        self._write_meta(name, {
+            'format_version': CACHE_FORMAT_VERSION,
+            'source': str(source_path),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': file_sha256(source_path),
+            'rows': len(df),
+        })
+    
+    @staticmethod
+    def _to_pandas(table):
+        # Decode dictionary columns back to plain strings so downstream code sees CSV-like frames
+        columns = []
+        for field, column in zip(table.schema, table.columns):
+            if pa.types.is_dictionary(field.type):
+                column = column.cast(field.type.value_type)
+            columns.append(column)
+        table = pa.Table.from_arrays(columns, names=table.column_names)
+        return table.to_pandas()
@@ -0,0 +1,26 @@
+"""
+Tests for the Elo seasons: games belong to game.csv's season, so the 2020 bubble doesn't start a new one
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from elo_ratings import build_elo_ratings
+from process_data import clean_games
+
+def test_bubble_games_continue_their_season():
+    games_df = clean_games(pd.DataFrame({
+        'game_date': ['2020-03-10 00:00:00', '2020-07-30 00:00:00', '2020-10-11 00:00:00'],
+        'team_abbreviation_home': ['LAL', 'LAL', 'LAL'],
+        'team_abbreviation_away': ['BRK', 'LAC', 'MIA'],
+        'pts_home': [102.0, 103.0, 106.0],
+        'pts_away': [104.0, 101.0, 93.0],
+        'season_id': [22019, 22019, 42019],
+        'game_id': [21900967, 21901231, 41900406],
+    }))
+    lakers = next(team for team in build_elo_ratings(games_df) if team['team'] == 'LAL')
+    assert [season['season'] for season in lakers['seasons']] == [2020]
+    assert lakers['seasons'][0]['games'] == 3
@@ -0,0 +1,39 @@
+"""
+Tests for the game counts cube's seasons: game.csv's season_id decides, the date only when it is missing
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from game_cube import build_game_cube
+from process_data import clean_games
+
+def make_games(season_ids=None):
+    """Raw game.csv rows from the 2019-20 season, two of them played in the 2020 bubble"""
+    games = pd.DataFrame({
+        'game_date': ['2020-03-11 00:00:00', '2020-07-31 00:00:00', '2020-10-11 00:00:00'],
+        'team_abbreviation_home': ['DAL', 'LAL', 'LAL'],
+        'team_abbreviation_away': ['DEN', 'LAC', 'MIA'],
+        'pts_home': [113.0, 103.0, 106.0],
+        'pts_away': [97.0, 101.0, 93.0],
+        'game_id': [21900970, 21901231, 41900406],
+    })
+    if season_ids is not None:
+        games['season_id'] = season_ids
+    return games
+
+def test_bubble_games_stay_in_their_season():
+    cube = build_game_cube(clean_games(make_games([22019, 22019, 42019])))
+    assert cube['seasons'].tolist() == [2020]
+    lakers = cube['teams'].tolist().index('LAL')
+    assert cube['season_wins'][lakers].tolist() == [2]
+
+def test_games_without_season_id_fall_back_to_their_date():
+    cube = build_game_cube(clean_games(make_games()))
+    assert cube['seasons'].tolist() == [2020, 2021]
+    
+    cube = build_game_cube(clean_games(make_games([22019, None, 42019])))
+    assert cube['seasons'].tolist() == [2020, 2021]
@@ -0,0 +1,81 @@
+"""
+Tests for the incremental rebuild: a checkpointed run must aggregate to what a full build does
+"""
+
+import contextlib
+import io
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from game_cube import serialize_game_cube
+from process_data import build_aggregates
+
+def make_tables():
+    """Games out of date order and fractional advanced stats, split into an old and a new snapshot"""
+    games_df = pd.DataFrame({
+        'game_id': [1, 2, 3, 4, 5, 6],
+        'date': pd.to_datetime(['2020-01-05', '2021-01-03', '2020-01-01', '2021-01-02', '2020-01-03', '2021-01-01']),
+        'home_team': ['BOS', 'MIA', 'LAL', 'BOS', 'BOS', 'DEN'],
+        'away_team': ['LAL', 'NYK', 'BOS', 'MIA', 'NYK', 'PHX'],
+        'home_pts': [101, 99, 110, 120, 95, 104],
+        'away_pts': [99, 102, 100, 111, 90, 108],
+    })
+    box_scores_df = pd.DataFrame({
+        'season': [2019, 2020, 2020, 2021],
+        'player_id': ['p1', 'p1', 'p2', 'p1'],
+        'player': ['Gary Payton', 'Gary Payton', 'Tim Hardaway', 'Gary Payton'],
+        'g': [82, 40, 70, 60],
+        'pts': [1700.0, 800.0, 1500.0, 1200.0],
+    })
+    advanced_df = pd.DataFrame({
+        'season': [2019, 2020, 2021],
+        'player_id': ['p1', 'p1', 'p1'],
+        'usg_percent': [0.1, 0.2, 0.3],
+        'ts_percent': [0.7, 0.1, 0.2],
+    })
+    old = (
+        games_df[games_df['date'] < '2021-01-01'],
+        box_scores_df[box_scores_df['season'] < 2021],
+        advanced_df[advanced_df['season'] < 2021],
+    )
+    return old, (games_df, box_scores_df, advanced_df)
+
+def aggregate(tables, state=None):
+    """build_aggregates without its progress output"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return build_aggregates(*tables, state=state)
+
+def test_incremental_matches_full_build():
+    old, new = make_tables()
+    _, state = aggregate(old)
+    incremental, _ = aggregate(new, state)
+    full, _ = aggregate(new)
+    
+    full_records, full_rivalries = full['game_results']
+    incremental_records, incremental_rivalries = incremental['game_results']
+    pd.testing.assert_frame_equal(incremental_records.sort_index(), full_records.sort_index())
+    pd.testing.assert_frame_equal(incremental_rivalries, full_rivalries)
+    pd.testing.assert_frame_equal(incremental['player_totals'], full['player_totals'], check_dtype=False)
+    pd.testing.assert_frame_equal(incremental['advanced_stats'], full['advanced_stats'], check_exact=True)
+    assert serialize_game_cube(incremental['game_cube']) == serialize_game_cube(full['game_cube'])
+
+def test_appended_games_match_full_build():
+    old, (games_df, box_scores_df, advanced_df) = make_tables()
+    games_df = pd.concat([old[0], games_df[games_df['date'] >= '2021-01-01']], ignore_index=True)
+    _, state = aggregate(old)
+    incremental, _ = aggregate((games_df, box_scores_df, advanced_df), state)
+    full, _ = aggregate((games_df, box_scores_df, advanced_df))
+    
+    pd.testing.assert_frame_equal(incremental['game_results'][1], full['game_results'][1])
+    assert serialize_game_cube(incremental['game_cube']) == serialize_game_cube(full['game_cube'])
+
+def test_rivalries_keep_first_meeting_order():
+    old, new = make_tables()
+    _, state = aggregate(old)
+    incremental, _ = aggregate(new, state)
+    _, rivalries = incremental['game_results']
+    pairs = list(zip(rivalries['team1'], rivalries['team2']))
+    assert pairs == [('BOS', 'LAL'), ('MIA', 'NYK'), ('BOS', 'MIA'), ('BOS', 'NYK'), ('DEN', 'PHX')]
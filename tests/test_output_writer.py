@@ -0,0 +1,32 @@
+"""
+Tests for the output manifest: which entries a later run marks carried_over
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from output_writer import MANIFEST_FILENAME, OutputManifest
+
+def carried_over(directory):
+    """carried_over flag per file in directory's manifest"""
+    files = json.loads((directory / MANIFEST_FILENAME).read_text())['files']
+    return {name: entry.get('carried_over', False) for name, entry in files.items()}
+
+def write_outputs(directory, names, extend=False):
+    manifest = OutputManifest(directory, extend=extend)
+    for name in names:
+        manifest.write(name, name.encode())
+    manifest.save()
+
+def test_full_run_marks_outputs_it_did_not_write(tmp_path):
+    write_outputs(tmp_path, ['team_summary.json', 'snapshot.bin'])
+    write_outputs(tmp_path, ['team_summary.json'])
+    assert carried_over(tmp_path) == {'snapshot.bin': True, 'team_summary.json': False}
+
+def test_extending_run_keeps_other_entries(tmp_path):
+    write_outputs(tmp_path, ['team_summary.json', 'elo_ratings.json'])
+    write_outputs(tmp_path, ['team_summary.json'])
+    write_outputs(tmp_path, ['snapshot.bin'], extend=True)
+    assert carried_over(tmp_path) == {'elo_ratings.json': True, 'snapshot.bin': False, 'team_summary.json': False}
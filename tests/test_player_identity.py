@@ -0,0 +1,63 @@
+"""
+Tests for the player identity resolver
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from player_identity import PlayerIdentityResolver, normalize_name
+
+def make_resolver():
+    """A resolver holding two father-and-son pairs and a few other players"""
+    return PlayerIdentityResolver.from_players([
+        (1, 'Gary Payton'),
+        (6, 'Gary Payton II'),
+        (2, 'Tim Hardaway'),
+        (3, 'Tim Hardaway Jr.'),
+        (4, 'Luka Dončić'),
+        (5, 'Larry Nance Jr.'),
+    ])
+
+def test_normalize_name_keeps_suffixes_on_request():
+    assert normalize_name('Tim Hardaway Jr.') == 'tim hardaway'
+    assert normalize_name('Tim Hardaway Jr.', keep_suffixes=True) == 'tim hardaway jr'
+    assert normalize_name('Luka Dončić', keep_suffixes=True) == 'luka doncic'
+
+def test_father_and_son_resolve_to_themselves():
+    resolver = make_resolver()
+    assert resolver.resolve('Gary Payton') == 1
+    assert resolver.resolve('Gary Payton II') == 6
+    assert resolver.resolve('gary payton ii') == 6
+    assert resolver.resolve('Tim Hardaway') == 2
+    assert resolver.resolve('Tim Hardaway Jr.') == 3
+    assert resolver.resolve('Tim Hardaway Jr') == 3
+
+def test_suffix_is_never_dropped_to_match_a_suffixed_player():
+    resolver = make_resolver()
+    assert resolver.resolve('Larry Nance') is None
+    assert resolver.resolve('Larry Nance Sr.') is None
+    assert resolver.resolve('Gary Payton III') is None
+
+def test_suffixed_name_falls_back_to_the_only_player_without_one():
+    resolver = PlayerIdentityResolver.from_players([(9, 'Kevin Knox'), (4, 'Luka Dončić')])
+    assert resolver.resolve('Kevin Knox II') == 9
+    assert resolver.resolve('Luka Doncic') == 4
+    assert resolver.ambiguous == {}
+
+def test_fallback_with_a_father_and_son_resolves_to_none():
+    resolver = make_resolver()
+    assert resolver.resolve('Gary Payton Jr.') is None
+    assert resolver.resolve('Tim Hardaway Sr.') is None
+    assert resolver.ambiguous == {'gary payton': [1, 6], 'tim hardaway': [2, 3]}
+
+def test_shared_exact_name_resolves_to_first_player():
+    resolver = PlayerIdentityResolver.from_players([(7, 'Charles Smith'), (8, 'Charles Smith')])
+    assert resolver.resolve('Charles Smith') == 7
+    assert resolver.ambiguous == {'charles smith': [7, 8]}
+
+def test_award_counts_go_to_the_named_player():
+    resolver = make_resolver()
+    all_star = ['Tim Hardaway'] * 5 + ['Tim Hardaway Jr.'] + ['Gary Payton'] * 9
+    assert resolver.count_by_player(all_star) == {2: 5, 3: 1, 1: 9}
+    assert resolver.count_by_player(['Gary Payton II', 'Unknown Player']) == {6: 1}
@@ -0,0 +1,52 @@
+"""
+Tests that the columnar player summary publishes the same numbers as the original per-player loop
+"""
+
+import contextlib
+import io
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from process_data import ADVANCED_TOTAL_COLUMNS, aggregate_advanced_stats, generate_player_summary
+
+def baseline_advanced_totals(advanced_df):
+    """Advanced totals as the original loop summed them: Series.sum over each player's rows"""
+    totals = {}
+    for player_id, group in advanced_df.groupby('player_id'):
+        totals[player_id] = [group[source_col].sum() for source_col in ADVANCED_TOTAL_COLUMNS.values()] + [len(group)]
+    return pd.DataFrame.from_dict(totals, orient='index', columns=list(ADVANCED_TOTAL_COLUMNS) + ['advanced_seasons'])
+
+def make_advanced_table(n_players=2000, seed=0):
+    """Synthetic advanced.csv rows: 1-20 seasons per player, three-decimal stats, a few missing values"""
+    rng = np.random.default_rng(seed)
+    player = np.repeat(np.arange(n_players), rng.integers(1, 21, n_players))
+    rng.shuffle(player)
+    advanced_df = pd.DataFrame({'player_id': player, 'season': 1980 + rng.integers(0, 40, len(player))})
+    for source_col in ADVANCED_TOTAL_COLUMNS.values():
+        advanced_df[source_col] = rng.normal(10, 5, len(player)).round(3)
+    advanced_df.loc[rng.random(len(player)) < 0.03, 'ws'] = np.nan
+    return advanced_df
+
+def test_advanced_totals_match_the_original_summation():
+    advanced_df = make_advanced_table()
+    expected = baseline_advanced_totals(advanced_df)
+    advanced = aggregate_advanced_stats(advanced_df)
+    assert advanced.index.tolist() == expected.index.tolist()
+    # Exact: groupby's compensated sum differs from these in the last bit for thousands of values
+    np.testing.assert_array_equal(advanced.to_numpy(), expected.to_numpy())
+
+def test_published_usage_rate_matches_baseline():
+    # Series.sum gives 40.663000000000004 and groupby's sum 40.663; over 4 seasons that is 10.1658 vs 10.1657
+    players_df = pd.DataFrame({'id': [38], 'full_name': ['Gary Payton']})
+    advanced_df = pd.DataFrame({
+        'season': [1994, 1995, 1996, 1997],
+        'player_id': [38] * 4,
+        'usg_percent': [7.27, 15.646, 9.452, 8.295],
+    })
+    with contextlib.redirect_stdout(io.StringIO()):
+        summary = generate_player_summary(players_df, pd.DataFrame(), advanced_df)
+    assert summary[0]['career_usg_pct'] == 10.1658